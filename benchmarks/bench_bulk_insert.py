@@ -0,0 +1,79 @@
+"""
+Benchmark de la création de contrats : un par un ou groupée.
+
+Compare ContractService.create_contract (une transaction et un rechargement par
+contrat) et create_contracts_bulk (une instruction et une transaction pour le lot),
+sur une base SQLite temporaire avec le profil de l'application.
+
+Usage:
+    python -m benchmarks.bench_bulk_insert [--contracts 500]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from src.database.database import create_db_engine
+from src.database.models import Base
+from src.services.contract_service import ContractService
+
+
+def _specs(contracts):
+    """Contrats synthétiques dans le format de create_contracts_bulk."""
+    return [
+        {
+            "contract_type": "electricite",
+            "provider": "TotalEnergies",
+            "start_date": datetime(2025, 12, 6),
+            "anniversary_date": datetime(2026, 12, 6),
+            "contract_data": {
+                "pdl": f"{22477713358214 + index}",
+                "numero_contrat": f"CT-{index}",
+                "prix_abonnement_mensuel": 20.21,
+                "estimation_facture_annuelle": 1639,
+            },
+            "filename": f"import_{index}.xlsx",
+        }
+        for index in range(contracts)
+    ]
+
+
+def run(mode, contracts):
+    """Crée `contracts` contrats et retourne la durée en secondes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        service = ContractService(session)
+        specs = _specs(contracts)
+
+        start = time.perf_counter()
+        if mode == "bulk":
+            service.create_contracts_bulk(specs)
+        else:
+            for spec in specs:
+                service.create_contract(pdf_bytes=None, **spec)
+        elapsed = time.perf_counter() - start
+
+        session.close()
+        engine.dispose()
+        return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.contracts} contrats")
+    print(f"{'Mode':<10} {'Durée (s)':>10} {'Contrats/s':>11}")
+    for mode in ("unitaire", "bulk"):
+        elapsed = run(mode, args.contracts)
+        print(f"{mode:<10} {elapsed:>10.2f} {args.contracts / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark de la compression des prompts et réponses GPT.
+
+Enregistre des logs d'extraction construits avec les vrais prompts (texte des PDF
+de Contrats/ et schéma JSON) et compare, pour le stockage en texte brut, zlib et
+lzma : la taille du fichier SQLite et la latence de relecture.
+
+Usage:
+    python -m benchmarks.bench_compression [--rows 500] [--reads 200]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import JSON, Column, Integer, String, Text
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from src.config import BASE_DIR
+from src.database.database import create_db_engine
+from src.database.types import CompressedText
+from src.services.openai_service import OpenAIService
+from src.services.pdf_service import PDFService
+
+STORAGES = {
+    "texte": Text,
+    "zlib": lambda: CompressedText("zlib"),
+    "lzma": lambda: CompressedText("lzma"),
+}
+
+
+def _sample_prompts():
+    """Construit des couples (prompt, réponse) à partir des PDF d'exemple."""
+    openai_service = OpenAIService(api_key="benchmark")
+    texts = []
+    for pdf_path in sorted((BASE_DIR / "Contrats").glob("*.pdf")):
+        try:
+            texts.append(PDFService().extract_text_from_pdf(pdf_path.read_bytes()))
+        except Exception:
+            continue
+    if not texts:
+        texts = ["Conditions générales. Cotisation annuelle : 350 €. " * 400]
+
+    samples = []
+    for pdf_text in texts:
+        prompt = openai_service._build_extraction_prompt("electricite", pdf_text)
+        response = json.dumps(openai_service._get_contract_schema("electricite"), indent=2)
+        samples.append((prompt, response))
+    return samples
+
+
+def _log_model(storage):
+    """Déclare une table de logs dont les colonnes GPT utilisent le stockage demandé."""
+    base = declarative_base()
+
+    class BenchLog(base):
+        __tablename__ = "bench_logs"
+        id = Column(Integer, primary_key=True)
+        filename = Column(String(500))
+        gpt_prompt = Column(STORAGES[storage](), nullable=False)
+        gpt_response = Column(STORAGES[storage](), nullable=False)
+        extracted_data = Column(JSON)
+
+    return base, BenchLog
+
+
+def run_storage(storage, samples, rows, reads):
+    """Écrit `rows` logs puis mesure la relecture ; retourne (Mo, ms/lecture, s écriture)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        engine = create_db_engine(f"sqlite:///{db_path}", profile="default")
+        base, model = _log_model(storage)
+        base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        for index in range(rows):
+            prompt, response = samples[index % len(samples)]
+            session.add(
+                model(
+                    filename=f"contrat_{index}.pdf",
+                    gpt_prompt=f"{index}\n{prompt}",
+                    gpt_response=response,
+                    extracted_data={},
+                )
+            )
+        session.commit()
+        write_time = time.perf_counter() - start
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(reads):
+            session.expire_all()
+            log = session.get(model, rng.randint(1, rows))
+            len(log.gpt_prompt) + len(log.gpt_response)
+        read_ms = (time.perf_counter() - start) * 1000 / reads
+
+        session.close()
+        engine.dispose()
+        return db_path.stat().st_size / 1024 / 1024, read_ms, write_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = _sample_prompts()
+    average_size = sum(len(p) + len(r) for p, r in samples) / len(samples) / 1024
+    print(f"{args.rows} logs, {len(samples)} prompts types ({average_size:.0f} Ko en moyenne)")
+    print(f"{'Stockage':<10} {'Taille (Mo)':>12} {'Lecture (ms)':>13} {'Écriture (s)':>13}")
+    for storage in STORAGES:
+        size_mb, read_ms, write_time = run_storage(storage, samples, args.rows, args.reads)
+        print(f"{storage:<10} {size_mb:>12.1f} {read_ms:>13.3f} {write_time:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
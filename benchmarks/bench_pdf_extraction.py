@@ -0,0 +1,65 @@
+"""
+Benchmark de l'extraction du texte des PDF, séquentielle ou répartie entre processus.
+
+Pour chaque PDF de Contrats/, mesure la durée de l'extraction complète avec 1, 2 et
+4 processus (pool déjà démarré, comme dans l'application) et vérifie que le texte
+obtenu est identique à la lecture séquentielle.
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction [--workers 1 2 4] [--repeat 1]
+"""
+import argparse
+import os
+import time
+
+from src.config import BASE_DIR
+from src.services.pdf_service import PDFService, _get_pool
+
+
+def extract(pdf_bytes, workers):
+    """Extrait toutes les pages ; retourne (textes, durée en s)."""
+    start = time.perf_counter()
+    with PDFService.open(pdf_bytes) as document:
+        texts = document.extract_pages(max_workers=workers, min_parallel_pages=1)
+    return texts, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    pdf_paths = sorted((BASE_DIR / "Contrats").glob("*.pdf"))
+    if not pdf_paths:
+        parser.exit(1, "Aucun PDF dans Contrats/\n")
+
+    # Démarrage des processus hors mesure
+    for workers in args.workers:
+        if workers > 1:
+            list(_get_pool(workers).map(abs, range(workers)))
+
+    print(f"{os.cpu_count()} CPU")
+    print(f"{'PDF':<45} {'Pages':>6} " + " ".join(f"{w:>3} proc (s)" for w in args.workers))
+    for pdf_path in pdf_paths:
+        pdf_bytes = pdf_path.read_bytes()
+        reference = None
+        durations = []
+        for workers in args.workers:
+            best = None
+            for _ in range(args.repeat):
+                texts, duration = extract(pdf_bytes, workers)
+                best = duration if best is None else min(best, duration)
+            if reference is None:
+                reference = texts
+            elif texts != reference:
+                raise AssertionError(f"Texte différent avec {workers} processus: {pdf_path.name}")
+            durations.append(best)
+        print(
+            f"{pdf_path.name[:45]:<45} {len(reference):>6} "
+            + " ".join(f"{duration:>12.2f}" for duration in durations)
+        )
+
+
+if __name__ == "__main__":
+    main()
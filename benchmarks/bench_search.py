@@ -0,0 +1,100 @@
+"""
+Benchmark de la recherche plein texte des contrats.
+
+Indexe des contrats synthétiques (fournisseur, identifiants et texte de PDF de
+quelques pages) puis mesure la latence de ContractService.search().
+
+Usage:
+    python -m benchmarks.bench_search [--contracts 20000] [--queries 200]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from src.database.database import create_db_engine
+from src.database.models import Base
+from src.services.contract_service import ContractService
+
+PROVIDERS = ["EDF", "Engie", "TotalEnergies", "AXA", "MAIF", "Orange", "Free", "SFR"]
+WORDS = (
+    "contrat assurance garantie franchise cotisation annuelle échéance principale "
+    "résiliation abonnement consommation kilowattheure tarif option base heures creuses "
+    "dégâts des eaux incendie vol responsabilité civile propriétaire bailleur forfait"
+).split()
+
+
+def _pdf_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(session, contracts, words_per_document):
+    """Crée les contrats synthétiques et retourne les PDL générés."""
+    rng = random.Random(42)
+    pdls = []
+    specs = []
+    for index in range(contracts):
+        pdl = f"{rng.randrange(10**13, 10**14)}"
+        pdls.append(pdl)
+        specs.append(
+            {
+                "contract_type": "electricite",
+                "provider": rng.choice(PROVIDERS),
+                "start_date": datetime(2024, 1, 1),
+                "anniversary_date": datetime(2025, 1, 1),
+                "contract_data": {"pdl": pdl, "numero_contrat": f"CT-{index}"},
+                "filename": f"contrat_{index}.pdf",
+                "pdf_text": _pdf_text(rng, words_per_document),
+            }
+        )
+    ContractService(session).create_contracts_bulk(specs)
+    return pdls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=400, help="Mots de texte PDF par contrat")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+        start = time.perf_counter()
+        pdls = seed(session, args.contracts, args.words)
+        print(f"{args.contracts} contrats indexés en {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(7)
+        service = ContractService(session)
+        queries = {
+            "fournisseur": lambda: rng.choice(PROVIDERS),
+            "PDL": lambda: rng.choice(pdls),
+            "texte PDF": lambda: " ".join(rng.sample(WORDS, 2)),
+            "préfixe": lambda: rng.choice(WORDS)[:4],
+        }
+
+        print(f"{'Requête':<12} {'médiane (ms)':>13} {'p95 (ms)':>10}")
+        for name, make_query in queries.items():
+            timings = []
+            for _ in range(args.queries):
+                query = make_query()
+                start = time.perf_counter()
+                service.search(query)
+                timings.append((time.perf_counter() - start) * 1000)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{name:<12} {statistics.median(timings):>13.2f} {p95:>10.2f}")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
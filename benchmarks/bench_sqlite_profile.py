@@ -0,0 +1,113 @@
+"""
+Benchmark des profils SQLite sous sessions concurrentes.
+
+Simule plusieurs sessions Streamlit qui lisent la liste des contrats pendant
+que d'autres en créent, et compare le débit et les erreurs "database is locked"
+entre les profils.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile [--readers 8] [--writers 2] [--duration 5]
+"""
+import argparse
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.config import SQLITE_PROFILES
+from src.database.database import create_db_engine
+from src.database.models import Base
+from src.services.contract_service import ContractService
+
+
+def _create_contract(service, index):
+    service.create_contract(
+        contract_type="telephone",
+        provider=f"Fournisseur {index}",
+        start_date=datetime(2024, 1, 1),
+        anniversary_date=datetime(2025, 1, 1),
+        contract_data={"prix_mensuel": 10.0 + index % 20},
+        pdf_bytes=None,
+        filename=f"contrat_{index}.pdf",
+    )
+
+
+def run_profile(profile, readers, writers, duration, seed_rows):
+    """Lance le scénario concurrent pour un profil et retourne les compteurs."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}", profile=profile)
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        session = SessionLocal()
+        seed_service = ContractService(session)
+        for index in range(seed_rows):
+            _create_contract(seed_service, index)
+        session.close()
+
+        counters = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker(is_writer):
+            local = {"reads": 0, "writes": 0, "errors": 0}
+            index = 0
+            while time.perf_counter() < deadline:
+                db = SessionLocal()
+                service = ContractService(db)
+                try:
+                    if is_writer:
+                        _create_contract(service, index)
+                        local["writes"] += 1
+                    else:
+                        service.get_contract_summaries()
+                        db.commit()
+                        local["reads"] += 1
+                except OperationalError:
+                    db.rollback()
+                    local["errors"] += 1
+                finally:
+                    db.close()
+                index += 1
+            with lock:
+                for key, value in local.items():
+                    counters[key] += value
+
+        threads = [threading.Thread(target=worker, args=(False,)) for _ in range(readers)]
+        threads += [threading.Thread(target=worker, args=(True,)) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+        return counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--seed-rows", type=int, default=300)
+    args = parser.parse_args()
+
+    print(
+        f"{args.readers} lecteurs, {args.writers} écrivains, {args.duration:.0f}s, "
+        f"{args.seed_rows} contrats initiaux"
+    )
+    print(f"{'Profil':<10} {'Lectures/s':>12} {'Écritures/s':>12} {'Erreurs':>8}")
+    for profile in SQLITE_PROFILES:
+        counters = run_profile(profile, args.readers, args.writers, args.duration, args.seed_rows)
+        print(
+            f"{profile:<10} {counters['reads'] / args.duration:>12.0f} "
+            f"{counters['writes'] / args.duration:>12.0f} {counters['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,10 @@
 """
 Script pour importer le contrat TotalEnergies dans la base de données
 """
-import sys
 from datetime import datetime
 
-sys.path.insert(0, "src")
-
-from database.database import SessionLocal  # noqa: E402
-from database.models import Contract  # noqa: E402
+from src.database.database import SessionLocal
+from src.services.contract_service import ContractService
 
 # Données extraites par ChatGPT
 totalenergies_data = {
@@ -67,8 +64,8 @@ totalenergies_data = {
 }
 
 
-def create_contract(data, contract_type):
-    """Crée un contrat dans la base de données"""
+def build_contract_spec(data, contract_type):
+    """Construit l'entrée de create_contracts_bulk pour le contrat électricité ou gaz"""
 
     if contract_type == "electricite":
         contract_data = {
@@ -93,7 +90,6 @@ def create_contract(data, contract_type):
             "paiement": data["paiements"],
             "service_client": data["service_client"],
         }
-        anniversary_date = datetime.strptime(data["dates"]["signature_contrat"], "%d/%m/%Y")
 
     else:  # gaz
         contract_data = {
@@ -116,28 +112,34 @@ def create_contract(data, contract_type):
             "paiement": data["paiements"],
             "service_client": data["service_client"],
         }
-        anniversary_date = datetime.strptime(data["dates"]["signature_contrat"], "%d/%m/%Y")
+
+    return {
+        "contract_type": contract_type,
+        "provider": data["fournisseur"],
+        "start_date": datetime.strptime(
+            data[contract_type]["date_debut_previsionnelle"], "%d/%m/%Y"
+        ),
+        "anniversary_date": datetime.strptime(data["dates"]["signature_contrat"], "%d/%m/%Y"),
+        "contract_data": contract_data,
+    }
+
+
+def create_contracts(data, contract_types):
+    """Crée les contrats demandés dans la base de données, en une seule transaction"""
 
     db = SessionLocal()
     try:
-        contract = Contract(
-            provider=data["fournisseur"],
-            contract_type=contract_type,
-            contract_data=contract_data,
-            anniversary_date=anniversary_date,
-            validated=True,
+        ids = ContractService(db).create_contracts_bulk(
+            [build_contract_spec(data, contract_type) for contract_type in contract_types]
         )
 
-        db.add(contract)
-        db.commit()
-        db.refresh(contract)
-
-        print(f"✅ Contrat {contract_type} créé avec succès (ID: {contract.id})")
-        return contract
+        for contract_type, contract_id in zip(contract_types, ids):
+            print(f"✅ Contrat {contract_type} créé avec succès (ID: {contract_id})")
+        return ids
 
     except Exception as e:
         db.rollback()
-        print(f"❌ Erreur lors de la création du contrat: {e}")
+        print(f"❌ Erreur lors de la création des contrats: {e}")
         return None
     finally:
         db.close()
@@ -246,11 +248,10 @@ if __name__ == "__main__":
     choice = input("\nVotre choix (1-4): ").strip()
 
     if choice == "1":
-        create_contract(totalenergies_data, "electricite")
+        create_contracts(totalenergies_data, ["electricite"])
     elif choice == "2":
-        create_contract(totalenergies_data, "gaz")
+        create_contracts(totalenergies_data, ["gaz"])
     elif choice == "3":
-        create_contract(totalenergies_data, "electricite")
-        create_contract(totalenergies_data, "gaz")
+        create_contracts(totalenergies_data, ["electricite", "gaz"])
     else:
         print("\n❌ Annulé")
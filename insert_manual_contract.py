@@ -1,6 +1,6 @@
 from datetime import datetime
 from src.database.database import get_db
-from src.database.models import Contract
+from src.services.contract_service import ContractService
 
 
 def insert_contract():
@@ -49,25 +49,21 @@ def insert_contract():
     start_date = datetime.strptime("01/07/2015", "%d/%m/%Y")
     anniversary_date = datetime.strptime("01/07/2026", "%d/%m/%Y")
 
-    contract = Contract(
-        contract_type="assurance_habitation",
-        provider="Direct Assurance",
-        start_date=start_date,
-        anniversary_date=anniversary_date,
-        contract_data=contract_data,
-        original_filename="Import Manuel",
-        validated=1,
-    )
-
     with get_db() as db:
-        db.add(contract)
-        # Commit is handled by the context manager, but explicit commit is fine too if needed,
-        # though get_db does it on exit.
-        # However, to get the ID, we might need to flush or commit.
-        # get_db commits on exit.
-        pass
+        (contract_id,) = ContractService(db).create_contracts_bulk(
+            [
+                {
+                    "contract_type": "assurance_habitation",
+                    "provider": "Direct Assurance",
+                    "start_date": start_date,
+                    "anniversary_date": anniversary_date,
+                    "contract_data": contract_data,
+                    "filename": "Import Manuel",
+                }
+            ]
+        )
 
-    print("Contrat ajouté avec succès !")
+    print(f"Contrat ajouté avec succès (ID: {contract_id}) !")
 
 
 if __name__ == "__main__":
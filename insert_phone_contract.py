@@ -1,6 +1,7 @@
 from datetime import datetime
 from src.database.database import get_db
 from src.database.models import Contract
+from src.services.contract_service import ContractService
 
 
 def insert_phone_contract():
@@ -42,21 +43,21 @@ def insert_phone_contract():
     start_date = datetime.strptime("01/03/2019", "%d/%m/%Y")
     anniversary_date = datetime.strptime("01/03/2026", "%d/%m/%Y")
 
-    contract = Contract(
-        contract_type="telephone",
-        provider="B&You",
-        start_date=start_date,
-        anniversary_date=anniversary_date,
-        contract_data=contract_data,
-        original_filename="Import Manuel Téléphone",
-        validated=1,
-    )
-
     with get_db() as db:
-        db.add(contract)
-        pass
+        (contract_id,) = ContractService(db).create_contracts_bulk(
+            [
+                {
+                    "contract_type": "telephone",
+                    "provider": "B&You",
+                    "start_date": start_date,
+                    "anniversary_date": anniversary_date,
+                    "contract_data": contract_data,
+                    "filename": "Import Manuel Téléphone",
+                }
+            ]
+        )
 
-    print("Contrat téléphone ajouté avec succès !")
+    print(f"Contrat téléphone ajouté avec succès (ID: {contract_id}) !")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,17 @@
 """Application principale Streamlit pour GardeTonOr."""
 import streamlit as st
-from src.config import STREAMLIT_CONFIG
-from src.database import init_database
+from src.config import (
+    ARCHIVE_INTERVAL_MINUTES,
+    CONTRACT_TYPES,
+    INDEXING_INTERVAL_MINUTES,
+    PURGE_INTERVAL_MINUTES,
+    STREAMLIT_CONFIG,
+)
+from src.database import get_read_db, init_database
+from src.services import ContractService, OpenAIService, PDFService
+from src.services.archive_service import start_archive_worker
+from src.services.indexing_service import start_indexing_worker
+from src.services.purge_service import start_purge_worker
 
 # Configuration de la page
 st.set_page_config(**STREAMLIT_CONFIG)
@@ -9,6 +19,36 @@ st.set_page_config(**STREAMLIT_CONFIG)
 # Initialiser la base de données au premier lancement
 init_database()
 
+
+@st.cache_resource
+def _start_archive_worker():
+    """Démarre un seul thread d'archivage pour tout le processus Streamlit."""
+    return start_archive_worker(ARCHIVE_INTERVAL_MINUTES)
+
+
+if ARCHIVE_INTERVAL_MINUTES > 0:
+    _start_archive_worker()
+
+
+@st.cache_resource
+def _start_purge_worker():
+    """Démarre un seul thread de purge des contrats supprimés pour tout le processus."""
+    return start_purge_worker(PURGE_INTERVAL_MINUTES)
+
+
+if PURGE_INTERVAL_MINUTES > 0:
+    _start_purge_worker()
+
+
+@st.cache_resource
+def _start_indexing_worker():
+    """Démarre un seul thread d'extraction complète des PDF pour tout le processus."""
+    return start_indexing_worker(INDEXING_INTERVAL_MINUTES)
+
+
+if INDEXING_INTERVAL_MINUTES > 0:
+    _start_indexing_worker()
+
 # Style CSS personnalisé
 st.markdown(
     """
@@ -73,6 +113,25 @@ page = st.sidebar.radio(
     key="navigation",
 )
 
+# Recherche plein texte dans la sidebar
+st.sidebar.divider()
+search_query = st.sidebar.text_input(
+    "🔍 Rechercher un contrat",
+    key="sidebar_search",
+    placeholder="Fournisseur, PDL, n° de contrat...",
+)
+if search_query:
+    with get_read_db() as db:
+        search_results = ContractService(db, OpenAIService(), PDFService()).search(search_query)
+
+    if not search_results:
+        st.sidebar.info("Aucun contrat trouvé")
+    for result in search_results:
+        label = CONTRACT_TYPES.get(result.contract_type, result.contract_type)
+        simulation = " · simulation" if result.is_simulation else ""
+        st.sidebar.markdown(f"**{result.provider}** · {label}{simulation}")
+        st.sidebar.caption(" ".join(result.snippet.split()))
+
 # Affichage des pages
 if page == "🏠 Dashboard":
     from src.pages import dashboard
@@ -14,13 +14,90 @@ DATA_DIR.mkdir(exist_ok=True)
 # OpenAI
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+# Budget (en tokens estimés) du texte de contrat envoyé pour une extraction : au-delà, seules
+# les pages les plus pertinentes pour le type de contrat sont envoyées (0 = texte complet)
+EXTRACTION_TOKEN_BUDGET = int(os.getenv("EXTRACTION_TOKEN_BUDGET", "6000"))
+# Conserver le texte complet des prompts dans les logs (sinon template + paramètres)
+PROMPT_DEBUG = os.getenv("PROMPT_DEBUG", "false").lower() in ("1", "true", "yes")
 
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./gardetonor.db")
 
+# Pool de connexions des serveurs (PostgreSQL) ; SQLite garde le pool par défaut
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Secondes
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Sessions de lecture (get_read_db) refusées en écriture par la base (PRAGMA query_only)
+DB_READ_QUERY_ONLY = os.getenv("DB_READ_QUERY_ONLY", "true").lower() in ("1", "true", "yes")
+
+# Profil de réglages SQLite appliqué à chaque connexion ("wal" ou "default")
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+SQLITE_PROFILES = {
+    # Réglages d'origine de SQLite (journal rollback, synchronous=FULL)
+    "default": {},
+    # Lectures concurrentes pendant les écritures, attente au lieu de "database is locked"
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "temp_store": "MEMORY",
+    },
+}
+
+# Stockage des PDF (adressé par empreinte SHA-256)
+BLOB_STORE_DIR = Path(os.getenv("BLOB_STORE_DIR", str(DATA_DIR / "blobs")))
+# Âge minimal (minutes) d'un PDF non référencé avant sa suppression (python -m src.database.blob_gc)
+BLOB_GC_MIN_AGE_MINUTES = float(os.getenv("BLOB_GC_MIN_AGE_MINUTES", "60"))
+
+# Archivage : comparaisons et logs anciens déplacés vers une base SQLite séparée
+ARCHIVE_DATABASE_URL = os.getenv("ARCHIVE_DATABASE_URL", "sqlite:///./gardetonor_archive.db")
+ARCHIVE_KEEP_COMPARISONS = int(os.getenv("ARCHIVE_KEEP_COMPARISONS", "20"))  # Par contrat
+ARCHIVE_KEEP_EXTRACTION_LOGS = int(os.getenv("ARCHIVE_KEEP_EXTRACTION_LOGS", "200"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))
+# Archivage périodique depuis l'application (0 = désactivé, utiliser la ligne de commande)
+ARCHIVE_INTERVAL_MINUTES = float(os.getenv("ARCHIVE_INTERVAL_MINUTES", "0"))
+
+# Suppression logique des contrats ayant au moins ce nombre de comparaisons : le contrat
+# est masqué immédiatement et ses lignes sont purgées par lots en arrière-plan
+SOFT_DELETE_MIN_COMPARISONS = int(os.getenv("SOFT_DELETE_MIN_COMPARISONS", "100"))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+# Purge périodique depuis l'application (0 = désactivé, utiliser la ligne de commande)
+PURGE_INTERVAL_MINUTES = float(os.getenv("PURGE_INTERVAL_MINUTES", "0"))
+
+# Extraction du texte des PDF : pages réparties entre processus au-delà de ce nombre de pages
+# (PDF_WORKERS=1 désactive le parallélisme)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "12"))
+# Moteurs d'extraction du texte, du plus rapide au plus précis : une page dont le texte est
+# vide ou illisible (plus de PDF_MAX_GARBLED_RATIO de caractères ratés) est relue par le suivant
+PDF_TEXT_BACKENDS = [
+    name.strip() for name in os.getenv("PDF_TEXT_BACKENDS", "pypdf,pdfplumber").split(",")
+]
+PDF_MAX_GARBLED_RATIO = float(os.getenv("PDF_MAX_GARBLED_RATIO", "0.1"))
+# Import : lecture arrêtée dès que les champs clés du type de contrat sont repérés, plus
+# PDF_EARLY_STOP_MARGIN_PAGES pages (le reste du document n'est ni lu ni envoyé à GPT)
+PDF_EARLY_STOP = os.getenv("PDF_EARLY_STOP", "true").lower() in ("1", "true", "yes")
+PDF_EARLY_STOP_MARGIN_PAGES = int(os.getenv("PDF_EARLY_STOP_MARGIN_PAGES", "1"))
+# Texte complet des PDF lus partiellement : extrait puis indexé en arrière-plan
+# (python -m src.services.indexing_service). Thread de l'application toutes les N minutes
+# (0 = désactivé) : sur une base mise à jour, le premier passage relit tous les anciens PDF
+INDEXING_BATCH_SIZE = int(os.getenv("INDEXING_BATCH_SIZE", "20"))
+INDEXING_INTERVAL_MINUTES = float(os.getenv("INDEXING_INTERVAL_MINUTES", "0"))
+
+# Sauvegardes à chaud (python -m src.database.backup) : la base est copiée par pas de
+# BACKUP_PAGES_PER_STEP pages, avec une pause entre deux pas pour laisser passer les écritures
+BACKUP_DIR = Path(os.getenv("BACKUP_DIR", str(DATA_DIR / "backups")))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_MS = int(os.getenv("BACKUP_STEP_SLEEP_MS", "10"))
+
 # Application
 APP_NAME = os.getenv("APP_NAME", "GardeTonOr")
 NOTIFICATION_DAYS_BEFORE = int(os.getenv("NOTIFICATION_DAYS_BEFORE", "40"))
+# Nombre d'éléments par page dans les listes (historique, contrats, simulations)
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "20"))
 
 # Types de contrats supportés
 CONTRACT_TYPES = {
@@ -1,14 +1,24 @@
 """Package database."""
-from src.database.models import Base, Contract, Comparison, ExtractionLog
-from src.database.database import engine, get_db, get_db_session, init_database
+from src.database.models import Base, Contract, Comparison, ExtractionLog, PdfText
+from src.database.database import (
+    create_db_engine,
+    engine,
+    get_db,
+    get_db_session,
+    get_read_db,
+    init_database,
+)
 
 __all__ = [
     "Base",
     "Contract",
     "Comparison",
     "ExtractionLog",
+    "PdfText",
+    "create_db_engine",
     "engine",
     "get_db",
     "get_db_session",
+    "get_read_db",
     "init_database",
 ]
@@ -0,0 +1,299 @@
+"""
+Sauvegardes à chaud de la base SQLite et des PDF du blob store.
+
+La base est copiée avec l'API de sauvegarde en ligne de SQLite, par pas de quelques
+pages : les écritures de l'application ne sont bloquées que le temps d'un pas. Les
+PDF sont copiés dans un blob store de sauvegarde commun à tous les instantanés ; en
+mode incrémental, seuls les PDF absents de l'instantané précédent sont copiés.
+
+Usage (application démarrée ou non) :
+    python -m src.database.backup create [--incremental]   # nouvel instantané
+    python -m src.database.backup verify [instantané]      # contrôle (dernier si omis)
+    python -m src.database.backup restore instantané --url sqlite:///./restaure.db
+
+Chaque instantané est un répertoire de BACKUP_DIR contenant la base et un manifeste
+(manifest.json) listant les PDF qu'elle référence.
+"""
+import argparse
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import make_url
+
+from src.config import BACKUP_DIR, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP_MS, DATABASE_URL
+from src.database.blob_store import BLOB_REFERENCES, BlobStore, blob_store
+from src.database.migrate import get_alembic_config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_DB_NAME = "gardetonor.db"
+BACKUP_BLOBS_DIR = "blobs"
+
+
+def sqlite_path(url: str) -> Path:
+    """
+    Chemin du fichier d'une base SQLite.
+
+    Raises:
+        ValueError: Si l'URL ne désigne pas une base SQLite sur fichier
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        raise ValueError(f"Sauvegarde limitée aux bases SQLite sur fichier: {url}")
+    return Path(parsed.database)
+
+
+def copy_database(
+    source: Path,
+    target: Path,
+    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+    step_sleep_ms: int = BACKUP_STEP_SLEEP_MS,
+) -> None:
+    """
+    Copie une base SQLite ouverte par d'autres connexions avec l'API de sauvegarde.
+
+    Args:
+        source: Fichier de la base à copier
+        target: Fichier de destination (remplacé)
+        pages_per_step: Nombre de pages copiées par pas
+        step_sleep_ms: Pause entre deux pas, en millisecondes
+    """
+    source_connection = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.backup(
+            target_connection, pages=pages_per_step, sleep=step_sleep_ms / 1000
+        )
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def _referenced_blobs(db_path: Path) -> List[str]:
+    """Empreintes des PDF référencés par une base."""
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        hashes = set()
+        for table, column in BLOB_REFERENCES:
+            rows = connection.execute(f"SELECT DISTINCT {column} FROM {table}")
+            hashes.update(row[0] for row in rows if row[0])
+        return sorted(hashes)
+    finally:
+        connection.close()
+
+
+def _revision(db_path: Path) -> Optional[str]:
+    """Révision Alembic d'une base, None si elle n'est pas suivie."""
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return connection.execute("SELECT version_num FROM alembic_version").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        connection.close()
+
+
+def _head_revision() -> Optional[str]:
+    """Dernière révision des migrations de l'application."""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def read_manifest(snapshot: Path) -> Dict:
+    """Lit le manifeste d'un instantané."""
+    return json.loads((Path(snapshot) / MANIFEST_NAME).read_text(encoding="utf-8"))
+
+
+def list_snapshots(backup_dir: Path = BACKUP_DIR) -> List[Path]:
+    """Instantanés complets (avec manifeste) du plus ancien au plus récent."""
+    backup_dir = Path(backup_dir)
+    if not backup_dir.exists():
+        return []
+    return sorted(path.parent for path in backup_dir.glob(f"*/{MANIFEST_NAME}"))
+
+
+def create_snapshot(
+    url: str = DATABASE_URL,
+    backup_dir: Path = BACKUP_DIR,
+    incremental: bool = False,
+    source_blobs: BlobStore = blob_store,
+) -> Path:
+    """
+    Crée un instantané de la base et des PDF qu'elle référence.
+
+    Args:
+        url: URL de la base SQLite à sauvegarder
+        backup_dir: Répertoire des sauvegardes
+        incremental: Si True, ne copie que les PDF absents de l'instantané précédent
+        source_blobs: Blob store de l'application
+
+    Returns:
+        Répertoire de l'instantané
+
+    Raises:
+        ValueError: Si la base n'est pas une base SQLite sur fichier
+    """
+    source = sqlite_path(url)
+    backup_dir = Path(backup_dir)
+    snapshots = list_snapshots(backup_dir)
+    previous = snapshots[-1] if incremental and snapshots else None
+    already_saved = read_manifest(previous)["blobs"] if previous else {}
+
+    snapshot = backup_dir / datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    snapshot.mkdir(parents=True)
+    db_path = snapshot / SNAPSHOT_DB_NAME
+    copy_database(source, db_path)
+
+    # Références lues dans la copie : les PDF du même instant que la base
+    backup_blobs = BlobStore(backup_dir / BACKUP_BLOBS_DIR)
+    blobs, missing, copied = {}, [], 0
+    for blob_hash in _referenced_blobs(db_path):
+        if blob_hash in already_saved:
+            blobs[blob_hash] = already_saved[blob_hash]
+            continue
+        data = source_blobs.get(blob_hash)
+        if data is None:
+            missing.append(blob_hash)
+            continue
+        blobs[blob_hash] = backup_blobs.put(data)[1]
+        copied += 1
+
+    manifest = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": _revision(db_path),
+        "incremental": previous is not None,
+        "base_snapshot": previous.name if previous else None,
+        "blobs": blobs,
+        "missing_blobs": missing,
+        "copied_blobs": copied,
+    }
+    (snapshot / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if missing:
+        # Absents du blob store de l'application : impossibles à sauvegarder
+        logger.warning("Instantané %s : %s PDF introuvable(s)", snapshot.name, len(missing))
+    logger.info(
+        "Instantané %s : %s PDF copiés sur %s", snapshot.name, copied, len(blobs) + len(missing)
+    )
+    return snapshot
+
+
+def verify_snapshot(snapshot: Path) -> List[str]:
+    """
+    Vérifie qu'un instantané peut être restauré.
+
+    Contrôle l'intégrité de la base (integrity_check, clés étrangères), sa révision
+    (la dernière des migrations de l'application) et la présence de chaque PDF
+    sauvegardé d'après le manifeste, dont le contenu doit correspondre à son
+    empreinte. Les PDF déjà absents à la création (missing_blobs) ne sont pas signalés.
+
+    Args:
+        snapshot: Répertoire de l'instantané
+
+    Returns:
+        Liste des problèmes détectés (vide si l'instantané est valide)
+    """
+    snapshot = Path(snapshot)
+    db_path = snapshot / SNAPSHOT_DB_NAME
+    if not db_path.exists() or not (snapshot / MANIFEST_NAME).exists():
+        return [f"Instantané incomplet: {snapshot}"]
+
+    manifest = read_manifest(snapshot)
+    problems = []
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        integrity = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+        if integrity != ["ok"]:
+            problems.extend(f"Intégrité: {message}" for message in integrity)
+        for table, rowid, parent, _ in connection.execute("PRAGMA foreign_key_check"):
+            problems.append(f"Clé étrangère: {table} ligne {rowid} sans {parent}")
+    finally:
+        connection.close()
+
+    revision, head = _revision(db_path), _head_revision()
+    if revision != head:
+        problems.append(f"Révision {revision} au lieu de {head}")
+
+    recorded = manifest["blobs"]
+    unrecorded = set(_referenced_blobs(db_path)) - set(recorded) - set(manifest["missing_blobs"])
+    problems.extend(f"PDF absent du manifeste: {blob_hash}" for blob_hash in sorted(unrecorded))
+
+    backup_blobs = BlobStore(snapshot.parent / BACKUP_BLOBS_DIR)
+    for blob_hash in recorded:
+        data = backup_blobs.get(blob_hash)
+        if data is None:
+            problems.append(f"PDF absent: {blob_hash}")
+        elif BlobStore.compute_hash(data) != blob_hash:
+            problems.append(f"PDF corrompu: {blob_hash}")
+    return problems
+
+
+def restore_snapshot(
+    snapshot: Path, url: str = DATABASE_URL, target_blobs: BlobStore = blob_store
+) -> None:
+    """
+    Restaure un instantané vérifié (application arrêtée).
+
+    Args:
+        snapshot: Répertoire de l'instantané
+        url: URL de la base SQLite à remplacer
+        target_blobs: Blob store de l'application, complété des PDF manquants
+
+    Raises:
+        ValueError: Si l'instantané ne passe pas la vérification
+    """
+    snapshot = Path(snapshot)
+    problems = verify_snapshot(snapshot)
+    if problems:
+        raise ValueError("Instantané invalide:\n" + "\n".join(problems))
+
+    backup_blobs = BlobStore(snapshot.parent / BACKUP_BLOBS_DIR)
+    for blob_hash in read_manifest(snapshot)["blobs"]:
+        if not target_blobs.exists(blob_hash):
+            target_blobs.put(backup_blobs.get(blob_hash))
+
+    target = sqlite_path(url)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    copy_database(snapshot / SNAPSHOT_DB_NAME, target)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Sauvegardes de la base GardeTonOr")
+    parser.add_argument("--url", default=DATABASE_URL, help="URL de la base de données")
+    parser.add_argument("--dir", type=Path, default=BACKUP_DIR, help="Répertoire des sauvegardes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create")
+    create_parser.add_argument("--incremental", action="store_true")
+    verify_parser = subparsers.add_parser("verify")
+    verify_parser.add_argument("snapshot", nargs="?", type=Path)
+    restore_parser = subparsers.add_parser("restore")
+    restore_parser.add_argument("snapshot", type=Path)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "create":
+        snapshot = create_snapshot(args.url, args.dir, incremental=args.incremental)
+        print(f"Instantané créé: {snapshot}")
+    elif args.command == "verify":
+        snapshots = list_snapshots(args.dir)
+        snapshot = args.snapshot or (snapshots[-1] if snapshots else None)
+        if snapshot is None:
+            parser.exit(1, "Aucun instantané\n")
+        problems = verify_snapshot(snapshot)
+        for problem in problems:
+            print(problem)
+        parser.exit(1 if problems else 0, "" if problems else f"Instantané valide: {snapshot}\n")
+    else:
+        restore_snapshot(args.snapshot, args.url)
+        print(f"Instantané restauré: {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Suppression des PDF du blob store qui ne sont plus référencés.
+
+Un PDF reste sur disque après la suppression de son contrat, ou quand la transaction
+qui devait le référencer a échoué. Un blob est supprimé quand aucune ligne de la base
+principale ni de la base d'archive ne le référence, et qu'il est plus ancien que
+BLOB_GC_MIN_AGE_MINUTES (un import en cours écrit le PDF avant de valider sa ligne).
+
+Usage (exécuté aussi après chaque purge des contrats supprimés) :
+    python -m src.database.blob_gc [--min-age 60] [--dry-run]
+"""
+import argparse
+import logging
+import time
+from typing import List, Optional, Set
+
+from sqlalchemy import column, inspect, select, table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from src.config import BLOB_GC_MIN_AGE_MINUTES
+from src.database.blob_store import BLOB_REFERENCES, BlobStore, blob_store
+
+logger = logging.getLogger(__name__)
+
+
+def _referenced_hashes(connection: Connection) -> Set[str]:
+    """Empreintes référencées par les tables présentes dans une base."""
+    existing = set(inspect(connection).get_table_names())
+    hashes = set()
+    for table_name, column_name in BLOB_REFERENCES:
+        if table_name in existing:
+            reference = column(column_name)
+            rows = connection.execute(
+                select(reference).distinct().select_from(table(table_name, reference))
+            )
+            hashes.update(value for value in rows.scalars() if value)
+    return hashes
+
+
+def collect_garbage(
+    db: Session,
+    archive_engine: Optional[Engine] = None,
+    store: BlobStore = blob_store,
+    min_age_minutes: float = BLOB_GC_MIN_AGE_MINUTES,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Supprime les blobs qui ne sont référencés ni par la base principale ni par l'archive.
+
+    Les lignes supprimées logiquement référencent encore leur PDF : il n'est supprimé
+    qu'après leur purge.
+
+    Args:
+        db: Session de la base principale
+        archive_engine: Engine de la base d'archive (ignorée si None)
+        store: Blob store à nettoyer
+        min_age_minutes: Âge minimal d'un blob pour être supprimé
+        dry_run: Si True, liste les blobs sans les supprimer
+
+    Returns:
+        Empreintes des blobs supprimés (ou à supprimer en dry_run)
+    """
+    referenced = _referenced_hashes(db.connection())
+    if archive_engine is not None:
+        with archive_engine.connect() as connection:
+            referenced |= _referenced_hashes(connection)
+
+    oldest_mtime = time.time() - min_age_minutes * 60
+    unreferenced = [
+        blob_hash
+        for blob_hash in store.iter_hashes()
+        if blob_hash not in referenced and store.path_for(blob_hash).stat().st_mtime < oldest_mtime
+    ]
+    if not dry_run:
+        for blob_hash in unreferenced:
+            store.delete(blob_hash)
+    return sorted(unreferenced)
+
+
+def run_blob_gc_job(**kwargs) -> List[str]:
+    """Nettoie le blob store de l'application, dans sa propre session."""
+    from src.database.database import SessionLocal
+    from src.services.archive_service import get_archive_engine
+
+    db = SessionLocal()
+    try:
+        deleted = collect_garbage(db, get_archive_engine(), **kwargs)
+        if deleted:
+            logger.info("%s PDF non référencé(s) supprimé(s)", len(deleted))
+        return deleted
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Suppression des PDF non référencés")
+    parser.add_argument("--min-age", type=float, default=BLOB_GC_MIN_AGE_MINUTES)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    deleted = run_blob_gc_job(min_age_minutes=args.min_age, dry_run=args.dry_run)
+    action = "à supprimer" if args.dry_run else "supprimé(s)"
+    print(f"{len(deleted)} PDF non référencé(s) {action}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Stockage des documents PDF sur disque, adressé par contenu (SHA-256)."""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from src.config import BLOB_STORE_DIR
+
+# Colonnes (table, colonne) référençant un PDF du blob store
+BLOB_REFERENCES = (("contracts", "pdf_hash"), ("comparisons", "competitor_pdf_hash"))
+
+
+class BlobStore:
+    """
+    Stocke des blobs binaires dans un répertoire, indexés par leur empreinte SHA-256.
+
+    Les fichiers sont répartis en sous-répertoires selon les deux premiers caractères
+    de l'empreinte pour éviter des répertoires trop volumineux. Un même contenu n'est
+    stocké qu'une seule fois.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialise le store.
+
+        Args:
+            root: Répertoire racine du store (créé à la première écriture)
+        """
+        self.root = Path(root)
+
+    @staticmethod
+    def compute_hash(data: bytes) -> str:
+        """Retourne l'empreinte SHA-256 hexadécimale des données."""
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, blob_hash: str) -> Path:
+        """Retourne le chemin du fichier correspondant à une empreinte."""
+        return self.root / blob_hash[:2] / blob_hash
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """
+        Enregistre des données dans le store.
+
+        Args:
+            data: Contenu à stocker
+
+        Returns:
+            Tuple (empreinte SHA-256, taille en octets)
+        """
+        blob_hash = self.compute_hash(data)
+        path = self.path_for(blob_hash)
+
+        try:
+            # Contenu déjà stocké : date rafraîchie pour que blob_gc le considère comme
+            # récent jusqu'à la validation de la ligne qui va le référencer
+            os.utime(path)
+            return blob_hash, len(data)
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Écriture atomique : fichier temporaire puis renommage
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_name, path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+        return blob_hash, len(data)
+
+    def get(self, blob_hash: str) -> Optional[bytes]:
+        """
+        Lit un blob depuis le store.
+
+        Args:
+            blob_hash: Empreinte SHA-256 du blob
+
+        Returns:
+            Contenu du blob, ou None s'il est absent
+        """
+        path = self.path_for(blob_hash)
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
+    def iter_hashes(self) -> Iterator[str]:
+        """Parcourt les empreintes des blobs présents (fichiers temporaires exclus)."""
+        if not self.root.is_dir():
+            return
+        for path in self.root.glob("??/*"):
+            if path.is_file() and not path.name.startswith(".tmp-"):
+                yield path.name
+
+    def exists(self, blob_hash: str) -> bool:
+        """Indique si un blob est présent dans le store."""
+        return self.path_for(blob_hash).exists()
+
+    def delete(self, blob_hash: str) -> bool:
+        """
+        Supprime un blob du store.
+
+        Returns:
+            True si le blob existait et a été supprimé
+        """
+        path = self.path_for(blob_hash)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+
+# Store par défaut utilisé par les modèles
+blob_store = BlobStore(BLOB_STORE_DIR)
@@ -1,27 +1,115 @@
 """Gestion de la connexion à la base de données."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, Optional
 
-from src.config import DATABASE_URL
-from src.database.models import Base
-
-# Création de l'engine SQLite
-engine = create_engine(
+from src.config import (
     DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Nécessaire pour SQLite
-    echo=False,  # Mettre à True pour debug SQL
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_READ_QUERY_ONLY,
+    SQLITE_PROFILE,
+    SQLITE_PROFILES,
 )
+from src.database.models import Base
+from src.database import search_index  # noqa: F401 (crée l'index FTS5 avec create_all)
+
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """Enregistre un listener appliquant les PRAGMA à chaque nouvelle connexion."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Options de create_engine adaptées au dialecte de l'URL.
+
+    SQLite : connexion partagée entre threads (Streamlit), pool par défaut.
+    Serveurs (PostgreSQL) : pool borné, connexions vérifiées avant usage et
+    renouvelées périodiquement (coupures réseau, redémarrage du serveur).
+
+    Args:
+        url: URL de la base de données
+
+    Returns:
+        Arguments nommés pour create_engine
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
+def create_db_engine(url: str = DATABASE_URL, profile: Optional[str] = None) -> Engine:
+    """
+    Crée l'engine SQLAlchemy avec les options du dialecte et le profil SQLite demandé.
+
+    Args:
+        url: URL de la base de données
+        profile: Nom du profil dans SQLITE_PROFILES (SQLITE_PROFILE si None)
+
+    Returns:
+        Engine configuré
+
+    Raises:
+        ValueError: Si le profil est inconnu
+    """
+    profile = profile or SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Profil SQLite inconnu: {profile}")
+
+    db_engine = create_engine(url, echo=False, **engine_options(url))  # echo=True pour debug SQL
+
+    if db_engine.dialect.name == "sqlite":
+        # SQLite n'applique les clés étrangères (et ON DELETE CASCADE) que sur demande
+        _apply_sqlite_pragmas(db_engine, {"foreign_keys": "ON", **SQLITE_PROFILES[profile]})
+
+    return db_engine
+
+
+# Création de l'engine (SQLite par défaut, PostgreSQL via DATABASE_URL)
+engine = create_db_engine()
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions de lecture : jamais de flush ni de commit, objets lisibles après fermeture
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
 
 def init_database() -> None:
-    """Initialise la base de données en créant toutes les tables."""
+    """
+    Initialise la base de données en créant toutes les tables.
+
+    Une base neuve est marquée à la dernière révision Alembic. Une base existante
+    doit être mise à jour hors ligne avec `python -m src.database.migrate upgrade`.
+    """
+    is_new_database = not inspect(engine).has_table("contracts")
     Base.metadata.create_all(bind=engine)
 
+    if is_new_database:
+        from src.database.migrate import stamp
+
+        stamp(engine.url.render_as_string(hide_password=False))
+
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
@@ -43,6 +131,49 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _set_query_only(db: Session, enabled: bool) -> None:
+    """Interdit (ou réautorise) les écritures sur la connexion de la session."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # Réglage de la connexion : il doit être levé avant son retour au pool
+        db.connection().exec_driver_sql(f"PRAGMA query_only = {'ON' if enabled else 'OFF'}")
+    elif dialect == "postgresql" and enabled:
+        # Limité à la transaction en cours, terminée à la fermeture de la session
+        db.connection().exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+@contextmanager
+def get_read_db(query_only: bool = DB_READ_QUERY_ONLY) -> Generator[Session, None, None]:
+    """
+    Context manager pour les pages en lecture seule.
+
+    Contrairement à get_db, la session n'est jamais flushée ni commitée : pas de
+    verrou d'écriture ni de synchronisation disque à chaque rerun Streamlit. Les
+    objets chargés restent lisibles après la sortie du bloc.
+
+    Usage:
+        with get_read_db() as db:
+            contracts = db.query(Contract).all()
+
+    Args:
+        query_only: Si True, la base refuse toute écriture dans la session
+    """
+    db = ReadSessionLocal()
+    try:
+        if query_only:
+            _set_query_only(db, True)
+        yield db
+    finally:
+        try:
+            if query_only:
+                if not db.is_active:
+                    db.rollback()  # Écriture refusée : la transaction doit être annulée
+                _set_query_only(db, False)
+        finally:
+            # close() annule la transaction sans expirer les objets chargés
+            db.close()
+
+
 def get_db_session() -> Session:
     """
     Retourne une session de base de données.
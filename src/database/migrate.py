@@ -0,0 +1,89 @@
+"""
+Migrations de schéma et de données (Alembic).
+
+À lancer application arrêtée :
+    python -m src.database.migrate upgrade          # applique toutes les migrations
+    python -m src.database.migrate current          # affiche la révision de la base
+    python -m src.database.migrate history          # liste les révisions
+    python -m src.database.migrate downgrade 0003   # revient à une révision
+
+Les révisions inspectent la base pour adopter les bases créées avant Alembic : le mode
+--sql d'Alembic (génération de SQL sans connexion) n'est pas pris en charge.
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from alembic import command
+from alembic.config import Config
+
+from src.config import DATABASE_URL
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+
+def get_alembic_config(url: str = DATABASE_URL) -> Config:
+    """
+    Construit la configuration Alembic pour une base donnée.
+
+    Args:
+        url: URL de la base de données
+
+    Returns:
+        Configuration Alembic
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    # ConfigParser interprète les % : ils doivent être doublés
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def upgrade(url: str = DATABASE_URL, revision: str = "head") -> None:
+    """Applique les migrations jusqu'à la révision demandée."""
+    command.upgrade(get_alembic_config(url), revision)
+
+
+def downgrade(url: str = DATABASE_URL, revision: str = "-1") -> None:
+    """Annule les migrations jusqu'à la révision demandée."""
+    command.downgrade(get_alembic_config(url), revision)
+
+
+def stamp(url: str = DATABASE_URL, revision: str = "head") -> None:
+    """Marque la base comme étant à une révision, sans rien exécuter."""
+    command.stamp(get_alembic_config(url), revision)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Migrations de la base GardeTonOr")
+    parser.add_argument("--url", default=DATABASE_URL, help="URL de la base de données")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, default_revision in (("upgrade", "head"), ("downgrade", "-1")):
+        subparser = subparsers.add_parser(name)
+        subparser.add_argument("revision", nargs="?", default=default_revision)
+
+    stamp_parser = subparsers.add_parser("stamp")
+    stamp_parser.add_argument("revision", nargs="?", default="head")
+    subparsers.add_parser("current")
+    subparsers.add_parser("history")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "upgrade":
+        upgrade(args.url, args.revision)
+    elif args.command == "downgrade":
+        downgrade(args.url, args.revision)
+    elif args.command == "stamp":
+        stamp(args.url, args.revision)
+    elif args.command == "current":
+        command.current(get_alembic_config(args.url), verbose=True)
+    else:
+        command.history(get_alembic_config(args.url))
+
+
+if __name__ == "__main__":
+    main()
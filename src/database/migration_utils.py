@@ -0,0 +1,117 @@
+"""Utilitaires partagés par les révisions Alembic (opérations idempotentes et backfills)."""
+import json
+from typing import Any, Callable, Dict, List, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+
+from src.database.models import CONTRACT_DATA_GIN_INDEX
+from src.database.search_index import is_search_table
+
+# Nombre de lignes traitées par transaction lors des backfills
+BACKFILL_BATCH_SIZE = 500
+
+
+def has_table(table: str) -> bool:
+    """Indique si la table existe dans la base cible."""
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    """Indique si la colonne existe dans la table cible."""
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(info["name"] == column for info in columns)
+
+
+def has_index(table: str, index_name: str) -> bool:
+    """Indique si l'index existe sur la table cible."""
+    indexes = sa.inspect(op.get_bind()).get_indexes(table)
+    return any(info["name"] == index_name for info in indexes)
+
+
+def add_column_if_missing(table: str, column: sa.Column) -> None:
+    """Ajoute une colonne si elle n'existe pas (bases migrées par l'ancien script)."""
+    if not has_column(table, column.name):
+        op.add_column(table, column)
+
+
+def create_index_if_missing(index_name: str, table: str, columns: List[str]) -> None:
+    """Crée un index s'il n'existe pas."""
+    if not has_index(table, index_name):
+        op.create_index(index_name, table, columns)
+
+
+def drop_index_if_exists(index_name: str, table: str) -> None:
+    """Supprime un index s'il existe."""
+    if has_index(table, index_name):
+        op.drop_index(index_name, table_name=table)
+
+
+def include_name(name: str, type_: str, parent_names: Dict[str, Any]) -> bool:
+    """
+    Filtre d'autogénération : ignore les objets créés par DDL spécifique au dialecte.
+
+    L'index FTS5 et ses tables internes (SQLite) et l'index GIN de contract_data
+    (PostgreSQL) ne sont pas déclarés dans les modèles.
+    """
+    if type_ == "index":
+        return name != CONTRACT_DATA_GIN_INDEX
+    return not (type_ == "table" and is_search_table(name))
+
+
+def load_json(value: Any) -> Any:
+    """Décode une colonne JSON lue en SQL brut (texte sous SQLite, déjà décodée ailleurs)."""
+    if value is None or isinstance(value, (dict, list)):
+        return value
+    return json.loads(value)
+
+
+def backfill_in_batches(
+    table: str,
+    columns: Sequence[str],
+    where: str,
+    compute: Callable[[Any], Dict[str, Any]],
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """
+    Met à jour par lots les lignes d'une table, avec un commit par lot.
+
+    La connexion de la migration est passée en autocommit pendant le backfill pour ne
+    pas garder le verrou d'écriture ; les lots sont écrits sur une connexion dédiée.
+    Le filtre `where` doit exclure les lignes déjà traitées : une migration interrompue
+    reprend alors là où elle s'était arrêtée.
+
+    Args:
+        table: Table à mettre à jour
+        columns: Colonnes lues et passées à `compute` (en plus de `id`)
+        where: Condition SQL sélectionnant les lignes restant à traiter
+        compute: Fonction retournant les valeurs à écrire pour une ligne
+        batch_size: Nombre de lignes par transaction
+
+    Returns:
+        Nombre de lignes mises à jour
+    """
+    select = text(
+        f"SELECT id, {', '.join(columns)} FROM {table} "
+        f"WHERE id > :last_id AND ({where}) ORDER BY id LIMIT :limit"
+    )
+    updated = 0
+    last_id = 0
+
+    with op.get_context().autocommit_block():
+        with op.get_bind().engine.connect() as connection:
+            while True:
+                rows = connection.execute(select, {"last_id": last_id, "limit": batch_size}).all()
+                if not rows:
+                    break
+
+                values = [dict(compute(row), id=row.id) for row in rows]
+                assignments = ", ".join(f"{name} = :{name}" for name in values[0] if name != "id")
+                connection.execute(text(f"UPDATE {table} SET {assignments} WHERE id = :id"), values)
+                connection.commit()
+
+                updated += len(rows)
+                last_id = rows[-1].id
+
+    return updated
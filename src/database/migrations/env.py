@@ -0,0 +1,45 @@
+"""Environnement Alembic de GardeTonOr."""
+from alembic import context
+from sqlalchemy import event
+
+from src.database.database import create_db_engine
+from src.database.migration_utils import include_name
+from src.database.models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_online() -> None:
+    """Applique les migrations sur la base (une transaction par révision)."""
+    engine = create_db_engine(config.get_main_option("sqlalchemy.url"))
+    if engine.dialect.name == "sqlite":
+        # batch_alter_table recrée les tables : supprimer l'ancienne copie d'une table
+        # parente ne doit pas déclencher ON DELETE CASCADE sur ses enfants
+        event.listen(
+            engine,
+            "connect",
+            lambda dbapi_connection, record: dbapi_connection.execute("PRAGMA foreign_keys=OFF"),
+        )
+
+    try:
+        with engine.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                include_name=include_name,
+                render_as_batch=True,
+                transaction_per_migration=True,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    # Les révisions inspectent la base pour adopter les bases créées avant Alembic
+    raise RuntimeError("Le mode --sql n'est pas pris en charge : lancez la migration sur la base")
+
+run_migrations_online()
@@ -0,0 +1,83 @@
+"""Schéma initial (contrats, comparaisons, logs d'extraction)
+
+Les bases créées avant Alembic par init_database() sont adoptées telles quelles :
+les tables existantes ne sont pas recréées.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-12-01
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import add_column_if_missing, has_table
+
+# Identifiants de révision utilisés par Alembic
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table("contracts"):
+        op.create_table(
+            "contracts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("contract_type", sa.String(50), nullable=False),
+            sa.Column("provider", sa.String(200), nullable=False),
+            sa.Column("start_date", sa.DateTime(), nullable=False),
+            sa.Column("end_date", sa.DateTime(), nullable=True),
+            sa.Column("anniversary_date", sa.DateTime(), nullable=False),
+            sa.Column("contract_data", sa.JSON(), nullable=False),
+            sa.Column("original_filename", sa.String(500)),
+            sa.Column("pdf_content", sa.LargeBinary(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("validated", sa.Integer()),
+            sa.Column("is_simulation", sa.Integer()),
+        )
+        op.create_index("ix_contracts_id", "contracts", ["id"])
+        op.create_index("ix_contracts_contract_type", "contracts", ["contract_type"])
+        op.create_index("ix_contracts_anniversary_date", "contracts", ["anniversary_date"])
+    else:
+        # Colonne ajoutée à la main par l'ancien migrate_db.py
+        add_column_if_missing("contracts", sa.Column("is_simulation", sa.Integer(), default=0))
+
+    if not has_table("comparisons"):
+        op.create_table(
+            "comparisons",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("contract_id", sa.Integer(), sa.ForeignKey("contracts.id"), nullable=False),
+            sa.Column("comparison_type", sa.String(50), nullable=False),
+            sa.Column("competitor_filename", sa.String(500), nullable=True),
+            sa.Column("competitor_pdf", sa.LargeBinary(), nullable=True),
+            sa.Column("competitor_data", sa.JSON(), nullable=True),
+            sa.Column("gpt_prompt", sa.Text(), nullable=False),
+            sa.Column("gpt_response", sa.Text(), nullable=False),
+            sa.Column("analysis_summary", sa.Text(), nullable=True),
+            sa.Column("comparison_result", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_comparisons_id", "comparisons", ["id"])
+
+    if not has_table("extraction_logs"):
+        op.create_table(
+            "extraction_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("filename", sa.String(500), nullable=False),
+            sa.Column("contract_type", sa.String(50), nullable=False),
+            sa.Column("gpt_prompt", sa.Text(), nullable=False),
+            sa.Column("gpt_response", sa.Text(), nullable=False),
+            sa.Column("extracted_data", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("success", sa.Integer()),
+            sa.Column("error_message", sa.Text(), nullable=True),
+        )
+        op.create_index("ix_extraction_logs_id", "extraction_logs", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("extraction_logs")
+    op.drop_table("comparisons")
+    op.drop_table("contracts")
@@ -0,0 +1,78 @@
+"""Déplacement des PDF vers le blob store
+
+Les colonnes BLOB sont remplacées par une empreinte SHA-256 et une taille. Les PDF
+existants sont copiés dans le blob store par petits lots avant suppression des
+anciennes colonnes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-12-02
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.blob_store import blob_store
+from src.database.migration_utils import (
+    add_column_if_missing,
+    backfill_in_batches,
+    has_column,
+)
+
+# Identifiants de révision utilisés par Alembic
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (table, ancienne colonne BLOB, colonne empreinte, colonne taille)
+PDF_BLOB_COLUMNS = [
+    ("contracts", "pdf_content", "pdf_hash", "pdf_size"),
+    ("comparisons", "competitor_pdf", "competitor_pdf_hash", "competitor_pdf_size"),
+]
+
+# Les PDF sont lus en mémoire : lots réduits
+PDF_BATCH_SIZE = 20
+
+
+def upgrade() -> None:
+    for table, legacy_column, hash_column, size_column in PDF_BLOB_COLUMNS:
+        add_column_if_missing(table, sa.Column(hash_column, sa.String(64), nullable=True))
+        add_column_if_missing(table, sa.Column(size_column, sa.Integer(), nullable=True))
+
+        if not has_column(table, legacy_column):
+            continue
+
+        def _move_to_store(row):
+            blob_hash, blob_size = blob_store.put(bytes(row[1]))
+            return {hash_column: blob_hash, size_column: blob_size, legacy_column: None}
+
+        backfill_in_batches(
+            table,
+            [legacy_column],
+            f"{legacy_column} IS NOT NULL",
+            _move_to_store,
+            batch_size=PDF_BATCH_SIZE,
+        )
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(legacy_column)
+
+
+def downgrade() -> None:
+    for table, legacy_column, hash_column, size_column in PDF_BLOB_COLUMNS:
+        op.add_column(table, sa.Column(legacy_column, sa.LargeBinary(), nullable=True))
+
+        def _load_from_store(row):
+            return {legacy_column: blob_store.get(row[1])}
+
+        backfill_in_batches(
+            table,
+            [hash_column],
+            f"{hash_column} IS NOT NULL AND {legacy_column} IS NULL",
+            _load_from_store,
+            batch_size=PDF_BATCH_SIZE,
+        )
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(size_column)
+            batch_op.drop_column(hash_column)
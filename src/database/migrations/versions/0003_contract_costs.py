@@ -0,0 +1,87 @@
+"""Coûts mensuel et annuel normalisés des contrats
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-12-03
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import (
+    add_column_if_missing,
+    backfill_in_batches,
+    create_index_if_missing,
+    load_json,
+)
+
+# Identifiants de révision utilisés par Alembic
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COST_COLUMNS = ["monthly_cost_eur", "annual_cost_eur"]
+
+
+# Copie figée du calcul en vigueur à cette révision : la migration ne doit pas changer
+# de comportement quand le code de l'application évolue
+def _to_float(value):
+    """Convertit un montant en float, None si absent ou nul."""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount or None
+
+
+def compute_contract_costs(contract_type, contract_data):
+    """Coûts mensuel et annuel normalisés d'un contrat, None si non déterminables."""
+    data = contract_data or {}
+    monthly = annual = None
+
+    if contract_type == "telephone":
+        monthly = _to_float(data.get("prix_mensuel"))
+    elif contract_type == "assurance_pno":
+        monthly = _to_float(data.get("prime_mensuelle"))
+        annual = _to_float(data.get("prime_annuelle"))
+    elif contract_type == "assurance_habitation":
+        tarifs = data.get("tarifs") or {}
+        monthly = _to_float(tarifs.get("prime_mensuelle_ttc"))
+        annual = _to_float(tarifs.get("prime_annuelle_ttc"))
+    elif contract_type in ["electricite", "gaz"]:
+        annual = _to_float(data.get("estimation_facture_annuelle"))
+        if annual is None:
+            monthly = _to_float(data.get("prix_abonnement_mensuel"))
+
+    if annual is None and monthly is not None:
+        annual = round(monthly * 12, 2)
+    if monthly is None and annual is not None:
+        monthly = round(annual / 12, 2)
+
+    return monthly, annual
+
+
+def _compute_costs(row):
+    monthly_cost, annual_cost = compute_contract_costs(row[1], load_json(row[2]) or {})
+    return {"monthly_cost_eur": monthly_cost, "annual_cost_eur": annual_cost}
+
+
+def upgrade() -> None:
+    for column in COST_COLUMNS:
+        add_column_if_missing("contracts", sa.Column(column, sa.Float(), nullable=True))
+        create_index_if_missing(f"ix_contracts_{column}", "contracts", [column])
+
+    backfill_in_batches(
+        "contracts",
+        ["contract_type", "contract_data"],
+        "monthly_cost_eur IS NULL AND annual_cost_eur IS NULL",
+        _compute_costs,
+    )
+
+
+def downgrade() -> None:
+    for column in COST_COLUMNS:
+        op.drop_index(f"ix_contracts_{column}", table_name="contracts")
+    with op.batch_alter_table("contracts") as batch_op:
+        for column in COST_COLUMNS:
+            batch_op.drop_column(column)
@@ -0,0 +1,70 @@
+"""Économie annuelle normalisée des comparaisons
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-12-04
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import add_column_if_missing, backfill_in_batches, load_json
+
+# Identifiants de révision utilisés par Alembic
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+# Copie figée du calcul en vigueur à cette révision : la migration ne doit pas changer
+# de comportement quand le code de l'application évolue
+def _to_float(value):
+    """Convertit un montant en float, None si absent ou nul."""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount or None
+
+
+def compute_annual_savings(comparison_result):
+    """Économie annuelle d'une comparaison (négative en cas de surcoût, 0 si inconnue)."""
+    if not comparison_result:
+        return 0.0
+
+    market_analysis = comparison_result.get("analyse", {})
+    if not isinstance(market_analysis, dict):
+        market_analysis = {}
+
+    def _yearly(monthly):
+        amount = _to_float(monthly)
+        return amount * 12 if amount is not None else None
+
+    candidates = [
+        comparison_result.get("economie_potentielle_annuelle"),
+        _yearly(comparison_result.get("economie_potentielle_mensuelle")),
+        market_analysis.get("economie_potentielle_annuelle"),
+        _yearly(market_analysis.get("economie_potentielle_mensuelle")),
+        (comparison_result.get("comparaison_prix") or {}).get("economie_potentielle"),
+    ]
+    for candidate in candidates:
+        amount = _to_float(candidate)
+        if amount is not None:
+            return amount
+    return 0.0
+
+
+def upgrade() -> None:
+    add_column_if_missing("comparisons", sa.Column("annual_savings_eur", sa.Float(), nullable=True))
+
+    backfill_in_batches(
+        "comparisons",
+        ["comparison_result"],
+        "annual_savings_eur IS NULL",
+        lambda row: {"annual_savings_eur": compute_annual_savings(load_json(row[1]))},
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("comparisons") as batch_op:
+        batch_op.drop_column("annual_savings_eur")
@@ -0,0 +1,34 @@
+"""Index composites alignés sur les requêtes du service
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-12-05
+"""
+from src.database.migration_utils import create_index_if_missing, drop_index_if_exists
+
+# Identifiants de révision utilisés par Alembic
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    (
+        "ix_contracts_is_simulation_anniversary_date",
+        "contracts",
+        ["is_simulation", "anniversary_date"],
+    ),
+    ("ix_comparisons_contract_id_created_at", "comparisons", ["contract_id", "created_at"]),
+    ("ix_comparisons_created_at", "comparisons", ["created_at"]),
+    ("ix_extraction_logs_created_at", "extraction_logs", ["created_at"]),
+]
+
+
+def upgrade() -> None:
+    for index_name, table, columns in INDEXES:
+        create_index_if_missing(index_name, table, columns)
+
+
+def downgrade() -> None:
+    for index_name, table, _ in INDEXES:
+        drop_index_if_exists(index_name, table)
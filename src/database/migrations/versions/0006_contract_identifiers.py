@@ -0,0 +1,75 @@
+"""Identifiants des contrats (PDL, PCE, numéros) extraits de contract_data et indexés
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-12-03
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import (
+    add_column_if_missing,
+    backfill_in_batches,
+    create_index_if_missing,
+    load_json,
+)
+
+# Identifiants de révision utilisés par Alembic
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+IDENTIFIER_COLUMNS = {
+    "pdl": 50,
+    "pce": 50,
+    "contract_number": 100,
+    "client_reference": 100,
+}
+
+
+# Copie figée du calcul en vigueur à cette révision : la migration ne doit pas changer
+# de comportement quand le code de l'application évolue
+def normalize_identifier(value):
+    """Normalise un identifiant (espaces retirés, majuscules), None si vide."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    normalized = "".join(str(value).split()).upper()
+    return normalized or None
+
+
+def extract_contract_identifiers(contract_data):
+    """Identifiants d'un contrat, à la racine ou imbriqués dans contract_data."""
+    data = contract_data or {}
+
+    def _nested(section, key):
+        value = data.get(section)
+        return value.get(key) if isinstance(value, dict) else None
+
+    return {
+        "pdl": normalize_identifier(data.get("pdl") or _nested("electricite", "pdl")),
+        "pce": normalize_identifier(data.get("pce") or _nested("gaz", "pce")),
+        "contract_number": normalize_identifier(data.get("numero_contrat")),
+        "client_reference": normalize_identifier(_nested("client", "reference_client")),
+    }
+
+
+def upgrade() -> None:
+    for column, length in IDENTIFIER_COLUMNS.items():
+        add_column_if_missing("contracts", sa.Column(column, sa.String(length), nullable=True))
+        create_index_if_missing(f"ix_contracts_{column}", "contracts", [column])
+
+    backfill_in_batches(
+        "contracts",
+        ["contract_data"],
+        " AND ".join(f"{column} IS NULL" for column in IDENTIFIER_COLUMNS),
+        lambda row: extract_contract_identifiers(load_json(row[1]) or {}),
+    )
+
+
+def downgrade() -> None:
+    for column in IDENTIFIER_COLUMNS:
+        op.drop_index(f"ix_contracts_{column}", table_name="contracts")
+    with op.batch_alter_table("contracts") as batch_op:
+        for column in IDENTIFIER_COLUMNS:
+            batch_op.drop_column(column)
@@ -0,0 +1,67 @@
+"""Index plein texte FTS5 des contrats
+
+L'index est créé puis alimenté par lots avec les contrats existants. Le texte des
+PDF n'est pas réextrait : il est indexé lors des prochaines écritures.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-12-04
+"""
+from types import SimpleNamespace
+
+from alembic import op
+from sqlalchemy import text
+
+from src.database import search_index
+from src.database.migration_utils import BACKFILL_BATCH_SIZE, load_json
+
+# Identifiants de révision utilisés par Alembic
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+CONTRACT_COLUMNS = [
+    "provider",
+    "contract_data",
+    "pdl",
+    "pce",
+    "contract_number",
+    "client_reference",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(search_index.CREATE_SEARCH_TABLE)
+
+    # Reprise possible : seuls les contrats absents de l'index sont traités
+    select = text(
+        f"SELECT id, {', '.join(CONTRACT_COLUMNS)} FROM contracts "
+        f"WHERE id > :last_id AND id NOT IN (SELECT rowid FROM {search_index.SEARCH_TABLE}) "
+        "ORDER BY id LIMIT :limit"
+    )
+    last_id = 0
+
+    with op.get_context().autocommit_block():
+        with op.get_bind().engine.connect() as connection:
+            while True:
+                rows = connection.execute(
+                    select, {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+                ).all()
+                if not rows:
+                    break
+
+                for row in rows:
+                    contract = SimpleNamespace(**row._asdict())
+                    contract.contract_data = load_json(contract.contract_data)
+                    search_index.index_contract(connection, contract)
+                connection.commit()
+
+                last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.execute(search_index.DROP_SEARCH_TABLE)
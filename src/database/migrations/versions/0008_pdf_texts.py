@@ -0,0 +1,32 @@
+"""Texte extrait des PDF, compressé et indexé par empreinte du document
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-12-04
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import has_table
+
+# Identifiants de révision utilisés par Alembic
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table("pdf_texts"):
+        op.create_table(
+            "pdf_texts",
+            sa.Column("pdf_hash", sa.String(64), primary_key=True),
+            sa.Column("text_compressed", sa.LargeBinary(), nullable=False),
+            sa.Column("text_size", sa.Integer(), nullable=False),
+            sa.Column("page_count", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("pdf_texts")
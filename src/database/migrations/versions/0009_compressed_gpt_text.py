@@ -0,0 +1,109 @@
+"""Compression des prompts et réponses GPT
+
+Les colonnes gpt_prompt et gpt_response passent en binaire (type CompressedText).
+Sous SQLite, les valeurs existantes sont d'abord recompressées par lots (une migration
+interrompue reprend sur les lignes encore en texte, repérées par typeof()), puis le
+type des colonnes est changé. Lancer VACUUM ensuite pour réduire la taille du fichier.
+
+Sous PostgreSQL, une colonne ne mélange pas texte et binaire : le type est changé en
+place (USING), les valeurs existantes prenant le format non compressé de
+CompressedText ; seules les nouvelles valeurs sont compressées.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-12-05
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import backfill_in_batches
+from src.database.types import FORMAT_RAW, compress_text, decompress_text
+
+# Identifiants de révision utilisés par Alembic
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+TABLES = ["extraction_logs", "comparisons"]
+COLUMNS = ["gpt_prompt", "gpt_response"]
+
+
+def _alter_columns(table, from_type, to_type):
+    with op.batch_alter_table(table) as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(
+                column, existing_type=from_type, type_=to_type, existing_nullable=False
+            )
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _alter_columns_using(table, to_type, using):
+    for column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=to_type,
+            existing_nullable=False,
+            postgresql_using=using.format(column=column),
+        )
+
+
+def upgrade() -> None:
+    if _is_postgresql():
+        for table in TABLES:
+            # Octet d'en-tête 0x00 : texte UTF-8 non compressé
+            _alter_columns_using(
+                table, sa.LargeBinary(), "decode('00', 'hex') || convert_to({column}, 'UTF8')"
+            )
+        return
+
+    for table in TABLES:
+        backfill_in_batches(
+            table,
+            COLUMNS,
+            " OR ".join(f"typeof({column}) = 'text'" for column in COLUMNS),
+            lambda row: {
+                column: compress_text(value) if isinstance(value, str) else value
+                for column, value in zip(COLUMNS, row[1:])
+            },
+        )
+
+        _alter_columns(table, sa.Text(), sa.LargeBinary())
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        for table in TABLES:
+            # Valeurs compressées depuis la migration ramenées au format non compressé
+            backfill_in_batches(
+                table,
+                COLUMNS,
+                " OR ".join(f"get_byte({column}, 0) <> 0" for column in COLUMNS),
+                lambda row: {
+                    column: bytes([FORMAT_RAW]) + decompress_text(value).encode("utf-8")
+                    if value is not None
+                    else None
+                    for column, value in zip(COLUMNS, row[1:])
+                },
+            )
+            _alter_columns_using(
+                table, sa.Text(), "convert_from(substring({column} from 2), 'UTF8')"
+            )
+        return
+
+    for table in TABLES:
+        backfill_in_batches(
+            table,
+            COLUMNS,
+            " OR ".join(f"typeof({column}) = 'blob'" for column in COLUMNS),
+            lambda row: {
+                column: decompress_text(value) if isinstance(value, bytes) else value
+                for column, value in zip(COLUMNS, row[1:])
+            },
+        )
+
+        _alter_columns(table, sa.LargeBinary(), sa.Text())
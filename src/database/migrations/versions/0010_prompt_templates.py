@@ -0,0 +1,45 @@
+"""Prompts journalisés sous forme de template et paramètres
+
+Le prompt complet devient optionnel (conservé en mode debug uniquement). Les lignes
+existantes gardent leur prompt complet.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-12-06
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import add_column_if_missing
+
+# Identifiants de révision utilisés par Alembic
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+TABLES = ["extraction_logs", "comparisons"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        add_column_if_missing(table, sa.Column("prompt_template", sa.String(50), nullable=True))
+        add_column_if_missing(
+            table, sa.Column("prompt_template_version", sa.Integer(), nullable=True)
+        )
+        add_column_if_missing(table, sa.Column("prompt_params", sa.JSON(), nullable=True))
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("gpt_prompt", existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade() -> None:
+    # Les prompts non conservés sont remplacés par une chaîne vide
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET gpt_prompt = X'00' WHERE gpt_prompt IS NULL")
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("gpt_prompt", existing_type=sa.LargeBinary(), nullable=False)
+            batch_op.drop_column("prompt_params")
+            batch_op.drop_column("prompt_template_version")
+            batch_op.drop_column("prompt_template")
@@ -0,0 +1,57 @@
+"""Colonnes JSONB et index GIN sous PostgreSQL
+
+Les colonnes JSON passent en JSONB et contract_data reçoit un index GIN. Sans
+effet sous SQLite, où les colonnes JSON restent du texte.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-12-08
+"""
+from alembic import op
+
+from src.database.migration_utils import drop_index_if_exists, has_index
+from src.database.models import CONTRACT_DATA_GIN_INDEX
+
+# Identifiants de révision utilisés par Alembic
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = {
+    "contracts": ["contract_data"],
+    "comparisons": ["competitor_data", "prompt_params", "comparison_result"],
+    "extraction_logs": ["prompt_params", "extracted_data"],
+}
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _alter_json_columns(to_type: str) -> None:
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE {to_type} USING {column}::{to_type}"
+            )
+
+
+def upgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    _alter_json_columns("jsonb")
+    if not has_index("contracts", CONTRACT_DATA_GIN_INDEX):
+        op.create_index(
+            CONTRACT_DATA_GIN_INDEX, "contracts", ["contract_data"], postgresql_using="gin"
+        )
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    drop_index_if_exists(CONTRACT_DATA_GIN_INDEX, "contracts")
+    _alter_json_columns("json")
@@ -0,0 +1,82 @@
+"""Suppression en cascade par la base et suppression logique des contrats
+
+La clé étrangère comparisons.contract_id passe en ON DELETE CASCADE : supprimer un
+contrat ne charge plus ses comparaisons. Sous SQLite, la table comparisons est
+recréée (une contrainte ne peut pas être modifiée). La colonne contracts.deleted_at
+marque les contrats supprimés logiquement, purgés ensuite en arrière-plan.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-12-10
+"""
+from typing import Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import (
+    add_column_if_missing,
+    create_index_if_missing,
+    drop_index_if_exists,
+    has_column,
+)
+
+# Identifiants de révision utilisés par Alembic
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+DELETED_AT_INDEX = "ix_contracts_deleted_at"
+
+
+def _contract_foreign_key() -> dict:
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys("comparisons")
+    return next(fk for fk in foreign_keys if fk["constrained_columns"] == ["contract_id"])
+
+
+def _set_contract_foreign_key(ondelete: Optional[str]) -> None:
+    foreign_key = _contract_foreign_key()
+    if (foreign_key.get("options") or {}).get("ondelete") == ondelete:
+        return
+
+    if op.get_bind().dialect.name == "sqlite":
+        contract_id = sa.Column(
+            "contract_id",
+            sa.Integer(),
+            sa.ForeignKey("contracts.id", ondelete=ondelete),
+            nullable=False,
+        )
+        with op.batch_alter_table("comparisons", recreate="always", reflect_args=[contract_id]):
+            pass
+    else:
+        op.drop_constraint(foreign_key["name"], "comparisons", type_="foreignkey")
+        op.create_foreign_key(
+            foreign_key["name"],
+            "comparisons",
+            "contracts",
+            ["contract_id"],
+            ["id"],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    _set_contract_foreign_key("CASCADE")
+
+    add_column_if_missing("contracts", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    create_index_if_missing(DELETED_AT_INDEX, "contracts", ["deleted_at"])
+
+
+def downgrade() -> None:
+    # Sans la colonne, les contrats en attente de purge redeviendraient visibles
+    if has_column("contracts", "deleted_at"):
+        deleted = "SELECT id FROM contracts WHERE deleted_at IS NOT NULL"
+        op.execute(f"DELETE FROM comparisons WHERE contract_id IN ({deleted})")
+        op.execute("DELETE FROM contracts WHERE deleted_at IS NOT NULL")
+
+    drop_index_if_exists(DELETED_AT_INDEX, "contracts")
+    with op.batch_alter_table("contracts") as batch_op:
+        batch_op.drop_column("deleted_at")
+
+    _set_contract_foreign_key(None)
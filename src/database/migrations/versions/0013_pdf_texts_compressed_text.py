@@ -0,0 +1,78 @@
+"""Texte des PDF au format CompressedText
+
+La colonne pdf_texts.text_compressed contenait du zlib brut : elle reçoit l'octet
+d'en-tête des autres colonnes compressées (type CompressedText). Les lignes sont
+converties par lots ; une ligne déjà convertie (octet d'en-tête connu, jamais en tête
+d'un flux zlib) est ignorée, une migration interrompue reprend donc sans erreur.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-12-11
+"""
+import zlib
+from typing import Callable, Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migration_utils import BACKFILL_BATCH_SIZE
+from src.database.types import DECOMPRESSORS, compress_text, decompress_text
+
+# Identifiants de révision utilisés par Alembic
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+pdf_texts = sa.table(
+    "pdf_texts",
+    sa.column("pdf_hash", sa.String),
+    sa.column("text_compressed", sa.LargeBinary),
+)
+
+
+def _has_header(value: bytes) -> bool:
+    return bool(value) and value[0] in DECOMPRESSORS
+
+
+def _convert_rows(convert: Callable[[bytes], Optional[bytes]]) -> None:
+    connection = op.get_bind()
+    update = (
+        pdf_texts.update()
+        .where(pdf_texts.c.pdf_hash == sa.bindparam("key"))
+        .values(text_compressed=sa.bindparam("value"))
+    )
+    last_hash = ""
+    while True:
+        rows = connection.execute(
+            sa.select(pdf_texts.c.pdf_hash, pdf_texts.c.text_compressed)
+            .where(pdf_texts.c.pdf_hash > last_hash)
+            .order_by(pdf_texts.c.pdf_hash)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        values = [
+            {"key": pdf_hash, "value": converted}
+            for pdf_hash, value in rows
+            if (converted := convert(bytes(value))) is not None
+        ]
+        if values:
+            connection.execute(update, values)
+        last_hash = rows[-1].pdf_hash
+
+
+def upgrade() -> None:
+    _convert_rows(
+        lambda value: None
+        if _has_header(value)
+        else compress_text(zlib.decompress(value).decode("utf-8"))
+    )
+
+
+def downgrade() -> None:
+    _convert_rows(
+        lambda value: zlib.compress(decompress_text(value).encode("utf-8"))
+        if _has_header(value)
+        else None
+    )
@@ -1,17 +1,25 @@
 """Modèles de base de données pour GardeTonOr."""
 from datetime import datetime
+from typing import Optional
 from sqlalchemy import (
     Column,
     Integer,
     String,
     DateTime,
+    Float,
     Text,
-    LargeBinary,
     ForeignKey,
-    JSON,
+    Index,
+    DDL,
+    event,
+    select,
 )
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import Session, declarative_base, relationship, with_loader_criteria
 from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.sql.util import find_tables
+
+from src.database.blob_store import blob_store
+from src.database.types import CompressedText, JSONDocument
 
 Base: DeclarativeMeta = declarative_base()
 
@@ -20,6 +28,10 @@ class Contract(Base):
     """Modèle pour les contrats."""
 
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Listes de contrats : filtre is_simulation, tri par date anniversaire
+        Index("ix_contracts_is_simulation_anniversary_date", "is_simulation", "anniversary_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     contract_type = Column(String(50), nullable=False, index=True)  # telephone, assurance_pno
@@ -28,51 +40,102 @@ class Contract(Base):
     end_date = Column(DateTime, nullable=True)
     anniversary_date = Column(DateTime, nullable=False, index=True)
 
-    # Données structurées spécifiques au type de contrat (JSON)
-    contract_data = Column(JSON, nullable=False)
+    # Données structurées spécifiques au type de contrat (JSON, JSONB sous PostgreSQL)
+    contract_data = Column(JSONDocument, nullable=False)
+
+    # Coûts normalisés, calculés depuis contract_data à l'écriture
+    monthly_cost_eur = Column(Float, nullable=True, index=True)
+    annual_cost_eur = Column(Float, nullable=True, index=True)
+
+    # Identifiants extraits de contract_data à l'écriture (dédoublonnage des imports)
+    pdl = Column(String(50), nullable=True, index=True)  # Point de livraison électricité
+    pce = Column(String(50), nullable=True, index=True)  # Point de comptage gaz
+    contract_number = Column(String(100), nullable=True, index=True)
+    client_reference = Column(String(100), nullable=True, index=True)
 
     # Document original
     original_filename = Column(String(500))
-    pdf_content = Column(LargeBinary, nullable=True)
+    # Le PDF est stocké dans le blob store, seule sa référence est en base
+    pdf_hash = Column(String(64), nullable=True)
+    pdf_size = Column(Integer, nullable=True)
 
     # Métadonnées
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     validated = Column(Integer, default=0)  # 0 = non validé, 1 = validé
     is_simulation = Column(Integer, default=0)  # 0 = contrat réel, 1 = simulation/devis
+    # Suppression logique : contrat masqué, ses lignes sont purgées en arrière-plan
+    deleted_at = Column(DateTime, nullable=True, index=True)
 
     # Relations
+    # Les comparaisons sont supprimées par la base (ON DELETE CASCADE), sans être chargées
     comparisons = relationship(
-        "Comparison", back_populates="contract", cascade="all, delete-orphan"
+        "Comparison", back_populates="contract", cascade="all, delete-orphan", passive_deletes=True
     )
 
+    @property
+    def pdf_content(self) -> Optional[bytes]:
+        """Contenu du PDF, chargé depuis le blob store à la demande."""
+        return blob_store.get(self.pdf_hash) if self.pdf_hash else None
+
+    @pdf_content.setter
+    def pdf_content(self, value: Optional[bytes]) -> None:
+        self.pdf_hash, self.pdf_size = blob_store.put(value) if value else (None, None)
+
     def __repr__(self):
         return f"<Contract(id={self.id}, type={self.contract_type}, provider={self.provider})>"
 
 
+# Index GIN sur contract_data (PostgreSQL seulement) : requêtes de contenance JSONB (@>)
+CONTRACT_DATA_GIN_INDEX = "ix_contracts_contract_data_gin"
+event.listen(
+    Contract.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX IF NOT EXISTS {CONTRACT_DATA_GIN_INDEX} "
+        "ON contracts USING gin (contract_data)"
+    ).execute_if(dialect="postgresql"),
+)
+
+
 class Comparison(Base):
     """Modèle pour les comparaisons de contrats."""
 
     __tablename__ = "comparisons"
+    __table_args__ = (
+        # Historique d'un contrat : filtre contract_id, tri par date décroissante
+        Index("ix_comparisons_contract_id_created_at", "contract_id", "created_at"),
+        # Historique global : tri par date décroissante
+        Index("ix_comparisons_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
 
     # Type de comparaison
     comparison_type = Column(String(50), nullable=False)  # market_analysis, competitor_quote
 
     # Pour les comparaisons avec devis concurrent
     competitor_filename = Column(String(500), nullable=True)
-    competitor_pdf = Column(LargeBinary, nullable=True)
-    competitor_data = Column(JSON, nullable=True)
+    competitor_pdf_hash = Column(String(64), nullable=True)
+    competitor_pdf_size = Column(Integer, nullable=True)
+    competitor_data = Column(JSONDocument, nullable=True)
 
-    # Résultats de la comparaison
-    gpt_prompt = Column(Text, nullable=False)
-    gpt_response = Column(Text, nullable=False)
+    # Résultats de la comparaison (compressés en base)
+    # Le prompt complet n'est conservé qu'en mode debug (PROMPT_DEBUG), sinon il est
+    # reconstruit à la demande depuis le template et ses paramètres
+    gpt_prompt = Column(CompressedText, nullable=True)
+    prompt_template = Column(String(50), nullable=True)
+    prompt_template_version = Column(Integer, nullable=True)
+    prompt_params = Column(JSONDocument, nullable=True)
+    gpt_response = Column(CompressedText, nullable=False)
     analysis_summary = Column(Text, nullable=True)
 
     # Résultat structuré (JSON)
-    comparison_result = Column(JSON, nullable=True)
+    comparison_result = Column(JSONDocument, nullable=True)
+
+    # Économie annuelle normalisée, calculée depuis comparison_result à l'écriture
+    annual_savings_eur = Column(Float, nullable=True)
 
     # Métadonnées
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -80,10 +143,63 @@ class Comparison(Base):
     # Relations
     contract = relationship("Contract", back_populates="comparisons")
 
+    @property
+    def competitor_pdf(self) -> Optional[bytes]:
+        """Contenu du PDF concurrent, chargé depuis le blob store à la demande."""
+        return blob_store.get(self.competitor_pdf_hash) if self.competitor_pdf_hash else None
+
+    @competitor_pdf.setter
+    def competitor_pdf(self, value: Optional[bytes]) -> None:
+        self.competitor_pdf_hash, self.competitor_pdf_size = (
+            blob_store.put(value) if value else (None, None)
+        )
+
     def __repr__(self):
         return f"<Comparison(id={self.id}, contract_id={self.contract_id}, type={self.comparison_type})>"
 
 
+# Identifiants des contrats supprimés logiquement (colonnes de table : hors critère ORM)
+_deleted_contract_ids = select(Contract.__table__.c.id).where(
+    Contract.__table__.c.deleted_at.isnot(None)
+)
+
+
+def _involves_table(statement, table) -> bool:
+    """Indique si une requête lit une table (colonnes, FROM, jointures ou sous-requêtes)."""
+    return table in set(
+        find_tables(statement, check_columns=True, include_aliases=True, include_joins=True)
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_contracts(execute_state):
+    """
+    Masque les contrats supprimés logiquement, et leurs comparaisons, des requêtes ORM.
+
+    La purge (et tout appel qui doit les voir) passe `include_deleted=True` dans les
+    options d'exécution.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        criteria = [
+            with_loader_criteria(Contract, Contract.deleted_at.is_(None), include_aliases=True)
+        ]
+        # Sous-requête ajoutée seulement aux requêtes qui lisent des comparaisons
+        if _involves_table(execute_state.statement, Comparison.__table__):
+            criteria.append(
+                with_loader_criteria(
+                    Comparison,
+                    Comparison.contract_id.not_in(_deleted_contract_ids),
+                    include_aliases=True,
+                )
+            )
+        execute_state.statement = execute_state.statement.options(*criteria)
+
+
 class ExtractionLog(Base):
     """Modèle pour logger les extractions de données par GPT."""
 
@@ -93,17 +209,48 @@ class ExtractionLog(Base):
     filename = Column(String(500), nullable=False)
     contract_type = Column(String(50), nullable=False)
 
-    # Prompt et réponse GPT
-    gpt_prompt = Column(Text, nullable=False)
-    gpt_response = Column(Text, nullable=False)
+    # Prompt et réponse GPT (compressés en base)
+    # Prompt complet en mode debug seulement, sinon template + paramètres
+    gpt_prompt = Column(CompressedText, nullable=True)
+    prompt_template = Column(String(50), nullable=True)
+    prompt_template_version = Column(Integer, nullable=True)
+    prompt_params = Column(
+        JSONDocument, nullable=True
+    )  # Le texte du PDF est référencé par pdf_hash
+    gpt_response = Column(CompressedText, nullable=False)
 
     # Données extraites (JSON)
-    extracted_data = Column(JSON, nullable=False)
+    extracted_data = Column(JSONDocument, nullable=False)
 
     # Métadonnées
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     success = Column(Integer, default=1)
     error_message = Column(Text, nullable=True)
 
     def __repr__(self):
         return f"<ExtractionLog(id={self.id}, filename={self.filename}, success={self.success})>"
+
+
+class PdfText(Base):
+    """Texte extrait d'un PDF, compressé et identifié par l'empreinte du document."""
+
+    __tablename__ = "pdf_texts"
+
+    pdf_hash = Column(String(64), primary_key=True)  # Empreinte SHA-256 du PDF
+    _text = Column("text_compressed", CompressedText, nullable=False)  # Lu par `text`
+    text_size = Column(Integer, nullable=False)  # Nombre de caractères du texte
+    page_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    @property
+    def text(self) -> str:
+        """Texte extrait, décompressé à la lecture."""
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+        self.text_size = len(value)
+
+    def __repr__(self):
+        return f"<PdfText(pdf_hash={self.pdf_hash}, text_size={self.text_size})>"
@@ -0,0 +1,56 @@
+"""Pagination par curseur (keyset) des listes triées."""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
+
+# Position dans une liste : (valeur de la colonne de tri, id) du dernier élément lu
+Cursor = Tuple[datetime, int]
+
+
+def keyset_page(
+    query: Query,
+    sort_column: Any,
+    id_column: Any,
+    limit: Optional[int] = None,
+    after: Optional[Cursor] = None,
+    descending: bool = False,
+) -> List[Any]:
+    """
+    Lit les éléments qui suivent un curseur, triés par (colonne de tri, id).
+
+    Le filtre sur le curseur remplace OFFSET : la base se positionne directement
+    dans l'index, le coût d'une page ne dépend pas du nombre de pages précédentes.
+    L'id départage les valeurs égales, l'ordre reste stable entre deux pages.
+
+    Args:
+        query: Requête à paginer (filtres déjà appliqués)
+        sort_column: Colonne de tri (non nulle)
+        id_column: Clé primaire
+        limit: Nombre maximal d'éléments (tous si None)
+        after: Curseur du dernier élément de la page précédente (début si None)
+        descending: Tri décroissant
+
+    Returns:
+        Éléments de la page
+    """
+    if after is not None:
+        value, last_id = after
+        if descending:
+            query = query.filter(
+                sort_column <= value, or_(sort_column < value, id_column < last_id)
+            )
+        else:
+            query = query.filter(
+                sort_column >= value, or_(sort_column > value, id_column > last_id)
+            )
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
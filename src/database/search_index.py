@@ -0,0 +1,148 @@
+"""Index plein texte des contrats (SQLite FTS5)."""
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import DDL, column, event, table, text
+from sqlalchemy.sql.expression import TableClause
+from sqlalchemy.orm import Session
+
+from src.database.models import Contract
+
+# Table virtuelle FTS5 ; son rowid est l'identifiant du contrat
+SEARCH_TABLE = "contracts_fts"
+
+# Colonnes indexées, dans l'ordre des poids de classement bm25
+SEARCH_COLUMNS = ("provider", "identifiers", "details", "pdf_text")
+SEARCH_WEIGHTS = (10.0, 8.0, 2.0, 1.0)
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"{', '.join(SEARCH_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SEARCH_TABLE = f"DROP TABLE IF EXISTS {SEARCH_TABLE}"
+INSERT_SEARCH_ROW = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+    f"VALUES (:id, {', '.join(f':{column}' for column in SEARCH_COLUMNS)})"
+)
+
+# La table est créée et supprimée avec `contracts` par create_all/drop_all (SQLite seulement)
+event.listen(
+    Contract.__table__, "after_create", DDL(CREATE_SEARCH_TABLE).execute_if(dialect="sqlite")
+)
+event.listen(Contract.__table__, "before_drop", DDL(DROP_SEARCH_TABLE).execute_if(dialect="sqlite"))
+
+
+def search_table() -> TableClause:
+    """Construit la table FTS5 pour les requêtes (rowid, colonnes indexées et rang)."""
+    columns = ("rowid", *SEARCH_COLUMNS, "rank")
+    return table(SEARCH_TABLE, *(column(name) for name in columns))
+
+
+def is_search_table(name: Optional[str]) -> bool:
+    """Indique si une table appartient à l'index FTS5 (table virtuelle ou table interne)."""
+    return bool(name) and (name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_"))
+
+
+def is_search_available(session: Session) -> bool:
+    """Indique si l'index plein texte est disponible (base SQLite)."""
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def _flatten_values(value: Any) -> Iterator[str]:
+    """Parcourt récursivement les valeurs textuelles d'un document JSON."""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten_values(item)
+    elif isinstance(value, str) and value.strip():
+        yield value.strip()
+
+
+def build_search_document(
+    contract: Contract, pdf_text: Optional[str] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Construit le document indexé pour un contrat.
+
+    Args:
+        contract: Contrat à indexer
+        pdf_text: Texte extrait du PDF (optionnel)
+
+    Returns:
+        Valeurs des colonnes de SEARCH_COLUMNS
+    """
+    identifiers = [
+        contract.pdl,
+        contract.pce,
+        contract.contract_number,
+        contract.client_reference,
+    ]
+    return {
+        "provider": contract.provider,
+        "identifiers": " ".join(value for value in identifiers if value),
+        "details": " ".join(_flatten_values(contract.contract_data)),
+        "pdf_text": pdf_text,
+    }
+
+
+def index_contract(bind: Any, contract: Contract, pdf_text: Optional[str] = None) -> None:
+    """
+    Indexe (ou réindexe) un contrat.
+
+    Si `pdf_text` est None, le texte du PDF déjà indexé pour ce contrat est conservé.
+
+    Args:
+        bind: Session ou connexion SQLAlchemy
+        contract: Contrat à indexer (doit avoir un id)
+        pdf_text: Texte extrait du PDF (optionnel)
+    """
+    if pdf_text is None:
+        pdf_text = bind.execute(
+            text(f"SELECT pdf_text FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": contract.id}
+        ).scalar()
+
+    document = build_search_document(contract, pdf_text)
+    remove_contract(bind, contract.id)
+    bind.execute(text(INSERT_SEARCH_ROW), dict(document, id=contract.id))
+
+
+def index_new_contracts(bind: Any, contracts: Iterable[Tuple[Any, Optional[str]]]) -> None:
+    """
+    Indexe en une seule instruction des contrats qui viennent d'être créés.
+
+    Args:
+        bind: Session ou connexion SQLAlchemy
+        contracts: Couples (contrat avec un id, texte du PDF ou None), absents de l'index
+    """
+    parameters = [
+        dict(build_search_document(contract, pdf_text), id=contract.id)
+        for contract, pdf_text in contracts
+    ]
+    if parameters:
+        bind.execute(text(INSERT_SEARCH_ROW), parameters)
+
+
+def remove_contract(bind: Any, contract_id: int) -> None:
+    """Retire un contrat de l'index."""
+    bind.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": contract_id})
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Convertit une saisie utilisateur en requête MATCH FTS5.
+
+    Chaque mot devient un préfixe entre guillemets : la syntaxe FTS5 (opérateurs,
+    parenthèses, deux-points) saisie par l'utilisateur n'est pas interprétée.
+
+    Args:
+        query: Texte saisi
+
+    Returns:
+        Requête MATCH, None si la saisie ne contient aucun mot
+    """
+    terms = re.findall(r"\w+", query or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
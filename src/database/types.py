@@ -0,0 +1,104 @@
+"""Types de colonnes SQLAlchemy personnalisés."""
+import lzma
+import zlib
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import JSON, LargeBinary, TypeDecorator
+
+# Octet d'en-tête indiquant le format du contenu stocké
+FORMAT_RAW = 0x00  # Texte UTF-8 non compressé (valeurs courtes)
+FORMAT_ZLIB = 0x01
+FORMAT_LZMA = 0x02
+
+COMPRESSORS = {
+    "zlib": (FORMAT_ZLIB, lambda data: zlib.compress(data, 6)),
+    "lzma": (FORMAT_LZMA, lzma.compress),
+}
+DECOMPRESSORS = {
+    FORMAT_RAW: lambda data: data,
+    FORMAT_ZLIB: zlib.decompress,
+    FORMAT_LZMA: lzma.decompress,
+}
+
+# En dessous de cette taille (octets), la compression ne fait pas gagner de place
+MIN_COMPRESS_SIZE = 128
+
+
+def compress_text(value: str, algorithm: str = "zlib", min_size: int = MIN_COMPRESS_SIZE) -> bytes:
+    """
+    Encode un texte au format stocké : octet d'en-tête suivi du contenu.
+
+    Args:
+        value: Texte à encoder
+        algorithm: Algorithme de compression ("zlib" ou "lzma")
+        min_size: Taille en octets sous laquelle le texte est stocké sans compression
+
+    Returns:
+        Contenu à écrire en base
+
+    Raises:
+        ValueError: Si l'algorithme est inconnu
+    """
+    if algorithm not in COMPRESSORS:
+        raise ValueError(f"Algorithme de compression inconnu: {algorithm}")
+
+    data = value.encode("utf-8")
+    if len(data) >= min_size:
+        header, compress = COMPRESSORS[algorithm]
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            return bytes([header]) + compressed
+    return bytes([FORMAT_RAW]) + data
+
+
+def decompress_text(value: bytes) -> str:
+    """
+    Décode un contenu écrit par compress_text.
+
+    Args:
+        value: Contenu lu en base
+
+    Returns:
+        Texte d'origine
+
+    Raises:
+        ValueError: Si l'octet d'en-tête est inconnu
+    """
+    value = bytes(value)
+    header = value[0] if value else None
+    if header not in DECOMPRESSORS:
+        raise ValueError(f"Format de texte compressé inconnu: {header}")
+    return DECOMPRESSORS[header](value[1:]).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Texte stocké compressé dans une colonne binaire.
+
+    Chaque valeur commence par un octet d'en-tête (format brut, zlib ou lzma) : le
+    format peut changer sans réécrire les lignes existantes. Une valeur encore stockée
+    en texte (base non migrée) est retournée telle quelle.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, algorithm: str = "zlib", min_size: int = MIN_COMPRESS_SIZE):
+        super().__init__()
+        self.algorithm = algorithm
+        self.min_size = min_size
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value, self.algorithm, self.min_size)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return decompress_text(value)
+
+
+# Document JSON : JSONB sous PostgreSQL (binaire, indexable en GIN), JSON ailleurs
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
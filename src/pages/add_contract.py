@@ -27,7 +27,7 @@ def handle_extraction(uploaded_file, contract_type):
     with get_db() as db:
         openai_service = OpenAIService()
 
-        pdf_service = PDFService()
+        pdf_service = PDFService(db)
 
         contract_service = ContractService(db, openai_service, pdf_service)
 
@@ -157,48 +157,50 @@ def _render_validation_form(contract_type, extracted_data):
 
 
 def _create_dual_energy_contracts(contract_service, data_elec, data_gaz, is_simulation):
-    # Création du contrat Électricité
-
-    contract_service.create_contract(
-        contract_type="electricite",
-        provider=data_elec["provider"],
-        start_date=data_elec["date_debut"],
-        anniversary_date=data_elec["date_anniv"],
-        contract_data={
-            "fournisseur": data_elec["provider"],
-            "pdl": data_elec["pdl"],
-            "puissance_souscrite_kva": data_elec["puissance"],
-            "prix_abonnement_mensuel": data_elec["prix_abo"],
-            "prix_kwh": {"base": data_elec["prix_kwh"]},
-            "estimation_conso_annuelle_kwh": data_elec["conso_annuelle"],
-            "estimation_facture_annuelle": (data_elec["prix_abo"] * 12)
-            + (data_elec["prix_kwh"] * data_elec["conso_annuelle"]),
-        },
-        pdf_bytes=st.session_state["pdf_bytes"],
-        filename=st.session_state["filename"],
-        is_simulation=is_simulation,
-    )
-
-    # Création du contrat Gaz
-
-    contract_service.create_contract(
-        contract_type="gaz",
-        provider=data_gaz["provider"],
-        start_date=data_gaz["date_debut"],
-        anniversary_date=data_gaz["date_anniv"],
-        contract_data={
-            "fournisseur": data_gaz["provider"],
-            "pce": data_gaz["pce"],
-            "zone_tarifaire": data_gaz["zone"],
-            "prix_abonnement_mensuel": data_gaz["prix_abo"],
-            "prix_kwh": data_gaz["prix_kwh"],
-            "estimation_conso_annuelle_kwh": data_gaz["conso_annuelle"],
-            "estimation_facture_annuelle": (data_gaz["prix_abo"] * 12)
-            + (data_gaz["prix_kwh"] * data_gaz["conso_annuelle"]),
-        },
-        pdf_bytes=st.session_state["pdf_bytes"],
-        filename=st.session_state["filename"],
-        is_simulation=is_simulation,
+    # Les contrats Électricité et Gaz sont créés ensemble, dans une seule transaction
+    common = {
+        "pdf_bytes": st.session_state["pdf_bytes"],
+        "filename": st.session_state["filename"],
+        "is_simulation": is_simulation,
+    }
+
+    contract_service.create_contracts_bulk(
+        [
+            {
+                "contract_type": "electricite",
+                "provider": data_elec["provider"],
+                "start_date": data_elec["date_debut"],
+                "anniversary_date": data_elec["date_anniv"],
+                "contract_data": {
+                    "fournisseur": data_elec["provider"],
+                    "pdl": data_elec["pdl"],
+                    "puissance_souscrite_kva": data_elec["puissance"],
+                    "prix_abonnement_mensuel": data_elec["prix_abo"],
+                    "prix_kwh": {"base": data_elec["prix_kwh"]},
+                    "estimation_conso_annuelle_kwh": data_elec["conso_annuelle"],
+                    "estimation_facture_annuelle": (data_elec["prix_abo"] * 12)
+                    + (data_elec["prix_kwh"] * data_elec["conso_annuelle"]),
+                },
+                **common,
+            },
+            {
+                "contract_type": "gaz",
+                "provider": data_gaz["provider"],
+                "start_date": data_gaz["date_debut"],
+                "anniversary_date": data_gaz["date_anniv"],
+                "contract_data": {
+                    "fournisseur": data_gaz["provider"],
+                    "pce": data_gaz["pce"],
+                    "zone_tarifaire": data_gaz["zone"],
+                    "prix_abonnement_mensuel": data_gaz["prix_abo"],
+                    "prix_kwh": data_gaz["prix_kwh"],
+                    "estimation_conso_annuelle_kwh": data_gaz["conso_annuelle"],
+                    "estimation_facture_annuelle": (data_gaz["prix_abo"] * 12)
+                    + (data_gaz["prix_kwh"] * data_gaz["conso_annuelle"]),
+                },
+                **common,
+            },
+        ]
     )
 
 
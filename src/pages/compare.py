@@ -121,11 +121,11 @@ def show():
     with get_db() as db:
         openai_service = OpenAIService()
 
-        pdf_service = PDFService()
+        pdf_service = PDFService(db)
 
         contract_service = ContractService(db, openai_service, pdf_service)
 
-        contracts = contract_service.get_all_contracts()
+        contracts = contract_service.get_contract_summaries()
 
         if not contracts:
             st.warning("⚠️ Aucun contrat enregistré. Ajoutez d'abord un contrat !")
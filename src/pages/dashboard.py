@@ -4,9 +4,11 @@ from datetime import datetime
 import pandas as pd
 import plotly.express as px
 
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.services import OpenAIService, PDFService, ContractService
 from src.config import CONTRACT_TYPES, NOTIFICATION_DAYS_BEFORE
+from src.pages.pagination import paginate, paginate_list
+from src.services.contract_service import contract_cursor
 
 
 def go_to_compare(c_id):
@@ -19,32 +21,21 @@ def go_to_view(c_id):
     st.session_state["navigation"] = "👀 Visualisation des contrats"
 
 
+def _delete_contract(contract_id):
+    # La page est lue en lecture seule : la suppression ouvre sa propre session d'écriture
+    with get_db() as db:
+        return ContractService(db, OpenAIService(), PDFService()).delete_contract(contract_id)
+
+
 def _calculate_cost(contract):
-    cost = "N/A"
-    if contract.contract_type == "telephone":
-        cost = f"{contract.contract_data.get('prix_mensuel', 0):.2f} €/mois"
-    elif contract.contract_type == "assurance_pno":
-        if contract.contract_data.get("prime_mensuelle"):
-            cost = f"{contract.contract_data.get('prime_mensuelle', 0):.2f} €/mois"
-        else:
-            cost = f"{contract.contract_data.get('prime_annuelle', 0):.2f} €/an"
-    elif contract.contract_type == "assurance_habitation":
-        tarifs = contract.contract_data.get("tarifs", {})
-        if tarifs.get("prime_mensuelle_ttc"):
-            cost = f"{tarifs.get('prime_mensuelle_ttc', 0):.2f} €/mois"
-        elif tarifs.get("prime_annuelle_ttc"):
-            cost = f"{tarifs.get('prime_annuelle_ttc', 0):.2f} €/an"
-    elif contract.contract_type in ["electricite", "gaz"]:
-        if contract.contract_data.get("estimation_facture_annuelle"):
-            cost_annual = contract.contract_data.get("estimation_facture_annuelle", 0)
-            cost = f"{cost_annual:.2f} €/an ({cost_annual / 12:.2f} €/mois)"
-        elif contract.contract_data.get("prix_abonnement_mensuel"):
-            cost = f"{contract.contract_data.get('prix_abonnement_mensuel', 0):.2f} €/mois"
-    return cost
-
-
-def _display_metrics(contracts, contracts_needing_attention):
-    col1, col2, col3, col4 = st.columns(4)
+    # Coûts normalisés calculés à l'enregistrement du contrat
+    if contract.annual_cost_eur is None:
+        return "N/A"
+    return f"{contract.monthly_cost_eur:.2f} €/mois ({contract.annual_cost_eur:.2f} €/an)"
+
+
+def _display_metrics(contracts, contracts_needing_attention, cost_totals):
+    col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         st.metric(label="📄 Total Contrats", value=len(contracts))
@@ -66,6 +57,15 @@ def _display_metrics(contracts, contracts_needing_attention):
         assurance_count = sum(1 for c in contracts if c.contract_type == "assurance_pno")
         st.metric(label="🏠 Assurance PNO", value=assurance_count)
 
+    with col5:
+        monthly_total, annual_total = cost_totals
+        st.metric(
+            label="💶 Budget annuel",
+            value=f"{annual_total:.0f} €",
+            delta=f"{monthly_total:.0f} €/mois",
+            delta_color="off",
+        )
+
     st.divider()
 
 
@@ -114,7 +114,7 @@ def _display_alerts(contracts_needing_attention):
     st.divider()
 
 
-def _display_contract_list(contracts, contract_service):
+def _display_contract_list(contracts):
     col_header, col_btn = st.columns([3, 1])
     with col_header:
         st.markdown("### 📋 Tous vos contrats")
@@ -132,7 +132,10 @@ def _display_contract_list(contracts, contract_service):
     if not contracts:
         st.info("Aucun contrat enregistré. Commencez par ajouter un contrat !")
     else:
-        for contract in contracts:
+        # Lu par show() au rerun suivant pour trier la requête
+        sort_by_cost = st.checkbox("Les plus chers en premier", key="dashboard_sort_by_cost")
+
+        for contract in paginate_list("dashboard_contracts", contracts, filters=sort_by_cost):
             with st.container():
                 cost = _calculate_cost(contract)
 
@@ -168,7 +171,7 @@ def _display_contract_list(contracts, contract_service):
 
                 with col6:
                     if st.button("🗑️", key=f"del_list_{contract.id}", help="Supprimer"):
-                        if contract_service.delete_contract(contract.id):
+                        if _delete_contract(contract.id):
                             st.success("Supprimé")
                             st.rerun()
 
@@ -178,51 +181,46 @@ def _display_contract_list(contracts, contract_service):
 def _display_charts(contract_service):
     st.markdown("### 📈 Évolution des économies potentielles")
 
-    all_comparisons = contract_service.get_all_comparisons()
-
-    if all_comparisons:
-        comparison_data = []
-        for comp in all_comparisons:
-            if comp.comparison_result and "economie_potentielle_annuelle" in comp.comparison_result:
-                comparison_data.append(
-                    {
-                        "Date": comp.created_at,
-                        "Contrat": comp.contract.provider,
-                        "Économie potentielle (€/an)": comp.comparison_result.get(
-                            "economie_potentielle_annuelle", 0
-                        ),
-                    }
-                )
-
-        if comparison_data:
-            df_comp = pd.DataFrame(comparison_data)
-            fig = px.line(
-                df_comp,
-                x="Date",
-                y="Économie potentielle (€/an)",
-                color="Contrat",
-                title="Évolution des économies potentielles par contrat",
-                markers=True,
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("Effectuez des comparaisons pour voir l'évolution des économies potentielles")
+    savings_timeline = contract_service.get_savings_timeline()
+
+    if savings_timeline:
+        df_comp = pd.DataFrame(
+            [
+                {
+                    "Date": created_at,
+                    "Contrat": provider,
+                    "Économie potentielle (€/an)": savings,
+                }
+                for created_at, provider, savings in savings_timeline
+            ]
+        )
+        fig = px.line(
+            df_comp,
+            x="Date",
+            y="Économie potentielle (€/an)",
+            color="Contrat",
+            title="Évolution des économies potentielles par contrat",
+            markers=True,
+        )
+        st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("Aucune comparaison effectuée pour le moment")
 
 
 def _display_simulations(contract_service):
-    simulations = contract_service.get_all_simulations()
-    if simulations:
+    if contract_service.get_all_simulations(limit=1):
         st.divider()
         st.markdown("### 🧪 Simulations et Devis")
+        simulations = paginate(
+            "dashboard_simulations", contract_service.get_all_simulations, contract_cursor
+        )
         for sim in simulations:
             with st.expander(
                 f"{sim.provider} ({CONTRACT_TYPES.get(sim.contract_type, sim.contract_type)}) - {sim.anniversary_date.strftime('%d/%m/%Y')}"
             ):
                 st.json(sim.contract_data)
                 if st.button("🗑️ Supprimer", key=f"del_sim_{sim.id}"):
-                    if contract_service.delete_contract(sim.id):
+                    if _delete_contract(sim.id):
                         st.success("Simulation supprimée")
                         st.rerun()
 
@@ -232,18 +230,21 @@ def show():
     st.title("🏠 Dashboard")
     st.markdown("Vue d'ensemble de vos contrats et alertes")
 
-    with get_db() as db:
+    with get_read_db() as db:
         openai_service = OpenAIService()
         pdf_service = PDFService()
         contract_service = ContractService(db, openai_service, pdf_service)
 
-        # Récupérer tous les contrats
-        contracts = contract_service.get_all_contracts()
+        # Récupérer tous les contrats (vue allégée)
+        contracts = contract_service.get_contract_summaries(
+            sort_by_cost=st.session_state.get("dashboard_sort_by_cost", False)
+        )
         contracts_needing_attention = contract_service.get_contracts_needing_attention()
+        cost_totals = contract_service.get_cost_totals()
 
-        _display_metrics(contracts, contracts_needing_attention)
+        _display_metrics(contracts, contracts_needing_attention, cost_totals)
         _display_alerts(contracts_needing_attention)
-        _display_contract_list(contracts, contract_service)
+        _display_contract_list(contracts)
         _display_charts(contract_service)
         _display_simulations(contract_service)
 
@@ -3,51 +3,35 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from src.database import get_db
+from src.database import get_read_db
 from src.services import OpenAIService, PDFService, ContractService
+from src.services.archive_service import ArchiveService
+from src.services.contract_service import comparison_cursor
+from src.pages.pagination import paginate
 from src.config import CONTRACT_TYPES, LABEL_ECONOMY_YEAR, LABEL_TOTAL_ECONOMY_YEAR
 
 
 def _calculate_savings(comp):
-    # Helper to extract savings from comparison result
-    if not comp.comparison_result:
-        return 0
-
-    market_analysis = comp.comparison_result.get("analyse", {})
-    if not isinstance(market_analysis, dict):
-        market_analysis = {}
-
-    return (
-        comp.comparison_result.get("economie_potentielle_annuelle", 0)
-        or (comp.comparison_result.get("economie_potentielle_mensuelle", 0) * 12)
-        or market_analysis.get("economie_potentielle_annuelle", 0)
-        or (market_analysis.get("economie_potentielle_mensuelle", 0) * 12)
-        or comp.comparison_result.get("comparaison_prix", {}).get("economie_potentielle", 0)
-    )
+    # Économie normalisée enregistrée avec la comparaison
+    return comp.annual_savings_eur or 0
 
 
-def _display_global_stats(comparisons):
+def _display_global_stats(stats):
     st.markdown("### 📈 Statistiques")
     col1, col2, col3, col4 = st.columns(4)
 
-    total_comparisons = len(comparisons)
-    market_analyses = sum(1 for c in comparisons if c.comparison_type == "market_analysis")
-    competitor_comparisons = sum(1 for c in comparisons if c.comparison_type == "competitor_quote")
-
-    total_savings = sum(_calculate_savings(c) for c in comparisons)
-
     with col1:
-        st.metric("Total analyses", total_comparisons)
+        st.metric("Total analyses", stats["total"])
     with col2:
-        st.metric("📊 Analyses marché", market_analyses)
+        st.metric("📊 Analyses marché", stats["by_type"].get("market_analysis", 0))
     with col3:
-        st.metric("🆚 Comparaisons", competitor_comparisons)
+        st.metric("🆚 Comparaisons", stats["by_type"].get("competitor_quote", 0))
     with col4:
-        st.metric("💰 Économies potentielles", f"{total_savings:.0f} €/an")
+        st.metric("💰 Économies potentielles", f"{stats['total_savings']:.0f} €/an")
     st.divider()
 
 
-def _filter_comparisons(comparisons, contract_service):
+def _select_filters(contract_service):
     st.markdown("### 🔍 Filtres")
     col1, col2 = st.columns(2)
 
@@ -57,34 +41,28 @@ def _filter_comparisons(comparisons, contract_service):
         )
 
     with col2:
-        contracts = contract_service.get_all_contracts()
+        contracts = contract_service.get_contract_summaries()
         contract_options = ["Tous"] + [
             f"{c.provider} ({CONTRACT_TYPES.get(c.contract_type)})" for c in contracts
         ]
         filter_contract = st.selectbox("Contrat", contract_options)
 
-    filtered_comparisons = comparisons
+    selected_type = None
     if filter_type == "Analyses de marché":
-        filtered_comparisons = [
-            c for c in filtered_comparisons if c.comparison_type == "market_analysis"
-        ]
+        selected_type = "market_analysis"
     elif filter_type == "Comparaisons concurrent":
-        filtered_comparisons = [
-            c for c in filtered_comparisons if c.comparison_type == "competitor_quote"
-        ]
+        selected_type = "competitor_quote"
 
+    selected_contract_name = None
     if filter_contract != "Tous":
         selected_contract_name = filter_contract.split(" (")[0]
-        filtered_comparisons = [
-            c for c in filtered_comparisons if c.contract.provider == selected_contract_name
-        ]
 
     st.divider()
-    return filtered_comparisons
+    return selected_type, selected_contract_name
 
 
-def _display_analysis_table(filtered_comparisons):
-    st.markdown(f"### 📋 Analyses ({len(filtered_comparisons)})")
+def _display_analysis_table(filtered_comparisons, title="📋 Analyses"):
+    st.markdown(f"### {title}")
     if not filtered_comparisons:
         st.info("Aucune analyse ne correspond aux filtres sélectionnés")
         return False
@@ -121,48 +99,48 @@ def _display_analysis_table(filtered_comparisons):
     return True
 
 
-def _display_charts(filtered_comparisons):
+def _display_charts(contract_service, selected_type, selected_contract):
+    # Agrégats SQL sur toutes les analyses filtrées, pas seulement la page affichée
     st.markdown("### 📈 Évolution des économies potentielles")
-    chart_data = []
-    for comp in filtered_comparisons:
-        economie = _calculate_savings(comp)
-        chart_data.append(
-            {
-                "Date": comp.created_at,
-                "Contrat": comp.contract.provider,
-                LABEL_ECONOMY_YEAR: economie,
-                "Taille": abs(economie) + 5,
-                "Type": "Marché" if comp.comparison_type == "market_analysis" else "Concurrent",
-            }
-        )
+    daily_savings = contract_service.get_daily_savings(
+        comparison_type=selected_type, provider=selected_contract
+    )
 
-    if chart_data:
-        df_chart = pd.DataFrame(chart_data)
+    if daily_savings:
+        df_chart = pd.DataFrame(
+            [
+                {
+                    "Date": pd.to_datetime(day),
+                    "Contrat": provider,
+                    LABEL_ECONOMY_YEAR: savings,
+                    "Analyses": count,
+                    "Type": "Marché" if comparison_type == "market_analysis" else "Concurrent",
+                }
+                for day, provider, comparison_type, savings, count in daily_savings
+            ]
+        )
         fig = px.scatter(
             df_chart,
             x="Date",
             y=LABEL_ECONOMY_YEAR,
             color="Contrat",
             symbol="Type",
-            title="Économies potentielles par analyse",
-            size="Taille",
+            title="Économies potentielles par jour",
+            size="Analyses",
             size_max=20,
-            hover_data=["Type", LABEL_ECONOMY_YEAR],
+            hover_data=["Type", "Analyses", LABEL_ECONOMY_YEAR],
         )
         fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Seuil")
         st.plotly_chart(fig, use_container_width=True)
 
     st.markdown("### 📊 Économies par contrat")
-    savings_by_contract = {}
-    for comp in filtered_comparisons:
-        contract_name = comp.contract.provider
-        if contract_name not in savings_by_contract:
-            savings_by_contract[contract_name] = 0
-        savings_by_contract[contract_name] += _calculate_savings(comp)
+    savings_by_contract = contract_service.get_savings_by_contract(
+        comparison_type=selected_type, provider=selected_contract
+    )
 
     if savings_by_contract:
         df_savings = pd.DataFrame(
-            [{"Contrat": k, LABEL_TOTAL_ECONOMY_YEAR: v} for k, v in savings_by_contract.items()]
+            [{"Contrat": k, LABEL_TOTAL_ECONOMY_YEAR: v} for k, v in savings_by_contract]
         )
         fig2 = px.bar(
             df_savings,
@@ -180,7 +158,7 @@ def _display_details(filtered_comparisons):
     st.markdown("### 🔍 Détails des analyses")
     from src.pages.compare import display_market_analysis, display_competitor_comparison
 
-    for comp in filtered_comparisons[:10]:
+    for comp in filtered_comparisons:
         type_icon = "📊" if comp.comparison_type == "market_analysis" else "🆚"
         with st.expander(
             f"{type_icon} {comp.created_at.strftime('%d/%m/%Y %H:%M')} - "
@@ -197,26 +175,52 @@ def show():
     st.title("📊 Historique des analyses")
     st.markdown("Consultez toutes vos comparaisons et analyses passées")
 
-    with get_db() as db:
+    with get_read_db() as db:
         openai_service = OpenAIService()
         pdf_service = PDFService()
         contract_service = ContractService(db, openai_service, pdf_service)
 
-        comparisons = contract_service.get_all_comparisons()
+        stats = contract_service.get_comparison_stats()
+
+        # Les analyses anciennes sont dans la base d'archive, lue seulement sur demande
+        include_archive = st.checkbox(
+            "🗄️ Inclure les analyses archivées", key="history_include_archive"
+        )
 
-        if not comparisons:
+        if not stats["total"] and not include_archive:
             st.info("Aucune analyse effectuée pour le moment")
             if st.button("⚖️ Comparer un contrat"):
                 st.session_state["page"] = "compare"
                 st.rerun()
             return
 
-        _display_global_stats(comparisons)
-        filtered_comparisons = _filter_comparisons(comparisons, contract_service)
+        _display_global_stats(stats)
+        selected_type, selected_contract = _select_filters(contract_service)
+
+        # Seule la page affichée est lue : le coût ne dépend pas de la taille de l'historique
+        comparisons = paginate(
+            "history",
+            lambda limit, after: contract_service.get_all_comparisons(
+                limit=limit,
+                after=after,
+                comparison_type=selected_type,
+                provider=selected_contract,
+            ),
+            comparison_cursor,
+            filters=(selected_type, selected_contract),
+        )
 
-        if _display_analysis_table(filtered_comparisons):
-            _display_charts(filtered_comparisons)
-            _display_details(filtered_comparisons)
+        if _display_analysis_table(comparisons):
+            _display_charts(contract_service, selected_type, selected_contract)
+            _display_details(comparisons)
+
+        if include_archive:
+            archive_service = ArchiveService(db)
+            archived = paginate(
+                "history_archive", archive_service.get_archived_comparisons, comparison_cursor
+            )
+            if _display_analysis_table(archived, "🗄️ Analyses archivées"):
+                _display_details(archived)
 
 
 if __name__ == "__main__":
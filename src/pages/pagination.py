@@ -0,0 +1,111 @@
+"""Navigation par pages dans les listes (curseur keyset ou liste déjà chargée)."""
+from typing import Any, Callable, Hashable, List, Optional, Sequence
+
+import streamlit as st
+
+from src.config import PAGE_SIZE
+from src.database.pagination import Cursor
+
+
+def _reset_on_filter_change(key: str, filters: Hashable, initial: Any) -> Any:
+    """Retourne l'état de pagination de la liste, réinitialisé si les filtres ont changé."""
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[f"{key}_state"] = initial
+    return st.session_state[f"{key}_state"]
+
+
+def _display_controls(
+    key: str,
+    page_number: int,
+    has_next: bool,
+    on_previous: Callable[[], None],
+    on_next: Callable[[], None],
+) -> None:
+    """Affiche les boutons Précédent / Suivant s'il y a plus d'une page."""
+    if not has_next and page_number == 1:
+        return
+
+    col_previous, col_page, col_next = st.columns([1, 2, 1])
+    with col_previous:
+        st.button(
+            "◀ Précédent", key=f"{key}_previous", disabled=page_number == 1, on_click=on_previous
+        )
+    with col_page:
+        st.caption(f"Page {page_number}")
+    with col_next:
+        st.button("Suivant ▶", key=f"{key}_next", disabled=not has_next, on_click=on_next)
+
+
+def paginate(
+    key: str,
+    fetch: Callable[..., List[Any]],
+    cursor_of: Callable[[Any], Cursor],
+    filters: Hashable = (),
+    page_size: int = PAGE_SIZE,
+) -> List[Any]:
+    """
+    Lit la page courante d'une liste parcourue par curseur et affiche la navigation.
+
+    Les curseurs de début des pages visitées sont conservés dans la session :
+    revenir en arrière ne relit pas les pages précédentes. Un changement de
+    filtres ramène à la première page.
+
+    Args:
+        key: Identifiant unique de la liste (préfixe des clés de session et des boutons)
+        fetch: Fonction (limit, after) retournant les éléments qui suivent le curseur
+        cursor_of: Fonction retournant le curseur d'un élément
+        filters: Filtres appliqués par `fetch`
+        page_size: Nombre d'éléments par page
+
+    Returns:
+        Éléments de la page courante
+    """
+    cursors: List[Optional[Cursor]] = _reset_on_filter_change(key, filters, [None])
+
+    # Un élément de plus que la page indique s'il existe une page suivante
+    items = fetch(limit=page_size + 1, after=cursors[-1])
+    has_next = len(items) > page_size
+    items = items[:page_size]
+
+    _display_controls(
+        key,
+        len(cursors),
+        has_next,
+        on_previous=cursors.pop,
+        on_next=lambda: cursors.append(cursor_of(items[-1])),
+    )
+    return items
+
+
+def paginate_list(
+    key: str, items: Sequence[Any], filters: Hashable = (), page_size: int = PAGE_SIZE
+) -> Sequence[Any]:
+    """
+    Découpe une liste déjà chargée (vue allégée) en pages et affiche la navigation.
+
+    Args:
+        key: Identifiant unique de la liste (préfixe des clés de session et des boutons)
+        items: Éléments à afficher
+        filters: Tri ou filtres appliqués à la liste
+        page_size: Nombre d'éléments par page
+
+    Returns:
+        Éléments de la page courante
+    """
+    state = _reset_on_filter_change(key, filters, {"page": 1})
+    page_count = max(1, -(-len(items) // page_size))
+    state["page"] = min(state["page"], page_count)
+
+    def _move(offset: int) -> None:
+        state["page"] += offset
+
+    _display_controls(
+        key,
+        state["page"],
+        state["page"] < page_count,
+        on_previous=lambda: _move(-1),
+        on_next=lambda: _move(1),
+    )
+    start = (state["page"] - 1) * page_size
+    return items[start : start + page_size]
@@ -2,7 +2,7 @@
 
 import streamlit as st
 
-from src.database import get_db
+from src.database import get_read_db
 
 from src.services import ContractService, OpenAIService, PDFService
 
@@ -329,14 +329,14 @@ def show():
 
     st.markdown("Consultez les détails de vos contrats enregistrés.")
 
-    with get_db() as db:
+    with get_read_db() as db:
         openai_service = OpenAIService()
 
         pdf_service = PDFService()
 
         contract_service = ContractService(db, openai_service, pdf_service)
 
-        contracts = contract_service.get_all_contracts()
+        contracts = contract_service.get_contract_summaries()
 
         if not contracts:
             st.info("Aucun contrat enregistré.")
@@ -1,6 +1,14 @@
 """Package services."""
 from src.services.openai_service import OpenAIService
-from src.services.pdf_service import PDFService
-from src.services.contract_service import ContractService
+from src.services.pdf_service import KeyPages, ParsedPDF, PDFService
+from src.services.contract_service import ContractService, ContractSummary, SearchResult
 
-__all__ = ["OpenAIService", "PDFService", "ContractService"]
+__all__ = [
+    "OpenAIService",
+    "KeyPages",
+    "ParsedPDF",
+    "PDFService",
+    "ContractService",
+    "ContractSummary",
+    "SearchResult",
+]
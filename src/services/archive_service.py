@@ -0,0 +1,351 @@
+"""
+Archivage des comparaisons et logs d'extraction anciens.
+
+Les comparaisons au-delà des N plus récentes de chaque contrat, et les logs
+d'extraction au-delà des N plus récents, sont déplacés par lots vers une base
+SQLite d'archive : la base principale reste petite et les pages rapides.
+
+Usage (tâche planifiée, ou ARCHIVE_INTERVAL_MINUTES pour un thread de l'application) :
+    python -m src.services.archive_service [--keep 20] [--keep-logs 200]
+"""
+import argparse
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, Index, MetaData, Table, func, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.config import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_DATABASE_URL,
+    ARCHIVE_KEEP_COMPARISONS,
+    ARCHIVE_KEEP_EXTRACTION_LOGS,
+)
+from src.database.models import Comparison, Contract, ExtractionLog
+from src.database.pagination import Cursor, keyset_page
+
+logger = logging.getLogger(__name__)
+
+_archive_engine: Optional[Engine] = None
+
+
+def get_archive_engine() -> Engine:
+    """Retourne l'engine de la base d'archive (créé au premier appel)."""
+    global _archive_engine
+    if _archive_engine is None:
+        from src.database.database import create_db_engine
+
+        _archive_engine = create_db_engine(ARCHIVE_DATABASE_URL)
+    return _archive_engine
+
+
+def _archive_table(table: Table, metadata: MetaData) -> Table:
+    """Copie une table pour l'archive, sans clé étrangère vers la base principale."""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in table.columns
+    ]
+    archive_table = Table(table.name, metadata, *columns)
+    for index in table.indexes:
+        Index(index.name, *(archive_table.c[column.name] for column in index.columns))
+    return archive_table
+
+
+# Tables de la base d'archive, sans clé étrangère vers la base principale
+_archive_metadata = MetaData()
+ARCHIVE_TABLES = {
+    model: _archive_table(model.__table__, _archive_metadata)
+    for model in (Comparison, ExtractionLog)
+}
+# Engines dont le schéma d'archive est à jour : vérifié une fois par processus
+_ready_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+_schema_lock = threading.Lock()
+
+
+def ensure_archive_schema(archive_engine: Engine) -> None:
+    """Crée les tables d'archive et ajoute les colonnes apparues depuis leur création."""
+    with _schema_lock:
+        if archive_engine in _ready_engines:
+            return
+        _archive_metadata.create_all(bind=archive_engine)
+        inspector = inspect(archive_engine)
+        with archive_engine.begin() as connection:
+            for table in ARCHIVE_TABLES.values():
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        column_type = column.type.compile(dialect=archive_engine.dialect)
+                        connection.exec_driver_sql(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                        )
+        _ready_engines.add(archive_engine)
+
+
+def delete_archived_comparisons(
+    contract_ids: List[int], archive_engine: Optional[Engine] = None
+) -> int:
+    """
+    Supprime les comparaisons archivées de contrats supprimés définitivement.
+
+    L'archive n'a pas de clé étrangère vers les contrats : sans cet appel, leurs
+    comparaisons y resteraient orphelines.
+
+    Args:
+        contract_ids: Identifiants des contrats supprimés
+        archive_engine: Engine de la base d'archive (ARCHIVE_DATABASE_URL si None)
+
+    Returns:
+        Nombre de comparaisons archivées supprimées
+    """
+    if not contract_ids:
+        return 0
+    archive_engine = archive_engine or get_archive_engine()
+    ensure_archive_schema(archive_engine)
+    archive_table = ARCHIVE_TABLES[Comparison]
+    with archive_engine.begin() as connection:
+        return connection.execute(
+            archive_table.delete().where(archive_table.c.contract_id.in_(contract_ids))
+        ).rowcount
+
+
+class ArchiveService:
+    """Service de rétention : déplacement des lignes anciennes vers la base d'archive."""
+
+    def __init__(self, db: Session, archive_engine: Optional[Engine] = None):
+        """
+        Initialise le service d'archivage.
+
+        Args:
+            db: Session de la base principale
+            archive_engine: Engine de la base d'archive (ARCHIVE_DATABASE_URL si None)
+        """
+        self.db = db
+        self.archive_engine = archive_engine or get_archive_engine()
+        self.tables = ARCHIVE_TABLES
+        ensure_archive_schema(self.archive_engine)
+
+    def _cold_comparison_ids(self, keep_per_contract: int) -> List[int]:
+        """Identifiants des comparaisons au-delà des plus récentes de chaque contrat."""
+        position = (
+            func.row_number()
+            .over(
+                partition_by=Comparison.contract_id,
+                order_by=(Comparison.created_at.desc(), Comparison.id.desc()),
+            )
+            .label("position")
+        )
+        ranked = select(Comparison.id, position).subquery()
+        query = select(ranked.c.id).where(ranked.c.position > keep_per_contract)
+        return sorted(self.db.execute(query).scalars())
+
+    def _cold_extraction_log_ids(self, keep: int) -> List[int]:
+        """Identifiants des logs d'extraction au-delà des plus récents."""
+        recent = (
+            select(ExtractionLog.id)
+            .order_by(ExtractionLog.created_at.desc(), ExtractionLog.id.desc())
+            .limit(keep)
+        )
+        query = (
+            select(ExtractionLog.id)
+            .where(ExtractionLog.id.not_in(recent.scalar_subquery()))
+            .order_by(ExtractionLog.id)
+        )
+        return list(self.db.execute(query).scalars())
+
+    def _move_batches(self, model, ids: List[int], batch_size: int) -> int:
+        """
+        Déplace des lignes vers l'archive, une transaction par lot.
+
+        Les identifiants sont calculés une seule fois par passage : une ligne ancienne le
+        reste, quelles que soient les insertions faites pendant l'archivage.
+        """
+        moved = 0
+        for start in range(0, len(ids), batch_size):
+            moved += self._move_rows(model, ids[start : start + batch_size])
+        return moved
+
+    def _move_rows(self, model, ids: List[int]) -> int:
+        """Copie des lignes dans l'archive puis les supprime de la base principale."""
+        source = model.__table__
+        archive_table = self.tables[model]
+        rows = [
+            dict(row._mapping)
+            for row in self.db.execute(select(source).where(source.c.id.in_(ids)))
+        ]
+        if not rows:  # Lignes supprimées depuis le calcul du lot
+            return 0
+
+        # Écriture idempotente : un lot déjà copié mais non supprimé est recopié
+        with self.archive_engine.begin() as connection:
+            connection.execute(archive_table.delete().where(archive_table.c.id.in_(ids)))
+            connection.execute(archive_table.insert(), rows)
+
+        self.db.execute(source.delete().where(source.c.id.in_(ids)))
+        self.db.commit()
+        return len(rows)
+
+    def archive_comparisons(
+        self,
+        keep_per_contract: int = ARCHIVE_KEEP_COMPARISONS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """
+        Archive les comparaisons au-delà des `keep_per_contract` plus récentes par contrat.
+
+        Args:
+            keep_per_contract: Nombre de comparaisons conservées par contrat
+            batch_size: Nombre de lignes déplacées par transaction
+
+        Returns:
+            Nombre de comparaisons archivées
+        """
+        ids = self._cold_comparison_ids(keep_per_contract)
+        return self._move_batches(Comparison, ids, batch_size)
+
+    def archive_extraction_logs(
+        self, keep: int = ARCHIVE_KEEP_EXTRACTION_LOGS, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """
+        Archive les logs d'extraction au-delà des `keep` plus récents.
+
+        Args:
+            keep: Nombre de logs conservés
+            batch_size: Nombre de lignes déplacées par transaction
+
+        Returns:
+            Nombre de logs archivés
+        """
+        ids = self._cold_extraction_log_ids(keep)
+        return self._move_batches(ExtractionLog, ids, batch_size)
+
+    def run(
+        self,
+        keep_per_contract: int = ARCHIVE_KEEP_COMPARISONS,
+        keep_logs: int = ARCHIVE_KEEP_EXTRACTION_LOGS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Applique la politique de rétention complète.
+
+        Returns:
+            Nombre de lignes archivées par table
+        """
+        return {
+            "comparisons": self.archive_comparisons(keep_per_contract, batch_size),
+            "extraction_logs": self.archive_extraction_logs(keep_logs, batch_size),
+        }
+
+    def get_archived_comparisons(
+        self,
+        contract_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[Cursor] = None,
+    ) -> List[Comparison]:
+        """
+        Récupère les comparaisons archivées, de la plus récente à la plus ancienne.
+
+        Les objets retournés sont détachés ; leur contrat est celui de la base
+        principale. Les comparaisons dont le contrat a été supprimé sont ignorées.
+
+        Args:
+            contract_id: Filtre sur un contrat (toutes si None)
+            limit: Nombre maximal de comparaisons (toutes si None)
+            after: Curseur (created_at, id) de la dernière comparaison déjà lue
+
+        Returns:
+            Liste de Comparison archivées
+        """
+        # Filtre sur les contrats existants, appliqué dans la base d'archive : la pagination
+        # reste exacte même si des contrats ont été supprimés depuis l'archivage
+        contract_ids = self.db.query(Contract.id)
+        if contract_id is not None:
+            contract_ids = contract_ids.filter(Contract.id == contract_id)
+        contract_ids = [row.id for row in contract_ids]
+        if not contract_ids:
+            return []
+
+        archive_session = Session(bind=self.archive_engine)
+        try:
+            # Pas de table contracts dans l'archive : le filtre est fait ci-dessus
+            query = (
+                archive_session.query(Comparison)
+                .execution_options(include_deleted=True)
+                .filter(Comparison.contract_id.in_(contract_ids))
+            )
+            comparisons = keyset_page(
+                query, Comparison.created_at, Comparison.id, limit, after, descending=True
+            )
+            archive_session.expunge_all()
+        finally:
+            archive_session.close()
+
+        page_contract_ids = {comparison.contract_id for comparison in comparisons}
+        contracts = {
+            contract.id: contract
+            for contract in self.db.query(Contract).filter(Contract.id.in_(page_contract_ids))
+        }
+        for comparison in comparisons:
+            # Sans événement : la comparaison ne doit pas rejoindre la session principale
+            set_committed_value(comparison, "contract", contracts[comparison.contract_id])
+        return comparisons
+
+
+def run_archive_job(**kwargs) -> Dict[str, int]:
+    """Exécute la politique de rétention sur la base principale, dans sa propre session."""
+    from src.database.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        counts = ArchiveService(db).run(**kwargs)
+        logger.info("Archivage terminé : %s", counts)
+        return counts
+    finally:
+        db.close()
+
+
+def start_archive_worker(interval_minutes: float) -> threading.Thread:
+    """
+    Lance l'archivage périodique dans un thread d'arrière-plan.
+
+    Args:
+        interval_minutes: Délai entre deux exécutions (la première a lieu après ce délai)
+
+    Returns:
+        Thread démarré (daemon)
+    """
+
+    def _loop():
+        while True:
+            time.sleep(interval_minutes * 60)
+            try:
+                run_archive_job()
+            except Exception:
+                logger.exception("Échec de l'archivage")
+
+    worker = threading.Thread(target=_loop, name="archive-worker", daemon=True)
+    worker.start()
+    return worker
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Archivage des données anciennes de GardeTonOr")
+    parser.add_argument("--keep", type=int, default=ARCHIVE_KEEP_COMPARISONS)
+    parser.add_argument("--keep-logs", type=int, default=ARCHIVE_KEEP_EXTRACTION_LOGS)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    counts = run_archive_job(
+        keep_per_contract=args.keep, keep_logs=args.keep_logs, batch_size=args.batch_size
+    )
+    print(f"{counts['comparisons']} comparaison(s) et {counts['extraction_logs']} log(s) archivés")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,264 @@
 """Service métier pour la gestion des contrats."""
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from typing import Iterable, List, Dict, Any, NamedTuple, Optional, Tuple, Union
+from sqlalchemy import func, insert, literal_column, or_
+from sqlalchemy.orm import Session, defer, selectinload
 
-from src.database.models import Contract, Comparison, ExtractionLog
+from src.database import search_index
+from src.database.blob_store import BlobStore, blob_store
+from src.database.models import Contract, Comparison, ExtractionLog, PdfText
+from src.database.pagination import Cursor, keyset_page
+from src.services.archive_service import delete_archived_comparisons
 from src.services.openai_service import OpenAIService
 from src.services.pdf_service import PDFService
-from src.config import NOTIFICATION_DAYS_BEFORE
+from src.config import (
+    CONTRACT_TYPES,
+    NOTIFICATION_DAYS_BEFORE,
+    PROMPT_DEBUG,
+    SOFT_DELETE_MIN_COMPARISONS,
+)
+
+
+class ContractSummary(NamedTuple):
+    """Vue allégée d'un contrat pour les pages de liste (sans JSON ni PDF)."""
+
+    id: int
+    contract_type: str
+    provider: str
+    anniversary_date: datetime
+    monthly_cost_eur: Optional[float]
+    annual_cost_eur: Optional[float]
+
+
+class SearchResult(NamedTuple):
+    """Résultat de la recherche plein texte."""
+
+    id: int
+    contract_type: str
+    provider: str
+    anniversary_date: datetime
+    is_simulation: bool
+    snippet: str
+    rank: float
+
+
+def contract_cursor(contract: Union[Contract, ContractSummary]) -> Cursor:
+    """Curseur de pagination d'un contrat ou d'une simulation."""
+    return (contract.anniversary_date, contract.id)
+
+
+def comparison_cursor(comparison: Comparison) -> Cursor:
+    """Curseur de pagination d'une comparaison."""
+    return (comparison.created_at, comparison.id)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convertit un montant en float, None si absent ou nul."""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount or None
+
+
+def compute_contract_costs(
+    contract_type: str, contract_data: Dict[str, Any]
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Calcule les coûts mensuel et annuel normalisés d'un contrat.
+
+    Args:
+        contract_type: Type de contrat
+        contract_data: Données structurées du contrat
+
+    Returns:
+        Tuple (coût mensuel en €, coût annuel en €), None si non déterminable
+    """
+    data = contract_data or {}
+    monthly = annual = None
+
+    if contract_type == "telephone":
+        monthly = _to_float(data.get("prix_mensuel"))
+    elif contract_type == "assurance_pno":
+        monthly = _to_float(data.get("prime_mensuelle"))
+        annual = _to_float(data.get("prime_annuelle"))
+    elif contract_type == "assurance_habitation":
+        tarifs = data.get("tarifs") or {}
+        monthly = _to_float(tarifs.get("prime_mensuelle_ttc"))
+        annual = _to_float(tarifs.get("prime_annuelle_ttc"))
+    elif contract_type in ["electricite", "gaz"]:
+        annual = _to_float(data.get("estimation_facture_annuelle"))
+        if annual is None:
+            monthly = _to_float(data.get("prix_abonnement_mensuel"))
+
+    if annual is None and monthly is not None:
+        annual = round(monthly * 12, 2)
+    if monthly is None and annual is not None:
+        monthly = round(annual / 12, 2)
+
+    return monthly, annual
+
+
+# Colonnes indexées utilisables par ContractService.find_by_identifier
+IDENTIFIER_COLUMNS = {
+    "pdl": Contract.pdl,
+    "pce": Contract.pce,
+    "contract_number": Contract.contract_number,
+    "client_reference": Contract.client_reference,
+}
+
+
+def normalize_identifier(value: Any) -> Optional[str]:
+    """Normalise un identifiant (espaces retirés, majuscules), None si vide."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    normalized = "".join(str(value).split()).upper()
+    return normalized or None
+
+
+def extract_contract_identifiers(contract_data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Extrait les identifiants d'un contrat, quel que soit le format de contract_data.
+
+    Les données issues de l'extraction imbriquent les identifiants (`electricite.pdl`,
+    `gaz.pce`, `client.reference_client`) alors que les contrats enregistrés par type
+    les placent à la racine (`pdl`, `pce`).
+
+    Args:
+        contract_data: Données structurées du contrat
+
+    Returns:
+        Dictionnaire {nom de colonne: identifiant normalisé ou None}
+    """
+    data = contract_data or {}
+
+    def _nested(section: str, key: str) -> Any:
+        value = data.get(section)
+        return value.get(key) if isinstance(value, dict) else None
+
+    return {
+        "pdl": normalize_identifier(data.get("pdl") or _nested("electricite", "pdl")),
+        "pce": normalize_identifier(data.get("pce") or _nested("gaz", "pce")),
+        "contract_number": normalize_identifier(data.get("numero_contrat")),
+        "client_reference": normalize_identifier(_nested("client", "reference_client")),
+    }
+
+
+def compute_annual_savings(comparison_result: Optional[Dict[str, Any]]) -> float:
+    """
+    Calcule l'économie annuelle d'une comparaison, quel que soit le format de réponse.
+
+    Args:
+        comparison_result: Résultat structuré de la comparaison
+
+    Returns:
+        Économie annuelle en € (négative en cas de surcoût, 0 si inconnue)
+    """
+    if not comparison_result:
+        return 0.0
+
+    market_analysis = comparison_result.get("analyse", {})
+    if not isinstance(market_analysis, dict):
+        market_analysis = {}
+
+    def _yearly(monthly: Any) -> Optional[float]:
+        amount = _to_float(monthly)
+        return amount * 12 if amount is not None else None
+
+    candidates = [
+        comparison_result.get("economie_potentielle_annuelle"),
+        _yearly(comparison_result.get("economie_potentielle_mensuelle")),
+        market_analysis.get("economie_potentielle_annuelle"),
+        _yearly(market_analysis.get("economie_potentielle_mensuelle")),
+        (comparison_result.get("comparaison_prix") or {}).get("economie_potentielle"),
+    ]
+    for candidate in candidates:
+        amount = _to_float(candidate)
+        if amount is not None:
+            return amount
+    return 0.0
+
+
+# Chargement des listes de comparaisons : le contrat (colonnes affichées seulement) en
+# une requête IN pour toute la liste, les textes GPT à la demande (get_prompt)
+COMPARISON_LIST_OPTIONS = (
+    selectinload(Comparison.contract).load_only(
+        Contract.provider, Contract.contract_type, Contract.contract_data
+    ),
+    defer(Comparison.gpt_prompt),
+    defer(Comparison.gpt_response),
+    defer(Comparison.prompt_params),
+)
+
+# Arguments de create_contract acceptés par create_contracts_bulk
+REQUIRED_CONTRACT_FIELDS = (
+    "contract_type",
+    "provider",
+    "start_date",
+    "anniversary_date",
+    "contract_data",
+)
+OPTIONAL_CONTRACT_FIELDS = (
+    "pdf_bytes",
+    "filename",
+    "end_date",
+    "is_simulation",
+    "pdf_text",
+)
+
+
+def _validate_contract_spec(spec: Any) -> List[str]:
+    """Liste les erreurs d'une entrée de create_contracts_bulk (vide si valide)."""
+    if not isinstance(spec, dict):
+        return ["doit être un dictionnaire"]
+
+    errors = [
+        f"champ obligatoire manquant: {field}"
+        for field in REQUIRED_CONTRACT_FIELDS
+        if spec.get(field) is None
+    ]
+    unknown = set(spec) - set(REQUIRED_CONTRACT_FIELDS) - set(OPTIONAL_CONTRACT_FIELDS)
+    errors += [f"champ inconnu: {field}" for field in sorted(unknown)]
+
+    contract_type = spec.get("contract_type")
+    if contract_type is not None and (
+        contract_type not in CONTRACT_TYPES or contract_type == "auto"
+    ):
+        errors.append(f"type de contrat inconnu: {contract_type}")
+    for field in ("start_date", "anniversary_date", "end_date"):
+        if spec.get(field) is not None and not isinstance(spec[field], date):
+            errors.append(f"{field} doit être une date")
+    if spec.get("contract_data") is not None and not isinstance(spec["contract_data"], dict):
+        errors.append("contract_data doit être un dictionnaire")
+    if spec.get("pdf_bytes") is not None and not isinstance(spec["pdf_bytes"], bytes):
+        errors.append("pdf_bytes doit être de type bytes")
+    return errors
+
+
+def _as_datetime(value: Optional[date]) -> Optional[datetime]:
+    """Convertit une date (ex. st.date_input) en datetime à minuit."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
 
 
 class ContractService:
     """Service pour la logique métier des contrats."""
 
-    def __init__(self, db: Session, openai_service: OpenAIService, pdf_service: PDFService):
+    def __init__(
+        self,
+        db: Session,
+        openai_service: Optional[OpenAIService] = None,
+        pdf_service: Optional[PDFService] = None,
+    ):
         """
         Initialise le service de contrats.
 
         Args:
             db: Session de base de données
-            openai_service: Service OpenAI
-            pdf_service: Service PDF
+            openai_service: Service OpenAI (requis pour l'extraction et les comparaisons)
+            pdf_service: Service PDF (requis pour l'extraction)
         """
         self.db = db
         self.openai_service = openai_service
@@ -42,21 +281,33 @@ class ContractService:
         Raises:
             Exception: Si l'extraction échoue
         """
-        # Valider le PDF
-        if not self.pdf_service.validate_pdf(pdf_bytes):
-            raise ValueError("Le fichier n'est pas un PDF valide")
+        # Un seul parsing du PDF pour la validation, le texte et l'empreinte
+        document = self.pdf_service.open(pdf_bytes)
+        try:
+            if not document.is_valid:
+                raise ValueError("Le fichier n'est pas un PDF valide")
 
-        # Extraire le texte
-        pdf_text = self.pdf_service.extract_text_from_pdf(pdf_bytes)
+            # Lecture arrêtée dès que les champs clés du type de contrat sont repérés
+            key_pages = self.pdf_service.read_key_pages(document, contract_type)
+            pdf_text = key_pages.text
+        finally:
+            document.close()
 
         # Extraire les données structurées avec OpenAI
         extraction_result = self.openai_service.extract_contract_data(pdf_text, contract_type)
 
-        # Logger l'extraction
+        # Logger l'extraction : le texte est conservé compressé et référencé par son
+        # empreinte (celle du PDF, ou celle du texte s'il est partiel : le texte complet
+        # est extrait ensuite par indexing_service)
+        if key_pages.complete:
+            pdf_hash = self._store_pdf_text(document.fingerprint, pdf_text)
+        else:
+            text_hash = BlobStore.compute_hash(pdf_text.encode("utf-8"))
+            pdf_hash = self._store_pdf_text(text_hash, pdf_text, key_pages.pages_read)
         extraction_log = ExtractionLog(
             filename=filename,
             contract_type=contract_type,
-            gpt_prompt=extraction_result["prompt"],
+            **self._prompt_columns(extraction_result, pdf_hash),
             gpt_response=extraction_result["raw_response"],
             extracted_data=extraction_result["data"],
             success=1,
@@ -66,6 +317,82 @@ class ContractService:
 
         return extraction_result["data"], pdf_text
 
+    def _store_pdf_text(
+        self, pdf_hash: str, pdf_text: str, page_count: Optional[int] = None
+    ) -> str:
+        """Conserve le texte extrait d'un PDF s'il ne l'est pas déjà et retourne l'empreinte."""
+        if self.db.get(PdfText, pdf_hash) is None:
+            stored_text = PdfText(pdf_hash=pdf_hash, page_count=page_count)
+            stored_text.text = pdf_text
+            self.db.add(stored_text)
+        return pdf_hash
+
+    @staticmethod
+    def _prompt_columns(
+        openai_result: Dict[str, Any], pdf_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Prépare les colonnes de journalisation d'un prompt.
+
+        Le prompt est journalisé sous forme de template, version et paramètres ; le
+        texte du PDF est remplacé par son empreinte. Le prompt complet n'est conservé
+        qu'en mode debug ou si le template est inconnu.
+
+        Args:
+            openai_result: Résultat d'un appel à OpenAIService
+            pdf_hash: Empreinte du PDF dont le texte figure dans les paramètres
+
+        Returns:
+            Valeurs des colonnes gpt_prompt et prompt_*
+        """
+        template = openai_result.get("prompt_template")
+        if not template:
+            return {"gpt_prompt": openai_result["prompt"]}
+
+        params = dict(template["params"])
+        if pdf_hash and "pdf_text" in params:
+            params["pdf_hash"] = pdf_hash
+            del params["pdf_text"]
+
+        return {
+            "gpt_prompt": openai_result["prompt"] if PROMPT_DEBUG else None,
+            "prompt_template": template["id"],
+            "prompt_template_version": template["version"],
+            "prompt_params": params,
+        }
+
+    def get_prompt(self, record: Union[ExtractionLog, Comparison]) -> Optional[str]:
+        """
+        Retourne le prompt envoyé pour une extraction ou une comparaison.
+
+        Le prompt conservé est retourné tel quel ; sinon il est reconstruit depuis son
+        template et ses paramètres (texte du PDF relu depuis les textes conservés).
+
+        Args:
+            record: Log d'extraction ou comparaison
+
+        Returns:
+            Prompt envoyé, None si ni le prompt ni son template n'ont été journalisés
+
+        Raises:
+            ValueError: Si le template est inconnu ou si le texte du PDF est introuvable
+        """
+        if record.gpt_prompt is not None:
+            return record.gpt_prompt
+        if not record.prompt_template:
+            return None
+
+        params = dict(record.prompt_params or {})
+        if "pdf_hash" in params:
+            stored_text = self.db.get(PdfText, params.pop("pdf_hash"))
+            if stored_text is None:
+                raise ValueError("Texte du PDF introuvable pour reconstruire le prompt")
+            params["pdf_text"] = stored_text.text
+
+        return self.openai_service.render_prompt(
+            record.prompt_template, record.prompt_template_version, params
+        )
+
     def create_contract(
         self,
         contract_type: str,
@@ -77,6 +404,7 @@ class ContractService:
         filename: str,
         end_date: Optional[datetime] = None,
         is_simulation: bool = False,
+        pdf_text: Optional[str] = None,
     ) -> Contract:
         """
         Crée un nouveau contrat dans la base de données.
@@ -91,17 +419,22 @@ class ContractService:
             filename: Nom du fichier
             end_date: Date de fin (optionnel)
             is_simulation: Si True, c'est une simulation/devis concurrent
+            pdf_text: Texte extrait du PDF, ajouté à l'index de recherche (optionnel)
 
         Returns:
             Contrat créé
         """
+        monthly_cost, annual_cost = compute_contract_costs(contract_type, contract_data)
         contract = Contract(
+            **extract_contract_identifiers(contract_data),
             contract_type=contract_type,
             provider=provider,
             start_date=start_date,
             end_date=end_date,
             anniversary_date=anniversary_date,
             contract_data=contract_data,
+            monthly_cost_eur=monthly_cost,
+            annual_cost_eur=annual_cost,
             pdf_content=pdf_bytes,
             original_filename=filename,
             validated=1,  # Validé après confirmation utilisateur
@@ -109,33 +442,310 @@ class ContractService:
         )
 
         self.db.add(contract)
+        self.db.flush()
+        self._index_contract(contract, pdf_text)
         self.db.commit()
         self.db.refresh(contract)
 
         return contract
 
-    def get_all_contracts(self) -> List[Contract]:
-        """Récupère tous les contrats réels (pas les simulations)."""
-        return (
-            self.db.query(Contract)
-            .filter(Contract.is_simulation == 0)
-            .order_by(Contract.anniversary_date)
+    def create_contracts_bulk(self, contracts: List[Dict[str, Any]]) -> List[int]:
+        """
+        Crée plusieurs contrats en une seule transaction.
+
+        Toutes les entrées sont validées avant la première écriture : une erreur
+        n'insère aucun contrat. Les lignes sont insérées en une instruction
+        (executemany), sans rechargement des objets.
+
+        Args:
+            contracts: Liste de contrats, chacun avec les arguments de create_contract
+                (contract_type, provider, start_date, anniversary_date, contract_data,
+                et optionnellement pdf_bytes, filename, end_date, is_simulation, pdf_text)
+
+        Returns:
+            IDs des contrats créés, dans l'ordre de la liste
+
+        Raises:
+            ValueError: Si au moins un contrat est invalide (toutes les erreurs sont listées)
+        """
+        errors = [
+            f"Contrat n°{position}: {error}"
+            for position, spec in enumerate(contracts, start=1)
+            for error in _validate_contract_spec(spec)
+        ]
+        if errors:
+            raise ValueError("\n".join(errors))
+        if not contracts:
+            return []
+
+        rows = []
+        for spec in contracts:
+            contract_data = spec["contract_data"]
+            monthly_cost, annual_cost = compute_contract_costs(spec["contract_type"], contract_data)
+            pdf_bytes = spec.get("pdf_bytes")
+            pdf_hash, pdf_size = blob_store.put(pdf_bytes) if pdf_bytes else (None, None)
+            rows.append(
+                {
+                    **extract_contract_identifiers(contract_data),
+                    "contract_type": spec["contract_type"],
+                    "provider": spec["provider"],
+                    "start_date": _as_datetime(spec["start_date"]),
+                    "end_date": _as_datetime(spec.get("end_date")),
+                    "anniversary_date": _as_datetime(spec["anniversary_date"]),
+                    "contract_data": contract_data,
+                    "monthly_cost_eur": monthly_cost,
+                    "annual_cost_eur": annual_cost,
+                    "pdf_hash": pdf_hash,
+                    "pdf_size": pdf_size,
+                    "original_filename": spec.get("filename"),
+                    "validated": 1,
+                    "is_simulation": 1 if spec.get("is_simulation") else 0,
+                }
+            )
+
+        statement = insert(Contract).returning(Contract.id, sort_by_parameter_order=True)
+        ids = list(self.db.execute(statement, rows).scalars())
+
+        if search_index.is_search_available(self.db):
+            stored_texts = self._stored_pdf_texts(
+                row["pdf_hash"]
+                for row, spec in zip(rows, contracts)
+                if spec.get("pdf_text") is None and row["pdf_hash"]
+            )
+            search_index.index_new_contracts(
+                self.db,
+                (
+                    (
+                        SimpleNamespace(id=contract_id, **row),
+                        spec.get("pdf_text") or stored_texts.get(row["pdf_hash"]),
+                    )
+                    for contract_id, row, spec in zip(ids, rows, contracts)
+                ),
+            )
+
+        self.db.commit()
+        return ids
+
+    def _stored_pdf_texts(self, pdf_hashes: Iterable[str]) -> Dict[str, str]:
+        """Textes déjà extraits pour un ensemble de PDF, en une requête."""
+        pdf_hashes = set(pdf_hashes)
+        if not pdf_hashes:
+            return {}
+        return {
+            pdf_text.pdf_hash: pdf_text.text
+            for pdf_text in self.db.query(PdfText).filter(PdfText.pdf_hash.in_(pdf_hashes))
+        }
+
+    def get_all_contracts(
+        self, limit: Optional[int] = None, after: Optional[Cursor] = None
+    ) -> List[Contract]:
+        """
+        Récupère les contrats réels (pas les simulations) par date anniversaire.
+
+        Args:
+            limit: Nombre maximal de contrats (tous si None)
+            after: Curseur (anniversary_date, id) du dernier contrat de la page précédente
+
+        Returns:
+            Liste de Contract
+        """
+        query = self.db.query(Contract).filter(Contract.is_simulation == 0)
+        return keyset_page(query, Contract.anniversary_date, Contract.id, limit, after)
+
+    def get_contract_summaries(
+        self, is_simulation: bool = False, sort_by_cost: bool = False
+    ) -> List[ContractSummary]:
+        """
+        Récupère une vue allégée des contrats.
+
+        Seules les colonnes nécessaires aux listes sont lues : ni le JSON complet
+        du contrat ni le PDF ne sont chargés.
+
+        Args:
+            is_simulation: Si True, retourne les simulations au lieu des contrats réels
+            sort_by_cost: Si True, trie par coût annuel décroissant au lieu de la date
+                anniversaire
+
+        Returns:
+            Liste de ContractSummary
+        """
+        if sort_by_cost:
+            order = (Contract.annual_cost_eur.desc().nulls_last(), Contract.anniversary_date)
+        else:
+            order = (Contract.anniversary_date,)
+
+        rows = (
+            self.db.query(
+                Contract.id,
+                Contract.contract_type,
+                Contract.provider,
+                Contract.anniversary_date,
+                Contract.monthly_cost_eur,
+                Contract.annual_cost_eur,
+            )
+            .filter(Contract.is_simulation == (1 if is_simulation else 0))
+            .order_by(*order)
             .all()
         )
+        return [ContractSummary(*row) for row in rows]
 
-    def get_all_simulations(self) -> List[Contract]:
-        """Récupère toutes les simulations."""
-        return (
-            self.db.query(Contract)
-            .filter(Contract.is_simulation == 1)
-            .order_by(Contract.anniversary_date)
-            .all()
+    def get_cost_totals(self) -> Tuple[float, float]:
+        """
+        Calcule en SQL le coût total des contrats réels.
+
+        Returns:
+            Tuple (total mensuel en €, total annuel en €)
+        """
+        monthly_total, annual_total = (
+            self.db.query(
+                func.coalesce(func.sum(Contract.monthly_cost_eur), 0.0),
+                func.coalesce(func.sum(Contract.annual_cost_eur), 0.0),
+            )
+            .filter(Contract.is_simulation == 0)
+            .one()
         )
+        return monthly_total, annual_total
+
+    def get_all_simulations(
+        self, limit: Optional[int] = None, after: Optional[Cursor] = None
+    ) -> List[Contract]:
+        """
+        Récupère les simulations par date anniversaire.
+
+        Args:
+            limit: Nombre maximal de simulations (toutes si None)
+            after: Curseur (anniversary_date, id) de la dernière simulation déjà lue
+
+        Returns:
+            Liste de Contract
+        """
+        query = self.db.query(Contract).filter(Contract.is_simulation == 1)
+        return keyset_page(query, Contract.anniversary_date, Contract.id, limit, after)
 
     def get_contract_by_id(self, contract_id: int) -> Optional[Contract]:
         """Récupère un contrat par son ID."""
         return self.db.query(Contract).filter(Contract.id == contract_id).first()
 
+    def find_by_identifier(
+        self, value: str, identifier_type: Optional[str] = None
+    ) -> List[Contract]:
+        """
+        Recherche les contrats portant un identifiant (PDL, PCE, numéro de contrat...).
+
+        La recherche passe par les colonnes indexées renseignées à l'écriture, sans
+        parcourir le JSON des contrats.
+
+        Args:
+            value: Identifiant recherché (espaces et casse ignorés)
+            identifier_type: Colonne ciblée parmi IDENTIFIER_COLUMNS (toutes si None)
+
+        Returns:
+            Liste des contrats correspondants, simulations comprises
+
+        Raises:
+            ValueError: Si le type d'identifiant est inconnu
+        """
+        if identifier_type is not None and identifier_type not in IDENTIFIER_COLUMNS:
+            raise ValueError(f"Type d'identifiant inconnu: {identifier_type}")
+
+        normalized = normalize_identifier(value)
+        if normalized is None:
+            return []
+
+        if identifier_type is not None:
+            condition = IDENTIFIER_COLUMNS[identifier_type] == normalized
+        else:
+            condition = or_(*(column == normalized for column in IDENTIFIER_COLUMNS.values()))
+
+        return self.db.query(Contract).filter(condition).order_by(Contract.id).all()
+
+    def _index_contract(self, contract: Contract, pdf_text: Optional[str] = None) -> None:
+        """Met à jour l'index plein texte du contrat dans la transaction en cours."""
+        if not search_index.is_search_available(self.db):
+            return
+        if pdf_text is None and contract.pdf_hash:
+            stored_text = self.db.get(PdfText, contract.pdf_hash)
+            pdf_text = stored_text.text if stored_text else None
+        search_index.index_contract(self.db, contract, pdf_text)
+
+    def get_contract_text(self, contract_id: int) -> Optional[str]:
+        """
+        Retourne le texte du PDF d'un contrat pour une réextraction ou une nouvelle analyse.
+
+        Le texte conservé lors de l'extraction est réutilisé ; le PDF n'est relu que
+        s'il n'a jamais été extrait.
+
+        Args:
+            contract_id: ID du contrat
+
+        Returns:
+            Texte du PDF, None si le contrat n'existe pas ou n'a pas de PDF
+        """
+        contract = self.get_contract_by_id(contract_id)
+        if not contract or not contract.pdf_hash:
+            return None
+
+        stored_text = self.db.get(PdfText, contract.pdf_hash)
+        if stored_text:
+            return stored_text.text
+
+        pdf_bytes = contract.pdf_content
+        return self.pdf_service.extract_text_from_pdf(pdf_bytes) if pdf_bytes else None
+
+    def search(self, query: str, limit: int = 20) -> List[SearchResult]:
+        """
+        Recherche plein texte dans les contrats (fournisseur, identifiants, données, PDF).
+
+        Les résultats sont classés par pertinence (bm25, le fournisseur et les
+        identifiants pesant plus que le texte du PDF).
+
+        Args:
+            query: Texte saisi (chaque mot est recherché comme préfixe)
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Liste de SearchResult, du plus pertinent au moins pertinent
+        """
+        match_query = search_index.build_match_query(query)
+        if match_query is None or not search_index.is_search_available(self.db):
+            return []
+
+        fts = search_index.search_table()
+        weights = ", ".join(str(weight) for weight in search_index.SEARCH_WEIGHTS)
+        # La colonne cachée `rank` permet à FTS5 de ne classer que les meilleurs résultats
+        rows = (
+            self.db.query(
+                Contract.id,
+                Contract.contract_type,
+                Contract.provider,
+                Contract.anniversary_date,
+                Contract.is_simulation,
+                literal_column(f"snippet({fts.name}, -1, '**', '**', '…', 12)"),
+                fts.c.rank,
+            )
+            .select_from(fts)
+            .join(Contract, Contract.id == fts.c.rowid)
+            .filter(
+                literal_column(fts.name).op("MATCH")(match_query),
+                fts.c.rank.op("MATCH")(f"bm25({weights})"),
+            )
+            .order_by(fts.c.rank)
+            .limit(limit)
+            .all()
+        )
+        return [
+            SearchResult(
+                id=row[0],
+                contract_type=row[1],
+                provider=row[2],
+                anniversary_date=row[3],
+                is_simulation=bool(row[4]),
+                snippet=row[5],
+                rank=row[6],
+            )
+            for row in rows
+        ]
+
     def get_contracts_needing_attention(self) -> List[Contract]:
         """
         Récupère les contrats dont la date anniversaire approche.
@@ -188,9 +798,10 @@ class ContractService:
         comparison = Comparison(
             contract_id=contract_id,
             comparison_type="market_analysis",
-            gpt_prompt=comparison_result["prompt"],
+            **self._prompt_columns(comparison_result),
             gpt_response=comparison_result["raw_response"],
             comparison_result=comparison_result["analysis"],
+            annual_savings_eur=compute_annual_savings(comparison_result["analysis"]),
             analysis_summary=recommandation,
         )
 
@@ -239,9 +850,10 @@ class ContractService:
             competitor_filename=competitor_filename,
             competitor_pdf=competitor_pdf_bytes,
             competitor_data=competitor_extraction["data"],
-            gpt_prompt=comparison_result["prompt"],
+            **self._prompt_columns(comparison_result),
             gpt_response=comparison_result["raw_response"],
             comparison_result=comparison_result["analysis"],
+            annual_savings_eur=compute_annual_savings(comparison_result["analysis"]),
             analysis_summary=comparison_result["analysis"].get("recommandation", ""),
         )
 
@@ -255,21 +867,145 @@ class ContractService:
         """Récupère toutes les comparaisons d'un contrat."""
         return (
             self.db.query(Comparison)
+            .options(*COMPARISON_LIST_OPTIONS)
             .filter(Comparison.contract_id == contract_id)
             .order_by(Comparison.created_at.desc())
             .all()
         )
 
-    def get_all_comparisons(self) -> List[Comparison]:
-        """Récupère toutes les comparaisons."""
-        return self.db.query(Comparison).order_by(Comparison.created_at.desc()).all()
+    def get_all_comparisons(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Cursor] = None,
+        comparison_type: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> List[Comparison]:
+        """
+        Récupère les comparaisons, de la plus récente à la plus ancienne.
+
+        Le contrat de chaque comparaison est chargé en une requête pour toute la page.
+
+        Args:
+            limit: Nombre maximal de comparaisons (toutes si None)
+            after: Curseur (created_at, id) de la dernière comparaison de la page précédente
+            comparison_type: Filtre optionnel sur le type de comparaison
+            provider: Filtre optionnel sur le fournisseur du contrat
+
+        Returns:
+            Liste de Comparison
+        """
+        query = self.db.query(Comparison).options(*COMPARISON_LIST_OPTIONS)
+        if comparison_type:
+            query = query.filter(Comparison.comparison_type == comparison_type)
+        if provider:
+            query = query.join(Comparison.contract).filter(Contract.provider == provider)
+        return keyset_page(
+            query, Comparison.created_at, Comparison.id, limit, after, descending=True
+        )
+
+    def get_comparison_stats(self) -> Dict[str, Any]:
+        """
+        Calcule en SQL les statistiques globales des comparaisons.
+
+        Returns:
+            Dictionnaire avec le nombre total, le nombre par type et l'économie totale
+        """
+        rows = (
+            self.db.query(
+                Comparison.comparison_type,
+                func.count(Comparison.id),
+                func.coalesce(func.sum(Comparison.annual_savings_eur), 0.0),
+            )
+            .group_by(Comparison.comparison_type)
+            .all()
+        )
+        by_type = {comparison_type: count for comparison_type, count, _ in rows}
+        return {
+            "total": sum(by_type.values()),
+            "by_type": by_type,
+            "total_savings": sum(savings for _, _, savings in rows),
+        }
 
-    def delete_contract(self, contract_id: int) -> bool:
+    def get_savings_by_contract(
+        self, comparison_type: Optional[str] = None, provider: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
         """
-        Supprime un contrat.
+        Calcule en SQL l'économie cumulée par fournisseur de contrat.
+
+        Args:
+            comparison_type: Filtre optionnel sur le type de comparaison
+            provider: Filtre optionnel sur le fournisseur
+
+        Returns:
+            Liste de tuples (fournisseur, économie annuelle cumulée)
+        """
+        query = self.db.query(
+            Contract.provider, func.coalesce(func.sum(Comparison.annual_savings_eur), 0.0)
+        ).join(Comparison.contract)
+        if comparison_type:
+            query = query.filter(Comparison.comparison_type == comparison_type)
+        if provider:
+            query = query.filter(Contract.provider == provider)
+        return [tuple(row) for row in query.group_by(Contract.provider).all()]
+
+    def get_daily_savings(
+        self, comparison_type: Optional[str] = None, provider: Optional[str] = None
+    ) -> List[Tuple[Any, str, str, float, int]]:
+        """
+        Calcule en SQL l'économie cumulée et le nombre de comparaisons par jour.
+
+        Args:
+            comparison_type: Filtre optionnel sur le type de comparaison
+            provider: Filtre optionnel sur le fournisseur
+
+        Returns:
+            Liste de tuples (jour, fournisseur, type de comparaison, économie annuelle
+            cumulée, nombre de comparaisons) triés par jour
+        """
+        day = func.date(Comparison.created_at)
+        query = self.db.query(
+            day,
+            Contract.provider,
+            Comparison.comparison_type,
+            func.coalesce(func.sum(Comparison.annual_savings_eur), 0.0),
+            func.count(Comparison.id),
+        ).join(Comparison.contract)
+        if comparison_type:
+            query = query.filter(Comparison.comparison_type == comparison_type)
+        if provider:
+            query = query.filter(Contract.provider == provider)
+        query = query.group_by(day, Contract.provider, Comparison.comparison_type)
+        return [tuple(row) for row in query.order_by(day, Contract.provider).all()]
+
+    def get_savings_timeline(self) -> List[Tuple[datetime, str, float]]:
+        """
+        Récupère l'économie de chaque comparaison avec sa date et son fournisseur.
+
+        Returns:
+            Liste de tuples (date, fournisseur, économie annuelle) triés par date
+        """
+        rows = (
+            self.db.query(Comparison.created_at, Contract.provider, Comparison.annual_savings_eur)
+            .join(Comparison.contract)
+            .filter(Comparison.annual_savings_eur.isnot(None))
+            .order_by(Comparison.created_at)
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
+    def delete_contract(self, contract_id: int, soft: Optional[bool] = None) -> bool:
+        """
+        Supprime un contrat et ses comparaisons.
+
+        La suppression définitive laisse la base supprimer les comparaisons (ON DELETE
+        CASCADE), sans les charger, puis supprime ses comparaisons archivées. La
+        suppression logique masque le contrat immédiatement ; ses lignes sont
+        supprimées ensuite par purge_service.
 
         Args:
             contract_id: ID du contrat à supprimer
+            soft: Suppression logique si True, définitive si False. Si None, logique
+                quand le contrat a au moins SOFT_DELETE_MIN_COMPARISONS comparaisons.
 
         Returns:
             True si suppression réussie, False sinon
@@ -278,8 +1014,23 @@ class ContractService:
         if not contract:
             return False
 
-        self.db.delete(contract)
+        if soft is None:
+            comparison_count = (
+                self.db.query(func.count(Comparison.id))
+                .filter(Comparison.contract_id == contract_id)
+                .scalar()
+            )
+            soft = comparison_count >= SOFT_DELETE_MIN_COMPARISONS
+
+        if search_index.is_search_available(self.db):
+            search_index.remove_contract(self.db, contract.id)
+        if soft:
+            contract.deleted_at = datetime.now()
+        else:
+            self.db.delete(contract)
         self.db.commit()
+        if not soft:
+            delete_archived_comparisons([contract_id])
         return True
 
     def update_contract(self, contract_id: int, updates: Dict[str, Any]) -> Optional[Contract]:
@@ -301,7 +1052,14 @@ class ContractService:
             if hasattr(contract, key):
                 setattr(contract, key, value)
 
-        contract.updated_at = datetime.now(timezone.utc)
+        contract.monthly_cost_eur, contract.annual_cost_eur = compute_contract_costs(
+            contract.contract_type, contract.contract_data
+        )
+        for column, identifier in extract_contract_identifiers(contract.contract_data).items():
+            setattr(contract, column, identifier)
+
+        contract.updated_at = datetime.now()
+        self._index_contract(contract)
         self.db.commit()
         self.db.refresh(contract)
 
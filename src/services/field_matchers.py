@@ -0,0 +1,77 @@
+"""
+Repérage local des champs clés d'un contrat dans le texte d'un PDF.
+
+Expressions volontairement simples : elles ne servent qu'à savoir si les données
+principales (Conditions Particulières) ont été lues, pas à les extraire.
+"""
+import re
+from typing import Dict, Pattern, Set
+
+_DATE = r"\d{1,2}(?:er)?\s*(?:[/.-]\s*\d{1,2}\s*[/.-]\s*|\s+[a-zéèûô]+\s+)\d{2,4}"
+_AMOUNT = r"\d[\d \u00a0\u202f]*(?:[,.]\d{1,4})?\s*(?:€|eur)"
+
+
+def _pattern(expression: str) -> Pattern:
+    return re.compile(expression, re.IGNORECASE)
+
+
+_START_DATE = _pattern(rf"(?:d[ée]but|effet|activation|souscription|sign[ée])[^\n]{{0,80}}?{_DATE}")
+_PRICE = _pattern(
+    r"(?:prix|montant|mensualit[ée]s?|pr[ée]lev[ée]|budget|abonnement|forfait|tarif)"
+    rf"[^\n]{{0,80}}?{_AMOUNT}"
+)
+_INSURANCE_FIELDS = {
+    "prime": _pattern(rf"(?:cotisation|prime)[^\n]{{0,80}}?{_AMOUNT}"),
+    "adresse": _pattern(
+        r"lieu\s+du\s+risque|situation\s+du\s+risque|bien\s+assur[ée]"
+        r"|adresse\s+(?:du\s+)?(?:bien|logement|risque)"
+    ),
+    "echeance": _pattern(
+        r"(?:[ée]ch[ée]ance\s+principale|date\s+d'[ée]ch[ée]ance|date\s+anniversaire)"
+        rf"[^\n]{{0,60}}?(?:{_DATE}|\d{{1,2}}(?:er)?\s+[a-zéèûô]+)"
+    ),
+}
+
+# Champs à trouver avant d'arrêter la lecture, par type de contrat ("auto" : aucun, le
+# type n'est pas encore connu et tout le document est lu)
+REQUIRED_FIELDS: Dict[str, Dict[str, Pattern]] = {
+    "telephone": {"prix": _PRICE, "date_debut": _START_DATE},
+    "electricite": {
+        "pdl": _pattern(r"(?:PDL|point\s+de\s+livraison|PRM)\D{0,40}\d{14}"),
+        "prix": _PRICE,
+        "date_debut": _START_DATE,
+    },
+    "gaz": {
+        "pce": _pattern(
+            r"(?:PCE|point\s+de\s+comptage|point\s+de\s+consommation)"
+            r"[^\n]{0,80}?(?:GI\s?\d{6}|\d{14})"
+        ),
+        "prix": _PRICE,
+        "date_debut": _START_DATE,
+    },
+    "assurance_habitation": _INSURANCE_FIELDS,
+    "assurance_pno": _INSURANCE_FIELDS,
+}
+
+
+def required_fields(contract_type: str) -> Set[str]:
+    """Champs à repérer pour un type de contrat (vide si la lecture doit être complète)."""
+    return set(REQUIRED_FIELDS.get(contract_type, {}))
+
+
+def find_required_fields(contract_type: str, text: str) -> Set[str]:
+    """
+    Champs clés repérés dans un texte.
+
+    Args:
+        contract_type: Type de contrat
+        text: Texte d'une ou plusieurs pages
+
+    Returns:
+        Noms des champs trouvés
+    """
+    return {
+        field
+        for field, pattern in REQUIRED_FIELDS.get(contract_type, {}).items()
+        if pattern.search(text)
+    }
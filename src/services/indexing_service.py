@@ -0,0 +1,148 @@
+"""
+Extraction complète du texte des PDF lus partiellement à l'import.
+
+L'import s'arrête aux pages qui portent les champs clés du contrat
+(PDFService.read_key_pages) : le texte complet, utilisé par la recherche plein texte,
+est extrait ici, hors de la requête de l'utilisateur, puis indexé.
+
+Sur une base mise à jour, le premier passage relit aussi tous les PDF importés avant la
+conservation du texte : le lancer hors de l'application, par la ligne de commande.
+
+Usage (tâche planifiée, ou INDEXING_INTERVAL_MINUTES > 0 pour un thread de l'application) :
+    python -m src.services.indexing_service [--batch-size 20]
+"""
+import argparse
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.config import INDEXING_BATCH_SIZE
+from src.database import search_index
+from src.database.blob_store import blob_store
+from src.database.models import Contract, PdfText
+from src.exceptions import PDFServiceError
+from src.services.pdf_service import PDFService
+
+logger = logging.getLogger(__name__)
+
+
+def _pdf_hashes_without_text(db: Session, limit: int) -> List[str]:
+    """Empreintes des PDF de contrats dont le texte complet n'a pas été extrait."""
+    query = (
+        select(Contract.pdf_hash)
+        .outerjoin(PdfText, PdfText.pdf_hash == Contract.pdf_hash)
+        .where(Contract.pdf_hash.is_not(None), PdfText.pdf_hash.is_(None))
+        .distinct()
+        .order_by(Contract.pdf_hash)
+        .limit(limit)
+    )
+    return list(db.execute(query).scalars())
+
+
+def _complete_pdf_text(db: Session, pdf_hash: str) -> None:
+    """Extrait et conserve le texte complet d'un PDF, puis réindexe ses contrats."""
+    pdf_bytes = blob_store.get(pdf_hash)
+    try:
+        if pdf_bytes is None:
+            raise PDFServiceError("PDF absent du stockage")
+        # Texte conservé sous l'empreinte recherchée, et non celle recalculée depuis le
+        # fichier : un blob altéré ne doit pas être relu à chaque passage
+        pdf_service = PDFService()
+        with pdf_service.open(pdf_bytes) as document:
+            pdf_text = pdf_service.extract_text_from_pdf(document)
+            page_count = document.page_count
+    except PDFServiceError as e:
+        # Texte vide conservé : le PDF n'est pas relu à chaque passage
+        logger.warning("Texte du PDF %s non extrait : %s", pdf_hash, e)
+        pdf_text, page_count = None, 0
+
+    stored_text = PdfText(pdf_hash=pdf_hash, page_count=page_count)
+    stored_text.text = pdf_text or ""
+    db.merge(stored_text)
+
+    if pdf_text and search_index.is_search_available(db):
+        for contract in db.query(Contract).filter(Contract.pdf_hash == pdf_hash):
+            search_index.index_contract(db, contract, pdf_text)
+    db.commit()
+
+
+def complete_pdf_texts(db: Session, batch_size: int = INDEXING_BATCH_SIZE) -> int:
+    """
+    Extrait le texte complet des PDF de contrats qui n'en ont pas et met à jour l'index.
+
+    Args:
+        db: Session de base de données
+        batch_size: Nombre de PDF recherchés par requête
+
+    Returns:
+        Nombre de PDF traités
+    """
+    tried = set()
+    while True:
+        # Un PDF déjà traité qui revient (texte non conservé) arrête la boucle
+        pdf_hashes = [
+            pdf_hash
+            for pdf_hash in _pdf_hashes_without_text(db, batch_size)
+            if pdf_hash not in tried
+        ]
+        if not pdf_hashes:
+            return len(tried)
+        for pdf_hash in pdf_hashes:
+            _complete_pdf_text(db, pdf_hash)
+        tried.update(pdf_hashes)
+
+
+def run_indexing_job(batch_size: int = INDEXING_BATCH_SIZE) -> int:
+    """Complète le texte des PDF lus partiellement, dans sa propre session."""
+    from src.database.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        completed = complete_pdf_texts(db, batch_size)
+        if completed:
+            logger.info("Texte complet extrait pour %s PDF", completed)
+        return completed
+    finally:
+        db.close()
+
+
+def start_indexing_worker(interval_minutes: float) -> threading.Thread:
+    """
+    Lance l'extraction complète périodique dans un thread d'arrière-plan.
+
+    Args:
+        interval_minutes: Délai entre deux exécutions (la première a lieu au démarrage)
+
+    Returns:
+        Thread démarré (daemon)
+    """
+
+    def _loop():
+        while True:
+            try:
+                run_indexing_job()
+            except Exception:
+                logger.exception("Échec de l'extraction complète des PDF")
+            time.sleep(interval_minutes * 60)
+
+    worker = threading.Thread(target=_loop, name="indexing-worker", daemon=True)
+    worker.start()
+    return worker
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Extraction complète du texte des PDF")
+    parser.add_argument("--batch-size", type=int, default=INDEXING_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print(f"Texte complet extrait pour {run_indexing_job(args.batch_size)} PDF")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,29 @@ import json
 from typing import Dict, Any, Optional
 from openai import OpenAI
 
-from src.config import OPENAI_API_KEY, OPENAI_MODEL
+from src.config import EXTRACTION_TOKEN_BUDGET, OPENAI_API_KEY, OPENAI_MODEL
 from src.exceptions import OpenAIServiceError
+from src.services.page_ranking import select_relevant_pages
 
 
 class OpenAIService:
     """Service pour interagir avec l'API OpenAI."""
 
+    # Constructeurs de prompts par (identifiant de template, version). Incrémenter la
+    # version quand un template change et conserver l'ancien constructeur : les prompts
+    # journalisés restent reconstructibles à l'identique.
+    PROMPT_TEMPLATES = {
+        ("extraction", 1): "_build_extraction_prompt",
+        ("extraction", 2): "_build_ranked_extraction_prompt",
+        ("market_comparison", 1): "_build_market_comparison_prompt",
+        ("competitor_comparison", 1): "_build_competitor_comparison_prompt",
+    }
+    PROMPT_TEMPLATE_VERSIONS = {
+        "extraction": 2,
+        "market_comparison": 1,
+        "competitor_comparison": 1,
+    }
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialise le service OpenAI.
@@ -23,11 +39,13 @@ class OpenAIService:
 
         self.client = OpenAI(api_key=self.api_key)
         self.model = OPENAI_MODEL
+        self.extraction_token_budget = EXTRACTION_TOKEN_BUDGET
 
     def extract_contract_data(self, pdf_text: str, contract_type: str) -> Dict[str, Any]:
         """
         Extrait les données structurées d'un contrat à partir du texte PDF.
-        Utilise un schéma JSON générique normalisé.
+        Utilise un schéma JSON générique normalisé. Seules les pages les plus pertinentes
+        sont envoyées quand le texte dépasse le budget de tokens d'extraction.
 
         Args:
             pdf_text: Texte extrait du PDF
@@ -41,7 +59,8 @@ class OpenAIService:
         """
         # Obtenir le schéma générique
         schema = self._get_contract_schema(contract_type)
-        prompt = self._build_extraction_prompt(contract_type, pdf_text, schema)
+        token_budget = self.extraction_token_budget
+        prompt = self._build_ranked_extraction_prompt(contract_type, pdf_text, token_budget, schema)
 
         try:
             response = self.client.chat.completions.create(
@@ -75,6 +94,12 @@ class OpenAIService:
             return {
                 "data": extracted_data,
                 "prompt": prompt,
+                "prompt_template": self._prompt_template(
+                    "extraction",
+                    contract_type=contract_type,
+                    pdf_text=pdf_text,
+                    token_budget=token_budget,
+                ),
                 "raw_response": result,
                 "schema": schema,
             }
@@ -82,6 +107,34 @@ class OpenAIService:
         except Exception as e:
             raise OpenAIServiceError(f"Erreur lors de l'extraction des données: {str(e)}") from e
 
+    def _prompt_template(self, template_id: str, **params: Any) -> Dict[str, Any]:
+        """Référence du template utilisé pour un prompt (identifiant, version, paramètres)."""
+        return {
+            "id": template_id,
+            "version": self.PROMPT_TEMPLATE_VERSIONS[template_id],
+            "params": params,
+        }
+
+    def render_prompt(self, template_id: str, version: int, params: Dict[str, Any]) -> str:
+        """
+        Reconstruit un prompt à partir de son template et de ses paramètres.
+
+        Args:
+            template_id: Identifiant du template (extraction, market_comparison...)
+            version: Version du template utilisée à l'origine
+            params: Paramètres du constructeur de prompt
+
+        Returns:
+            Prompt identique à celui envoyé à l'origine
+
+        Raises:
+            ValueError: Si le template ou sa version est inconnu
+        """
+        builder = self.PROMPT_TEMPLATES.get((template_id, version))
+        if builder is None:
+            raise ValueError(f"Template de prompt inconnu: {template_id} v{version}")
+        return getattr(self, builder)(**params)
+
     def compare_with_market(
         self, contract_data: Dict[str, Any], contract_type: str
     ) -> Dict[str, Any]:
@@ -119,7 +172,14 @@ class OpenAIService:
             result = response.choices[0].message.content
             comparison_result = json.loads(result)
 
-            return {"analysis": comparison_result, "prompt": prompt, "raw_response": result}
+            return {
+                "analysis": comparison_result,
+                "prompt": prompt,
+                "prompt_template": self._prompt_template(
+                    "market_comparison", contract_type=contract_type, contract_data=contract_data
+                ),
+                "raw_response": result,
+            }
 
         except Exception as e:
             raise OpenAIServiceError(f"Erreur lors de la comparaison de marché: {str(e)}") from e
@@ -164,7 +224,17 @@ class OpenAIService:
             result = response.choices[0].message.content
             comparison_result = json.loads(result)
 
-            return {"analysis": comparison_result, "prompt": prompt, "raw_response": result}
+            return {
+                "analysis": comparison_result,
+                "prompt": prompt,
+                "prompt_template": self._prompt_template(
+                    "competitor_comparison",
+                    contract_type=contract_type,
+                    current_contract=current_contract,
+                    competitor_data=competitor_data,
+                ),
+                "raw_response": result,
+            }
 
         except Exception as e:
             raise OpenAIServiceError(
@@ -347,6 +417,17 @@ JSON de réponse :"""
 
         return base_instructions
 
+    def _build_ranked_extraction_prompt(
+        self,
+        contract_type: str,
+        pdf_text: str,
+        token_budget: int,
+        schema: Dict[str, Any] = None,
+    ) -> str:
+        """Construit le prompt d'extraction sur les pages retenues dans le budget de tokens."""
+        selected_text = select_relevant_pages(pdf_text, contract_type, token_budget)
+        return self._build_extraction_prompt(contract_type, selected_text, schema)
+
     def _build_extraction_prompt_legacy(self, contract_type: str, pdf_text: str) -> str:
         """Version legacy du prompt (pour compatibilité)."""
 
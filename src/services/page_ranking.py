@@ -0,0 +1,190 @@
+"""
+Sélection des pages utiles d'un contrat avant l'envoi à GPT.
+
+Chaque page reçoit un score TF-IDF sur les termes caractéristiques du type de contrat
+(« Cotisation annuelle », « PDL », « Echéance principale »...), augmenté pour chaque
+champ clé (field_matchers) repéré dans la page. Les meilleures pages sont retenues dans
+la limite d'un budget de tokens, puis remises dans l'ordre du document.
+
+La sélection est déterministe : un prompt journalisé est reconstruit à partir du texte
+complet et du budget. Toute modification du classement impose une nouvelle version du
+template "extraction" (OpenAIService.PROMPT_TEMPLATES).
+"""
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Pattern, Tuple
+
+from src.config import EXTRACTION_TOKEN_BUDGET
+from src.services.field_matchers import find_required_fields
+
+# Les pages non vides sont séparées par une ligne vide (ParsedPDF.text)
+PAGE_SEPARATOR = "\n\n"
+# Marque laissée à la place des pages écartées
+OMITTED_PAGES = "[...]"
+# Estimation du nombre de caractères par token (texte français)
+CHARS_PER_TOKEN = 4
+# Poids d'un champ clé repéré dans une page, en points de score
+FIELD_BONUS = 5.0
+
+_COMMON_TERMS = [
+    "conditions particulieres",
+    "date d'effet",
+    "prise d'effet",
+    "souscripteur",
+    "titulaire",
+    "numero de contrat",
+    "n° de contrat",
+    "reference client",
+    "total ttc",
+    "montant",
+    "prix",
+    "tarif",
+    "mensualite",
+    "echeancier",
+]
+_INSURANCE_TERMS = [
+    "cotisation annuelle",
+    "prime",
+    "echeance principale",
+    "date d'echeance",
+    "lieu du risque",
+    "bien assure",
+    "adresse du risque",
+    "surface",
+    "pieces principales",
+    "franchise",
+    "garanties souscrites",
+    "capital mobilier",
+    "proprietaire",
+    "locataire",
+    "dependances",
+]
+
+# Termes caractéristiques par type de contrat (sans accents, en minuscules)
+TERMS: Dict[str, List[str]] = {
+    "telephone": [
+        "forfait",
+        "abonnement",
+        "engagement",
+        "ligne",
+        "mobile",
+        "box",
+        "go",
+        "prix mensuel",
+    ],
+    "electricite": [
+        "pdl",
+        "point de livraison",
+        "prm",
+        "puissance souscrite",
+        "kva",
+        "option tarifaire",
+        "heures creuses",
+        "kwh",
+        "abonnement",
+        "consommation annuelle",
+        "offre",
+    ],
+    "gaz": [
+        "pce",
+        "point de comptage",
+        "zone tarifaire",
+        "kwh",
+        "consommation annuelle de reference",
+        "abonnement",
+        "offre",
+    ],
+    "assurance_habitation": _INSURANCE_TERMS,
+    "assurance_pno": _INSURANCE_TERMS + ["proprietaire non occupant", "loyers impayes"],
+}
+
+
+def _normalize(text: str) -> str:
+    """Minuscules sans accents, pour comparer le texte aux termes."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=None)
+def _term_patterns(contract_type: str) -> Tuple[Pattern, ...]:
+    """Expressions des termes du type de contrat (tous les termes si le type est inconnu)."""
+    terms = TERMS.get(contract_type) or sorted({term for terms in TERMS.values() for term in terms})
+    return tuple(
+        re.compile(rf"(?<!\w){re.escape(term)}(?!\w)")
+        for term in dict.fromkeys(_COMMON_TERMS + terms)
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Nombre approximatif de tokens d'un texte."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def score_pages(contract_type: str, pages: List[str]) -> List[float]:
+    """
+    Score de pertinence de chaque page pour l'extraction.
+
+    Args:
+        contract_type: Type de contrat
+        pages: Texte de chaque page
+
+    Returns:
+        Score de chaque page, dans l'ordre des pages
+    """
+    patterns = _term_patterns(contract_type)
+    counts = [[len(pattern.findall(_normalize(page))) for pattern in patterns] for page in pages]
+
+    # Un terme présent sur peu de pages (PDL, Echéance principale) pèse plus qu'un terme
+    # répété dans toutes les Conditions Générales
+    page_frequencies = [
+        sum(1 for page_counts in counts if page_counts[term]) for term in range(len(patterns))
+    ]
+    idf = [math.log((len(pages) + 1) / (frequency + 1)) + 1 for frequency in page_frequencies]
+
+    return [
+        sum((1 + math.log(count)) * idf[term] for term, count in enumerate(page_counts) if count)
+        + FIELD_BONUS * len(find_required_fields(contract_type, page))
+        for page, page_counts in zip(pages, counts)
+    ]
+
+
+def select_relevant_pages(
+    pdf_text: str, contract_type: str, token_budget: int = EXTRACTION_TOKEN_BUDGET
+) -> str:
+    """
+    Réduit le texte d'un contrat à ses pages les plus utiles.
+
+    Args:
+        pdf_text: Texte du PDF (pages séparées par une ligne vide)
+        contract_type: Type de contrat
+        token_budget: Nombre maximal de tokens du texte retenu (0 : pas de limite)
+
+    Returns:
+        Texte inchangé s'il tient dans le budget, sinon pages retenues dans l'ordre du
+        document, les pages écartées étant remplacées par OMITTED_PAGES
+    """
+    if token_budget <= 0 or estimate_tokens(pdf_text) <= token_budget:
+        return pdf_text
+
+    pages = pdf_text.split(PAGE_SEPARATOR)
+    scores = score_pages(contract_type, pages)
+
+    # Pages par score décroissant ; à score égal, les premières pages du document
+    selected, used_tokens = [], 0
+    for index in sorted(range(len(pages)), key=lambda index: (-scores[index], index)):
+        page_tokens = estimate_tokens(pages[index])
+        if used_tokens + page_tokens <= token_budget or not selected:
+            selected.append(index)
+            used_tokens += page_tokens
+
+    parts, previous = [], -1
+    for index in sorted(selected):
+        if index > previous + 1:
+            parts.append(OMITTED_PAGES)
+        parts.append(pages[index])
+        previous = index
+    if previous < len(pages) - 1:
+        parts.append(OMITTED_PAGES)
+    return PAGE_SEPARATOR.join(parts)
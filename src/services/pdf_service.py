@@ -1,41 +1,460 @@
 """Service d'extraction de texte depuis les fichiers PDF."""
+import atexit
 import io
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
 import pdfplumber
+from pypdf import PdfReader
+from sqlalchemy.orm import Session
+
+from src.config import (
+    PDF_EARLY_STOP,
+    PDF_EARLY_STOP_MARGIN_PAGES,
+    PDF_MAX_GARBLED_RATIO,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_TEXT_BACKENDS,
+    PDF_WORKERS,
+)
+from src.database.blob_store import BlobStore
+from src.database.models import PdfText
 from src.exceptions import PDFServiceError
+from src.services.field_matchers import find_required_fields, required_fields
+
+logger = logging.getLogger(__name__)
+
+# Caractères d'une extraction ratée : glyphes sans correspondance Unicode ("(cid:12)"),
+# caractère de remplacement, zone privée et caractères de contrôle
+_GARBLED = re.compile(r"\(cid:\d+\)|[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Au-delà de cette longueur moyenne, les mots sont collés (espaces perdus)
+_MAX_AVERAGE_WORD_LENGTH = 25
+
+# Pools de processus d'extraction par nombre de processus, partagés par les imports
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Pool de `max_workers` processus, créé au premier appel."""
+    with _pools_lock:
+        if max_workers not in _pools:
+            # "spawn" : un fork du processus Streamlit (threads d'archivage, de purge...)
+            # pourrait copier des verrous détenus par un autre thread
+            _pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pools[max_workers]
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """Arrête les pools (processus interrompu ou fin de l'application)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def _extract_page_list(
+    pdf_bytes: bytes, indexes: List[int], backends: Sequence[str]
+) -> List[Tuple[str, str]]:
+    """(texte, moteur) des pages demandées ; exécuté dans un processus du pool."""
+    with ParsedPDF(pdf_bytes, backends) as document:
+        return [document._read_page(index) for index in indexes]
+
+
+def split_page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Découpe [0, page_count) en au plus `parts` plages contiguës de tailles voisines."""
+    parts = max(1, min(parts, page_count))
+    bounds = [page_count * part // parts for part in range(parts + 1)]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def is_usable_text(text: str, max_garbled_ratio: float = PDF_MAX_GARBLED_RATIO) -> bool:
+    """
+    Indique si le texte extrait d'une page est exploitable.
+
+    Un texte vide, dont une part notable des caractères est illisible, ou dont les
+    mots sont collés est considéré comme raté : la page est relue par le moteur suivant.
+
+    Args:
+        text: Texte extrait d'une page
+        max_garbled_ratio: Part maximale de caractères illisibles
+
+    Returns:
+        True si le texte peut être utilisé tel quel
+    """
+    words = text.split()
+    content_length = sum(len(word) for word in words)
+    if not content_length:
+        return False
+    garbled = sum(len(match) for match in _GARBLED.findall(text))
+    if garbled / content_length > max_garbled_ratio:
+        return False
+    return content_length / len(words) <= _MAX_AVERAGE_WORD_LENGTH
+
+
+class PypdfBackend:
+    """Moteur rapide : texte brut lu par pypdf, sans analyse de mise en page."""
+
+    def __init__(self, pdf_bytes: bytes):
+        self._reader = PdfReader(io.BytesIO(pdf_bytes))
+        self.page_count = len(self._reader.pages)
+        self.metadata = {
+            key.lstrip("/"): value for key, value in (self._reader.metadata or {}).items()
+        }
+
+    def page_text(self, index: int) -> str:
+        # Même présentation que pdfplumber : ni espaces en fin de ligne, ni lignes vides (une
+        # ligne vide sépare les pages dans le texte complet)
+        text = self._reader.pages[index].extract_text() or ""
+        return "\n".join(line.rstrip() for line in text.splitlines() if line.strip())
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class PdfplumberBackend:
+    """Moteur précis : positions des caractères analysées par pdfplumber (tableaux, colonnes)."""
+
+    def __init__(self, pdf_bytes: bytes):
+        self._pdf = pdfplumber.open(io.BytesIO(pdf_bytes))
+        self.page_count = len(self._pdf.pages)
+        self.metadata = dict(self._pdf.metadata or {})
+
+    def page_text(self, index: int) -> str:
+        return self._pdf.pages[index].extract_text() or ""
+
+    def tables(self, index: int) -> List[List[List[Optional[str]]]]:
+        return self._pdf.pages[index].extract_tables()
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+# Moteurs d'extraction disponibles, désignés par leur nom dans PDF_TEXT_BACKENDS
+TEXT_BACKENDS = {
+    "pypdf": PypdfBackend,
+    "pdfplumber": PdfplumberBackend,
+}
+
+
+class KeyPages(NamedTuple):
+    """Texte lu pour une extraction, éventuellement limité aux premières pages."""
+
+    text: str
+    pages_read: int
+    page_count: int
+
+    @property
+    def complete(self) -> bool:
+        """Indique si tout le document a été lu."""
+        return self.pages_read >= self.page_count
+
+
+class ParsedPDF:
+    """
+    Document PDF ouvert une seule fois, partagé par toutes les étapes d'un import.
+
+    La structure du document est lue à l'ouverture ; le texte et les tableaux de
+    chaque page ne sont extraits qu'à la première demande, puis conservés.
+    L'empreinte des octets n'est calculée qu'une fois.
+
+    Chaque page est lue par le premier moteur de la chaîne ; si son texte n'est pas
+    exploitable (is_usable_text), la page est relue par le moteur suivant.
+    """
+
+    def __init__(self, pdf_bytes: bytes, backends: Sequence[str] = PDF_TEXT_BACKENDS):
+        """
+        Ouvre le document. Un fichier illisible donne un document invalide, sans exception.
+
+        Args:
+            pdf_bytes: Contenu du PDF en bytes
+            backends: Noms des moteurs d'extraction (TEXT_BACKENDS), du plus rapide au
+                plus précis
+        """
+        self.pdf_bytes = pdf_bytes
+        self.backends = list(backends)
+        self.error: Optional[str] = None
+        self._documents: Dict[str, Any] = {}
+        self._page_texts: Dict[int, str] = {}
+        # Moteur retenu pour chaque page lue
+        self.page_backends: Dict[int, str] = {}
+        self._fingerprint: Optional[str] = None
+        self.page_count = 0
+        self.metadata: Dict[str, Any] = {}
+
+        errors = []
+        for name in self.backends:
+            try:
+                document = self._document(name)
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                continue
+            self.page_count = document.page_count
+            self.metadata = document.metadata
+            break
+        else:
+            self.error = "; ".join(errors) or "Aucun moteur d'extraction configuré"
+
+    @property
+    def is_valid(self) -> bool:
+        """Indique si le fichier est un PDF lisible d'au moins une page."""
+        return self.error is None and self.page_count > 0
+
+    @property
+    def fingerprint(self) -> str:
+        """Empreinte SHA-256 du document (clé du blob store et du texte conservé)."""
+        if self._fingerprint is None:
+            self._fingerprint = BlobStore.compute_hash(self.pdf_bytes)
+        return self._fingerprint
+
+    def _check_readable(self) -> None:
+        if self.error is not None or self._documents is None:
+            raise ValueError(f"Document PDF illisible: {self.error or 'document fermé'}")
+
+    def _document(self, name: str):
+        """Document ouvert par un moteur (ouvert à la première demande)."""
+        self._check_readable()
+        if name not in self._documents:
+            self._documents[name] = TEXT_BACKENDS[name](self.pdf_bytes)
+        return self._documents[name]
+
+    def _read_page(self, index: int) -> Tuple[str, str]:
+        """Lit une page avec la chaîne de moteurs ; retourne (texte, moteur retenu)."""
+        self._check_readable()
+
+        # Sans texte exploitable, le dernier texte non vide obtenu est conservé
+        fallback = ("", self.backends[0])
+        for name in self.backends:
+            try:
+                text = self._document(name).page_text(index)
+            except Exception:
+                logger.warning("Page %d illisible avec %s", index + 1, name, exc_info=True)
+                continue
+            if is_usable_text(text):
+                return text, name
+            if text.strip():
+                fallback = (text, name)
+        return fallback
+
+    def page_text(self, index: int) -> str:
+        """Texte d'une page (chaîne vide si la page n'a pas de texte)."""
+        if index not in self._page_texts:
+            self._page_texts[index], self.page_backends[index] = self._read_page(index)
+        return self._page_texts[index]
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """Parcourt les pages dans l'ordre ; chaque page n'est lue qu'à sa demande."""
+        for index in range(self.page_count):
+            yield index, self.page_text(index)
+
+    def extract_pages(
+        self, max_workers: int = PDF_WORKERS, min_parallel_pages: int = PDF_PARALLEL_MIN_PAGES
+    ) -> List[str]:
+        """
+        Extrait le texte de toutes les pages, en parallèle pour les longs documents.
+
+        Au-delà de `min_parallel_pages` pages non encore lues, ces pages sont réparties
+        en lots contigus entre les processus du pool ; chaque processus n'ouvre le
+        document qu'une fois. Les petits documents sont lus ici, sans coût de transfert.
+
+        Args:
+            max_workers: Nombre maximal de processus (1 pour une lecture séquentielle)
+            min_parallel_pages: Nombre de pages à partir duquel la lecture est parallèle
+
+        Returns:
+            Texte de chaque page, dans l'ordre du document
+        """
+        missing = [index for index in range(self.page_count) if index not in self._page_texts]
+        if max_workers > 1 and len(missing) >= min_parallel_pages and self._documents is not None:
+            batches = [
+                missing[start:stop] for start, stop in split_page_ranges(len(missing), max_workers)
+            ]
+            try:
+                results = _get_pool(max_workers).map(
+                    _extract_page_list,
+                    [self.pdf_bytes] * len(batches),
+                    batches,
+                    [self.backends] * len(batches),
+                )
+                # map() rend les lots dans l'ordre de soumission, comme `missing`
+                pages = [page for batch_pages in results for page in batch_pages]
+                for index, (text, backend) in zip(missing, pages):
+                    self._page_texts[index], self.page_backends[index] = text, backend
+            except Exception:
+                logger.warning(
+                    "Extraction parallèle impossible, lecture séquentielle", exc_info=True
+                )
+                _shutdown_pools()
+
+        return [self.page_text(index) for index in range(self.page_count)]
+
+    @property
+    def page_texts(self) -> List[str]:
+        """Texte de chaque page, dans l'ordre du document."""
+        return self.extract_pages()
+
+    @property
+    def text(self) -> str:
+        """Texte complet : pages non vides séparées par une ligne vide."""
+        return "\n\n".join(text for text in self.page_texts if text)
+
+    def tables(self, index: int) -> List[List[List[Optional[str]]]]:
+        """Tableaux détectés sur une page (lignes de cellules), toujours lus par pdfplumber."""
+        return self._document("pdfplumber").tables(index)
+
+    def close(self) -> None:
+        """Libère les documents ouverts (le texte déjà extrait reste disponible)."""
+        for document in (self._documents or {}).values():
+            document.close()
+        self._documents = None
+
+    def __enter__(self) -> "ParsedPDF":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 class PDFService:
     """Service pour extraire le texte des fichiers PDF."""
 
+    def __init__(self, db: Optional[Session] = None):
+        """
+        Initialise le service PDF.
+
+        Args:
+            db: Session de base de données. Si fournie, le texte extrait est conservé
+                par empreinte du document et réutilisé quand les mêmes octets reviennent.
+        """
+        self.db = db
+
     @staticmethod
-    def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+    def open(pdf_bytes: bytes) -> ParsedPDF:
         """
-        Extrait le texte d'un fichier PDF.
+        Ouvre un PDF pour la validation, l'extraction du texte et des tableaux.
 
         Args:
             pdf_bytes: Contenu du PDF en bytes
 
+        Returns:
+            Document ouvert (invalide si le fichier n'est pas un PDF lisible), à fermer
+            après usage
+        """
+        return ParsedPDF(pdf_bytes)
+
+    def extract_text_from_pdf(self, pdf: Union[bytes, ParsedPDF]) -> str:
+        """
+        Extrait le texte d'un fichier PDF.
+
+        Args:
+            pdf: Contenu du PDF en bytes, ou document déjà ouvert par open()
+
         Returns:
             Texte extrait du PDF
 
         Raises:
-            Exception: Si l'extraction échoue
+            PDFServiceError: Si l'extraction échoue
         """
-        try:
-            text_content = []
+        if isinstance(pdf, ParsedPDF):
+            return self._extract_text(pdf)
+        with self.open(pdf) as document:
+            return self._extract_text(document)
+
+    def _extract_text(self, document: ParsedPDF) -> str:
+        """Texte du document, repris du texte conservé s'il a déjà été extrait."""
+        pdf_hash = document.fingerprint if self.db is not None else None
+        if pdf_hash:
+            cached_text = self.get_text(pdf_hash)
+            if cached_text is not None:
+                return cached_text
+
+        full_text, page_count = self._parse_pdf(document)
+
+        if pdf_hash:
+            pdf_text = PdfText(pdf_hash=pdf_hash, page_count=page_count)
+            pdf_text.text = full_text
+            self.db.merge(pdf_text)
+            self.db.flush()
+
+        return full_text
+
+    def read_key_pages(
+        self,
+        document: ParsedPDF,
+        contract_type: str,
+        early_stop: bool = PDF_EARLY_STOP,
+        margin_pages: int = PDF_EARLY_STOP_MARGIN_PAGES,
+    ) -> KeyPages:
+        """
+        Lit les pages utiles à l'extraction des données d'un contrat.
+
+        Les pages sont lues une à une jusqu'à ce que les champs clés du type de contrat
+        (field_matchers) soient tous repérés, plus `margin_pages` pages. Si un champ
+        manque, tout le document est lu. Seul un texte complet est conservé en base.
 
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_content.append(text)
+        Args:
+            document: Document ouvert par open()
+            contract_type: Type de contrat
+            early_stop: Si False, lit tout le document
+            margin_pages: Pages lues après celle où le dernier champ a été trouvé
 
-            full_text = "\n\n".join(text_content)
+        Returns:
+            Texte lu et nombre de pages lues
+
+        Raises:
+            PDFServiceError: Si le document ne contient pas de texte
+        """
+        cached_text = self.get_text(document.fingerprint) if self.db is not None else None
+        expected = required_fields(contract_type) if early_stop else set()
+        if cached_text is None and expected:
+            found, texts, stop_after = set(), [], None
+            for index, text in document.iter_pages():
+                texts.append(text)
+                if stop_after is None:
+                    found |= find_required_fields(contract_type, text)
+                    if found >= expected:
+                        stop_after = index + margin_pages
+                if stop_after is not None and index >= stop_after:
+                    break
+
+            if len(texts) < document.page_count:
+                return KeyPages(
+                    "\n\n".join(text for text in texts if text), len(texts), document.page_count
+                )
+
+        return KeyPages(self._extract_text(document), document.page_count, document.page_count)
+
+    def get_text(self, pdf_hash: str) -> Optional[str]:
+        """
+        Retourne le texte déjà extrait d'un PDF, sans relire le document.
+
+        Args:
+            pdf_hash: Empreinte SHA-256 du PDF
+
+        Returns:
+            Texte extrait, None s'il n'a jamais été extrait (ou sans session)
+        """
+        if self.db is None or not pdf_hash:
+            return None
+        pdf_text = self.db.get(PdfText, pdf_hash)
+        return pdf_text.text if pdf_text else None
+
+    @staticmethod
+    def _parse_pdf(document: ParsedPDF) -> Tuple[str, int]:
+        """Lit le texte des pages du document et retourne (texte, nombre de pages)."""
+        try:
+            full_text = document.text
 
             if not full_text.strip():
                 raise ValueError("Le PDF ne contient pas de texte extractible")
 
-            return full_text
+            return full_text, document.page_count
 
         except Exception as e:
             raise PDFServiceError(f"Erreur lors de l'extraction du PDF: {str(e)}") from e
@@ -51,9 +470,5 @@ class PDFService:
         Returns:
             True si le fichier est un PDF valide
         """
-        try:
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                # Vérifie qu'il y a au moins une page
-                return len(pdf.pages) > 0
-        except Exception:
-            return False
+        with PDFService.open(pdf_bytes) as document:
+            return document.is_valid
@@ -0,0 +1,121 @@
+"""
+Purge des contrats supprimés logiquement.
+
+ContractService.delete_contract masque immédiatement les contrats très analysés ;
+leurs comparaisons sont ensuite supprimées par lots, hors de la requête de
+l'utilisateur, puis les PDF qui ne sont plus référencés (blob_gc).
+
+Usage (tâche planifiée, ou PURGE_INTERVAL_MINUTES pour un thread de l'application) :
+    python -m src.services.purge_service [--batch-size 500]
+"""
+import argparse
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.config import PURGE_BATCH_SIZE
+from src.database.blob_gc import run_blob_gc_job
+from src.database.models import Comparison, Contract
+from src.services.archive_service import delete_archived_comparisons
+
+logger = logging.getLogger(__name__)
+
+
+def purge_deleted_contracts(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Supprime définitivement les contrats supprimés logiquement.
+
+    Les comparaisons sont supprimées par lots, une transaction par lot : les
+    écritures de l'application ne restent jamais bloquées longtemps. Les
+    comparaisons archivées de ces contrats sont supprimées ensuite.
+
+    Args:
+        db: Session de base de données
+        batch_size: Nombre de comparaisons supprimées par transaction
+
+    Returns:
+        Nombre de contrats purgés
+    """
+    comparisons = Comparison.__table__
+    contracts = Contract.__table__
+    contract_ids = list(
+        db.execute(select(contracts.c.id).where(contracts.c.deleted_at.isnot(None))).scalars()
+    )
+
+    for contract_id in contract_ids:
+        while True:
+            batch = (
+                select(comparisons.c.id)
+                .where(comparisons.c.contract_id == contract_id)
+                .limit(batch_size)
+            )
+            deleted = db.execute(
+                comparisons.delete().where(comparisons.c.id.in_(batch.scalar_subquery()))
+            ).rowcount
+            db.commit()
+            if not deleted:
+                break
+
+        db.execute(contracts.delete().where(contracts.c.id == contract_id))
+        db.commit()
+    delete_archived_comparisons(contract_ids)
+    return len(contract_ids)
+
+
+def run_purge_job(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Purge les contrats supprimés logiquement, dans sa propre session."""
+    from src.database.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        purged = purge_deleted_contracts(db, batch_size)
+        if purged:
+            logger.info("Purge terminée : %s contrat(s)", purged)
+    finally:
+        db.close()
+
+    # Les PDF des contrats purgés (et ceux d'imports interrompus) ne sont plus référencés
+    run_blob_gc_job()
+    return purged
+
+
+def start_purge_worker(interval_minutes: float) -> threading.Thread:
+    """
+    Lance la purge périodique dans un thread d'arrière-plan.
+
+    Args:
+        interval_minutes: Délai entre deux exécutions (la première a lieu au démarrage)
+
+    Returns:
+        Thread démarré (daemon)
+    """
+
+    def _loop():
+        while True:
+            try:
+                run_purge_job()
+            except Exception:
+                logger.exception("Échec de la purge des contrats supprimés")
+            time.sleep(interval_minutes * 60)
+
+    worker = threading.Thread(target=_loop, name="purge-worker", daemon=True)
+    worker.start()
+    return worker
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Purge des contrats supprimés de GardeTonOr")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print(f"{run_purge_job(args.batch_size)} contrat(s) purgé(s)")
+
+
+if __name__ == "__main__":
+    main()
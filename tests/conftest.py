@@ -1,20 +1,64 @@
 """Configuration des fixtures pytest."""
+import os
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 
+from src.database.database import create_db_engine
 from src.database.models import Base, Contract
+from src.database.blob_store import blob_store
+from src.services import archive_service
+
+
+@pytest.fixture(autouse=True)
+def isolated_blob_store(tmp_path, monkeypatch):
+    """Redirige le blob store vers un répertoire temporaire."""
+    monkeypatch.setattr(blob_store, "root", tmp_path / "blobs")
+    return blob_store
+
+
+@pytest.fixture(autouse=True)
+def isolated_archive(tmp_path, monkeypatch):
+    """Redirige la base d'archive par défaut vers un fichier temporaire."""
+    monkeypatch.setattr(
+        archive_service, "ARCHIVE_DATABASE_URL", f"sqlite:///{tmp_path / 'archive.db'}"
+    )
+    monkeypatch.setattr(archive_service, "_archive_engine", None)
+
+
+# Base de test alternative (ex. PostgreSQL dans un conteneur) ; SQLite temporaire sinon
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Ignore les tests marqués `sqlite` quand la base de test n'est pas SQLite."""
+    if not TEST_DATABASE_URL or make_url(TEST_DATABASE_URL).get_backend_name() == "sqlite":
+        return
+    skip = pytest.mark.skip(reason="Test spécifique à SQLite")
+    for item in items:
+        if "sqlite" in item.keywords:
+            item.add_marker(skip)
 
 
 @pytest.fixture
 def db_engine(tmp_path):
     """Crée un engine de base de données sur fichier temporaire pour les tests."""
+    if TEST_DATABASE_URL:
+        engine = create_db_engine(TEST_DATABASE_URL)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        yield engine
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+        return
+
     # Utiliser un fichier temporaire pour permettre le partage entre threads (AppTest)
     db_path = tmp_path / "test.db"
-    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    engine = create_db_engine(f"sqlite:///{db_path}")
     Base.metadata.create_all(bind=engine)
-    return engine
+    yield engine
 
 
 @pytest.fixture
@@ -219,3 +263,53 @@ def mock_openai_response_competitor():
         "prompt": "test prompt",
         "raw_response": '{"recommandation": "changer"}',
     }
+
+
+def build_text_pdf(pages):
+    """
+    Construit un PDF dont chaque page contient une ligne de texte par élément.
+
+    Args:
+        pages: Liste de pages, chaque page étant une liste de lignes (ASCII)
+
+    Returns:
+        Contenu du PDF en bytes
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for lines in pages:
+        commands = [b"BT /F1 11 Tf 14 TL 50 780 Td"]
+        commands += [b"(" + line.encode("latin-1") + b") Tj T*" for line in lines]
+        commands.append(b"ET")
+        stream = b"\n".join(commands)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return output
+
+
+@pytest.fixture
+def text_pdf():
+    """Fabrique de PDF textuels (une liste de lignes par page)."""
+    return build_text_pdf
@@ -120,11 +120,14 @@ class TestAddContractCoverage(unittest.TestCase):
 
         # Mock contract service
         mock_service = mock_contract_service_cls.return_value
-        mock_service.create_contract.side_effect = [MagicMock(id=1), MagicMock(id=2)]
+        mock_service.create_contracts_bulk.return_value = [1, 2]
 
         # Execute
         add_contract.show()
 
         # Verify
-        self.assertEqual(mock_service.create_contract.call_count, 2)
+        mock_service.create_contracts_bulk.assert_called_once()
+        specs = mock_service.create_contracts_bulk.call_args[0][0]
+        self.assertEqual([spec["contract_type"] for spec in specs], ["electricite", "gaz"])
+        mock_service.create_contract.assert_not_called()
         mock_st.success.assert_called_with("✅ Contrat(s) enregistré(s) avec succès !")
@@ -0,0 +1,157 @@
+"""Tests pour le service d'archivage."""
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import event, text
+
+from src.database.database import create_db_engine
+from src.database.models import Comparison, Contract, ExtractionLog
+from src.services.archive_service import ArchiveService, get_archive_engine
+from src.services.contract_service import ContractService, comparison_cursor
+from src.services.purge_service import purge_deleted_contracts
+
+
+@pytest.fixture
+def archive_engine(tmp_path):
+    """Engine d'une base d'archive vide."""
+    return create_db_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+
+
+def _add_comparisons(db_session, contract, count):
+    start = datetime(2025, 1, 1)
+    for index in range(count):
+        db_session.add(
+            Comparison(
+                contract_id=contract.id,
+                comparison_type="market_analysis",
+                gpt_prompt=f"prompt {index} " * 50,
+                gpt_response="{}",
+                analysis_summary=f"Analyse {index}",
+                annual_savings_eur=float(index),
+                created_at=start + timedelta(days=index),
+            )
+        )
+    db_session.commit()
+
+
+class TestArchiveService:
+    """Tests de la politique de rétention."""
+
+    def test_archive_comparisons_keeps_latest_per_contract(
+        self, db_session, archive_engine, sample_contract_telephone, sample_contract_pno
+    ):
+        """Test que seules les N comparaisons les plus récentes de chaque contrat restent."""
+        _add_comparisons(db_session, sample_contract_telephone, 5)
+        _add_comparisons(db_session, sample_contract_pno, 2)
+        service = ArchiveService(db_session, archive_engine)
+
+        assert service.archive_comparisons(keep_per_contract=2, batch_size=2) == 3
+        assert service.archive_comparisons(keep_per_contract=2) == 0
+
+        remaining = db_session.query(Comparison).filter_by(contract_id=sample_contract_telephone.id)
+        assert sorted(comp.analysis_summary for comp in remaining) == ["Analyse 3", "Analyse 4"]
+        assert (
+            db_session.query(Comparison).filter_by(contract_id=sample_contract_pno.id).count() == 2
+        )
+
+        archived = service.get_archived_comparisons()
+        assert [comp.analysis_summary for comp in archived] == [
+            "Analyse 2",
+            "Analyse 1",
+            "Analyse 0",
+        ]
+        assert archived[0].contract.provider == sample_contract_telephone.provider
+        assert archived[0].gpt_prompt == "prompt 2 " * 50
+        assert archived[0] not in db_session
+        assert service.get_archived_comparisons(sample_contract_pno.id) == []
+
+    def test_archived_comparisons_pagination(
+        self, db_session, archive_engine, sample_contract_telephone
+    ):
+        """Test de la lecture des archives par pages successives."""
+        _add_comparisons(db_session, sample_contract_telephone, 5)
+        service = ArchiveService(db_session, archive_engine)
+        service.archive_comparisons(keep_per_contract=0)
+
+        first = service.get_archived_comparisons(limit=3)
+        rest = service.get_archived_comparisons(limit=3, after=comparison_cursor(first[-1]))
+
+        assert [comp.analysis_summary for comp in first + rest] == [
+            f"Analyse {index}" for index in range(4, -1, -1)
+        ]
+
+    def test_archived_comparisons_of_deleted_contract_are_hidden(
+        self, db_session, archive_engine, sample_contract_telephone
+    ):
+        """Test que les archives d'un contrat supprimé ne sont pas retournées."""
+        _add_comparisons(db_session, sample_contract_telephone, 2)
+        service = ArchiveService(db_session, archive_engine)
+        service.archive_comparisons(keep_per_contract=0)
+
+        db_session.delete(db_session.get(Contract, sample_contract_telephone.id))
+        db_session.commit()
+
+        assert service.get_archived_comparisons() == []
+
+    def test_archive_extraction_logs(self, db_session, archive_engine):
+        """Test de l'archivage des logs d'extraction les plus anciens."""
+        for index in range(4):
+            db_session.add(
+                ExtractionLog(
+                    filename=f"contrat_{index}.pdf",
+                    contract_type="telephone",
+                    gpt_response="{}",
+                    extracted_data={},
+                    created_at=datetime(2025, 1, 1) + timedelta(days=index),
+                )
+            )
+        db_session.commit()
+
+        counts = ArchiveService(db_session, archive_engine).run(keep_per_contract=5, keep_logs=1)
+
+        assert counts == {"comparisons": 0, "extraction_logs": 3}
+        assert [log.filename for log in db_session.query(ExtractionLog)] == ["contrat_3.pdf"]
+        with archive_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM extraction_logs")).scalar() == 3
+
+    def test_archive_schema_follows_models(self, db_session, archive_engine):
+        """Test que les colonnes ajoutées depuis la création de l'archive sont créées."""
+        with archive_engine.begin() as conn:
+            conn.execute(text("CREATE TABLE comparisons (id INTEGER PRIMARY KEY)"))
+
+        ArchiveService(db_session, archive_engine)
+
+        with archive_engine.connect() as conn:
+            columns = {row[1] for row in conn.execute(text("PRAGMA table_info(comparisons)"))}
+        assert {"contract_id", "gpt_prompt", "annual_savings_eur"} <= columns
+
+    def test_archive_schema_checked_once_per_engine(self, db_session, archive_engine):
+        """Test que le schéma d'archive n'est vérifié qu'à la première instanciation."""
+        ArchiveService(db_session, archive_engine)
+        statements = []
+        event.listen(
+            archive_engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+
+        ArchiveService(db_session, archive_engine)
+
+        assert statements == []
+
+    @pytest.mark.parametrize("soft", [False, True])
+    def test_deleting_contract_deletes_its_archived_comparisons(
+        self, db_session, sample_contract_telephone, sample_contract_pno, soft
+    ):
+        """Test que la suppression définitive (directe ou par purge) nettoie l'archive."""
+        _add_comparisons(db_session, sample_contract_telephone, 2)
+        _add_comparisons(db_session, sample_contract_pno, 1)
+        ArchiveService(db_session).archive_comparisons(keep_per_contract=0)
+        service = ContractService(db_session, Mock(), Mock())
+
+        service.delete_contract(sample_contract_telephone.id, soft=soft)
+        if soft:
+            purge_deleted_contracts(db_session)
+
+        with get_archive_engine().connect() as conn:
+            contract_ids = conn.execute(text("SELECT contract_id FROM comparisons")).scalars()
+            assert list(contract_ids) == [sample_contract_pno.id]
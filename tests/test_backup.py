@@ -0,0 +1,160 @@
+"""Tests des sauvegardes à chaud."""
+import pytest
+from alembic.script import ScriptDirectory
+
+from src.database.backup import (
+    BACKUP_BLOBS_DIR,
+    create_snapshot,
+    list_snapshots,
+    read_manifest,
+    restore_snapshot,
+    sqlite_path,
+    verify_snapshot,
+)
+from src.database.blob_store import BlobStore
+from src.database.migrate import get_alembic_config, stamp
+from src.database.models import Comparison, Contract
+
+# API de sauvegarde en ligne propre à SQLite
+pytestmark = pytest.mark.sqlite
+
+HEAD = ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+@pytest.fixture
+def db_url(db_engine):
+    """URL de la base de test (fichier temporaire), à la dernière révision."""
+    url = db_engine.url.render_as_string(hide_password=False)
+    stamp(url)
+    return url
+
+
+@pytest.fixture
+def backup_dir(tmp_path):
+    """Répertoire des sauvegardes."""
+    return tmp_path / "backups"
+
+
+def _add_pdf(db_session, contract, content):
+    contract.pdf_content = content
+    db_session.commit()
+    return contract.pdf_hash
+
+
+class TestBackup:
+    """Tests de création, vérification et restauration des instantanés."""
+
+    def test_snapshot_while_session_open(
+        self, db_session, db_url, backup_dir, sample_contract_telephone, isolated_blob_store
+    ):
+        """Test d'un instantané pris pendant qu'une session de l'application est ouverte."""
+        pdf_hash = _add_pdf(db_session, sample_contract_telephone, b"%PDF contrat")
+        db_session.add(
+            Comparison(
+                contract_id=sample_contract_telephone.id,
+                comparison_type="competitor_quote",
+                competitor_pdf=b"%PDF concurrent",
+                gpt_response="{}",
+            )
+        )
+        db_session.commit()
+        db_session.query(Contract).all()  # Transaction de lecture en cours
+
+        snapshot = create_snapshot(db_url, backup_dir, source_blobs=isolated_blob_store)
+
+        manifest = read_manifest(snapshot)
+        assert pdf_hash in manifest["blobs"]
+        assert manifest["copied_blobs"] == 2
+        assert manifest["incremental"] is False
+        assert verify_snapshot(snapshot) == []
+
+    def test_incremental_copies_only_new_blobs(
+        self,
+        db_session,
+        db_url,
+        backup_dir,
+        sample_contract_telephone,
+        sample_contract_pno,
+        isolated_blob_store,
+    ):
+        """Test que le mode incrémental ne copie que les PDF apparus depuis le dernier instantané."""
+        first_hash = _add_pdf(db_session, sample_contract_telephone, b"%PDF un")
+        first = create_snapshot(db_url, backup_dir, source_blobs=isolated_blob_store)
+        second_hash = _add_pdf(db_session, sample_contract_pno, b"%PDF deux")
+
+        second = create_snapshot(
+            db_url, backup_dir, incremental=True, source_blobs=isolated_blob_store
+        )
+
+        manifest = read_manifest(second)
+        assert manifest["copied_blobs"] == 1
+        assert manifest["base_snapshot"] == first.name
+        assert set(manifest["blobs"]) == {first_hash, second_hash}
+        assert list_snapshots(backup_dir) == [first, second]
+        assert verify_snapshot(second) == []
+
+    def test_verify_detects_missing_and_corrupted_blobs(
+        self,
+        db_session,
+        db_url,
+        backup_dir,
+        sample_contract_telephone,
+        sample_contract_pno,
+        isolated_blob_store,
+    ):
+        """Test que la vérification signale les PDF absents ou altérés."""
+        corrupted = _add_pdf(db_session, sample_contract_telephone, b"%PDF un")
+        missing = _add_pdf(db_session, sample_contract_pno, b"%PDF deux")
+        snapshot = create_snapshot(db_url, backup_dir, source_blobs=isolated_blob_store)
+
+        backup_blobs = BlobStore(backup_dir / BACKUP_BLOBS_DIR)
+        backup_blobs.path_for(corrupted).write_bytes(b"altere")
+        backup_blobs.delete(missing)
+
+        assert sorted(verify_snapshot(snapshot)) == [
+            f"PDF absent: {missing}",
+            f"PDF corrompu: {corrupted}",
+        ]
+        with pytest.raises(ValueError):
+            restore_snapshot(snapshot, db_url, isolated_blob_store)
+
+    def test_blob_missing_at_creation_is_recorded_not_reported(
+        self, db_session, db_url, backup_dir, sample_contract_telephone, isolated_blob_store
+    ):
+        """Test qu'un PDF déjà absent à la création ne rend pas l'instantané invalide."""
+        pdf_hash = _add_pdf(db_session, sample_contract_telephone, b"%PDF perdu")
+        isolated_blob_store.delete(pdf_hash)
+
+        snapshot = create_snapshot(db_url, backup_dir, source_blobs=isolated_blob_store)
+
+        assert read_manifest(snapshot)["missing_blobs"] == [pdf_hash]
+        assert verify_snapshot(snapshot) == []
+
+    def test_verify_detects_outdated_revision(self, db_url, backup_dir):
+        """Test que la révision de l'instantané est comparée à celle des migrations."""
+        previous = (
+            ScriptDirectory.from_config(get_alembic_config()).get_revision(HEAD).down_revision
+        )
+        stamp(db_url, previous)
+        snapshot = create_snapshot(db_url, backup_dir)
+
+        assert verify_snapshot(snapshot) == [f"Révision {previous} au lieu de {HEAD}"]
+
+    def test_restore(self, db_session, db_url, backup_dir, sample_contract_telephone, tmp_path):
+        """Test de la restauration dans une nouvelle base et un blob store vide."""
+        pdf_hash = _add_pdf(db_session, sample_contract_telephone, b"%PDF contrat")
+        snapshot = create_snapshot(db_url, backup_dir)
+        target_blobs = BlobStore(tmp_path / "restored_blobs")
+        target_url = f"sqlite:///{tmp_path / 'restored.db'}"
+
+        restore_snapshot(snapshot, target_url, target_blobs)
+
+        assert target_blobs.get(pdf_hash) == b"%PDF contrat"
+        assert sqlite_path(target_url).exists()
+        restored = create_snapshot(target_url, tmp_path / "check", source_blobs=target_blobs)
+        assert read_manifest(restored)["blobs"] == read_manifest(snapshot)["blobs"]
+
+    def test_non_sqlite_url(self, backup_dir):
+        """Test qu'une base serveur est refusée (utiliser ses propres outils)."""
+        with pytest.raises(ValueError):
+            create_snapshot("postgresql://user@localhost/gardetonor", backup_dir)
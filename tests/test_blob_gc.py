@@ -0,0 +1,94 @@
+"""Tests de la suppression des PDF non référencés."""
+import os
+import time
+from datetime import datetime, timedelta
+
+from src.database.blob_gc import collect_garbage
+from src.database.database import create_db_engine
+from src.database.models import Comparison, Contract
+from src.services.archive_service import ArchiveService
+
+
+def _age(store, blob_hash, minutes):
+    timestamp = time.time() - minutes * 60
+    os.utime(store.path_for(blob_hash), (timestamp, timestamp))
+
+
+def _add_contract(db_session, pdf_bytes, **kwargs):
+    contract = Contract(
+        contract_type="telephone",
+        provider="Free",
+        start_date=datetime(2025, 1, 1),
+        anniversary_date=datetime(2026, 1, 1),
+        contract_data={},
+        **kwargs,
+    )
+    contract.pdf_content = pdf_bytes
+    db_session.add(contract)
+    db_session.commit()
+    return contract
+
+
+class TestBlobGarbageCollection:
+    """Tests de collect_garbage."""
+
+    def test_unreferenced_old_blobs_deleted(self, db_session, isolated_blob_store):
+        """Test que seuls les blobs anciens et non référencés sont supprimés."""
+        kept = _add_contract(db_session, b"%PDF garde").pdf_hash
+        deleted_later = _add_contract(db_session, b"%PDF supprime", deleted_at=datetime.now())
+        orphan, _ = isolated_blob_store.put(b"%PDF orphelin")
+        recent, _ = isolated_blob_store.put(b"%PDF import en cours")
+        for blob_hash in (kept, deleted_later.pdf_hash, orphan):
+            _age(isolated_blob_store, blob_hash, 120)
+
+        assert collect_garbage(db_session, dry_run=True) == [orphan]
+        assert isolated_blob_store.exists(orphan)
+
+        assert collect_garbage(db_session) == [orphan]
+        assert not isolated_blob_store.exists(orphan)
+        assert isolated_blob_store.exists(recent)
+        # Un contrat supprimé logiquement référence encore son PDF
+        assert isolated_blob_store.exists(deleted_later.pdf_hash)
+        assert isolated_blob_store.exists(kept)
+
+    def test_archived_comparisons_keep_their_pdf(
+        self, db_session, isolated_blob_store, sample_contract_telephone, tmp_path
+    ):
+        """Test qu'un devis concurrent d'une comparaison archivée est conservé."""
+        archive_engine = create_db_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+        comparison = Comparison(
+            contract_id=sample_contract_telephone.id,
+            comparison_type="competitor_quote",
+            gpt_prompt="p",
+            gpt_response="r",
+            created_at=datetime.now() - timedelta(days=1),
+        )
+        comparison.competitor_pdf = b"%PDF devis"
+        db_session.add(comparison)
+        db_session.commit()
+        quote_hash = comparison.competitor_pdf_hash
+        ArchiveService(db_session, archive_engine).archive_comparisons(keep_per_contract=0)
+        _age(isolated_blob_store, quote_hash, 120)
+
+        assert collect_garbage(db_session, archive_engine) == []
+        assert collect_garbage(db_session, dry_run=True) == [quote_hash]
+
+    def test_put_of_existing_blob_protects_it_until_commit(self, db_session, isolated_blob_store):
+        """Test qu'un PDF réimporté n'est pas supprimé entre son écriture et sa validation."""
+        old_hash, _ = isolated_blob_store.put(b"%PDF contrat supprime il y a longtemps")
+        _age(isolated_blob_store, old_hash, 120)
+
+        contract = Contract(
+            contract_type="telephone",
+            provider="Free",
+            start_date=datetime(2025, 1, 1),
+            anniversary_date=datetime(2026, 1, 1),
+            contract_data={},
+        )
+        contract.pdf_content = b"%PDF contrat supprime il y a longtemps"  # put()
+        assert collect_garbage(db_session) == []
+        db_session.add(contract)
+        db_session.commit()
+
+        assert contract.pdf_hash == old_hash
+        assert isolated_blob_store.exists(old_hash)
@@ -0,0 +1,91 @@
+"""Tests pour le stockage des PDF adressé par contenu."""
+from datetime import datetime
+
+from src.database.blob_store import BlobStore
+from src.database.models import Contract, Comparison
+
+
+class TestBlobStore:
+    """Tests pour le blob store."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test d'écriture puis de lecture d'un blob."""
+        store = BlobStore(tmp_path)
+
+        blob_hash, size = store.put(b"%PDF-1.4 contenu")
+
+        assert len(blob_hash) == 64
+        assert size == len(b"%PDF-1.4 contenu")
+        assert store.exists(blob_hash)
+        assert store.get(blob_hash) == b"%PDF-1.4 contenu"
+        assert store.path_for(blob_hash).parent.name == blob_hash[:2]
+
+    def test_put_is_deduplicated(self, tmp_path):
+        """Test qu'un même contenu n'est stocké qu'une fois."""
+        store = BlobStore(tmp_path)
+
+        first_hash, _ = store.put(b"same")
+        second_hash, _ = store.put(b"same")
+
+        assert first_hash == second_hash
+        assert len(list(tmp_path.rglob("*"))) == 2  # un sous-répertoire + un fichier
+
+    def test_get_missing(self, tmp_path):
+        """Test de lecture d'un blob absent."""
+        store = BlobStore(tmp_path)
+
+        assert store.get("0" * 64) is None
+        assert store.delete("0" * 64) is False
+
+    def test_delete(self, tmp_path):
+        """Test de suppression d'un blob."""
+        store = BlobStore(tmp_path)
+        blob_hash, _ = store.put(b"to delete")
+
+        assert store.delete(blob_hash) is True
+        assert not store.exists(blob_hash)
+
+
+class TestModelBlobProperties:
+    """Tests des propriétés PDF des modèles."""
+
+    def test_contract_pdf_content(self, db_session, isolated_blob_store):
+        """Test que le PDF du contrat est stocké hors de la base."""
+        contract = Contract(
+            contract_type="telephone",
+            provider="Free Mobile",
+            start_date=datetime(2024, 1, 15),
+            anniversary_date=datetime(2025, 1, 15),
+            contract_data={},
+            pdf_content=b"%PDF contrat",
+        )
+        db_session.add(contract)
+        db_session.commit()
+
+        assert contract.pdf_hash == BlobStore.compute_hash(b"%PDF contrat")
+        assert contract.pdf_size == len(b"%PDF contrat")
+        assert isolated_blob_store.exists(contract.pdf_hash)
+        assert contract.pdf_content == b"%PDF contrat"
+
+    def test_contract_without_pdf(self, sample_contract_telephone):
+        """Test d'un contrat sans PDF."""
+        assert sample_contract_telephone.pdf_hash is None
+        assert sample_contract_telephone.pdf_content is None
+
+    def test_comparison_competitor_pdf(self, db_session, sample_contract_telephone):
+        """Test que le PDF concurrent est stocké hors de la base."""
+        comparison = Comparison(
+            contract_id=sample_contract_telephone.id,
+            comparison_type="competitor_quote",
+            competitor_pdf=b"%PDF concurrent",
+            gpt_prompt="p",
+            gpt_response="r",
+        )
+        db_session.add(comparison)
+        db_session.commit()
+
+        assert comparison.competitor_pdf_size == len(b"%PDF concurrent")
+        assert comparison.competitor_pdf == b"%PDF concurrent"
+
+        comparison.competitor_pdf = None
+        assert comparison.competitor_pdf_hash is None
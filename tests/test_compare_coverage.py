@@ -19,7 +19,7 @@ class TestCompareCoverage(unittest.TestCase):
     ):
         # Setup mocks
         mock_contract_service = mock_contract_service_cls.return_value
-        mock_contract_service.get_all_contracts.return_value = []
+        mock_contract_service.get_contract_summaries.return_value = []
 
         # Mock button click
         mock_st.button.return_value = True
@@ -52,7 +52,7 @@ class TestCompareCoverage(unittest.TestCase):
         contract.id = 1
         contract.contract_type = "telephone"
         contract.provider = "Orange"
-        mock_contract_service.get_all_contracts.return_value = [contract]
+        mock_contract_service.get_contract_summaries.return_value = [contract]
 
         # Setup session state with invalid ID
         mock_st.session_state = {"compare_contract_id": 999}
@@ -41,7 +41,7 @@ class TestCompareIntegration(unittest.TestCase):
             "data_go": 50,
             "prix_mensuel": 20,
         }
-        mock_contract_service.get_all_contracts.return_value = [contract]
+        mock_contract_service.get_contract_summaries.return_value = [contract]
 
         # Mock comparison
         comparison = MagicMock()
@@ -100,7 +100,7 @@ class TestCompareIntegration(unittest.TestCase):
         contract.contract_type = "assurance_pno"
         contract.provider = "AXA"
         contract.contract_data = {"assureur": "AXA", "prime_annuelle": 200, "franchise": 150}
-        mock_contract_service.get_all_contracts.return_value = [contract]
+        mock_contract_service.get_contract_summaries.return_value = [contract]
 
         comparison = MagicMock()
         comparison.contract = contract
@@ -154,7 +154,7 @@ class TestCompareIntegration(unittest.TestCase):
         contract.contract_type = "assurance_habitation"
         contract.provider = "AXA"
         contract.contract_data = {"assureur": "AXA", "prime_annuelle": 300, "franchise": 200}
-        mock_contract_service.get_all_contracts.return_value = [contract]
+        mock_contract_service.get_contract_summaries.return_value = [contract]
 
         comparison = MagicMock()
         comparison.contract = contract
@@ -1,10 +1,22 @@
 """Tests pour le service de gestion des contrats."""
 import pytest
-from unittest.mock import Mock
-from datetime import datetime, timedelta
-
-from src.services.contract_service import ContractService
-from src.database.models import Contract
+from unittest.mock import Mock, patch
+from datetime import date, datetime, timedelta
+
+from src.services.contract_service import (
+    ContractService,
+    comparison_cursor,
+    compute_annual_savings,
+    compute_contract_costs,
+    contract_cursor,
+    extract_contract_identifiers,
+)
+from src.database import search_index
+from src.database.blob_store import BlobStore
+from src.database.models import Contract, Comparison, ExtractionLog, PdfText
+from src.services.openai_service import OpenAIService
+from src.services.pdf_service import KeyPages, PDFService
+from src.services.purge_service import purge_deleted_contracts
 
 
 class TestContractService:
@@ -96,9 +108,7 @@ class TestContractService:
         mock_openai = Mock()
         mock_openai.extract_contract_data.return_value = mock_openai_response_extraction
 
-        mock_pdf = Mock()
-        mock_pdf.validate_pdf.return_value = True
-        mock_pdf.extract_text_from_pdf.return_value = "test pdf text"
+        mock_pdf = _mock_pdf_service("test pdf text", b"fake pdf")
 
         service = ContractService(db_session, mock_openai, mock_pdf)
 
@@ -108,16 +118,16 @@ class TestContractService:
 
         assert extracted_data["fournisseur"] == "Free Mobile"
         assert pdf_text == "test pdf text"
-        mock_pdf.validate_pdf.assert_called_once()
-        mock_pdf.extract_text_from_pdf.assert_called_once()
+        mock_pdf.open.assert_called_once_with(b"fake pdf")
+        mock_pdf.read_key_pages.assert_called_once_with(mock_pdf.open.return_value, "telephone")
+        mock_pdf.open.return_value.close.assert_called_once()
         mock_openai.extract_contract_data.assert_called_once()
 
     def test_extract_and_create_contract_invalid_pdf(self, db_session):
         """Test d'extraction avec un PDF invalide."""
         mock_openai = Mock()
 
-        mock_pdf = Mock()
-        mock_pdf.validate_pdf.return_value = False
+        mock_pdf = _mock_pdf_service("", b"fake pdf", is_valid=False)
 
         service = ContractService(db_session, mock_openai, mock_pdf)
 
@@ -224,6 +234,42 @@ class TestContractService:
         deleted_contract = service.get_contract_by_id(contract_id)
         assert deleted_contract is None
 
+    def test_delete_contract_cascades_in_database(self, db_session, sample_contract_telephone):
+        """Test que les comparaisons sont supprimées par la base, sans être chargées."""
+        _add_comparisons(db_session, sample_contract_telephone, 3)
+        db_session.expire_all()
+        service = ContractService(db_session, Mock(), Mock())
+
+        assert service.delete_contract(sample_contract_telephone.id, soft=False) is True
+
+        assert "comparisons" not in sample_contract_telephone.__dict__
+        assert db_session.query(Comparison).execution_options(include_deleted=True).count() == 0
+
+    def test_soft_delete_hides_contract_until_purge(
+        self, db_session, sample_contract_telephone, sample_contract_pno
+    ):
+        """Test de la suppression logique puis de la purge par lots."""
+        _add_comparisons(db_session, sample_contract_telephone, 5)
+        _add_comparisons(db_session, sample_contract_pno, 1)
+        service = ContractService(db_session, Mock(), Mock())
+
+        with patch("src.services.contract_service.SOFT_DELETE_MIN_COMPARISONS", 5):
+            assert service.delete_contract(sample_contract_pno.id) is True
+            assert service.delete_contract(sample_contract_telephone.id) is True
+
+        # Le contrat peu analysé est supprimé tout de suite, l'autre seulement masqué
+        all_rows = db_session.query(Contract).execution_options(include_deleted=True)
+        assert [contract.id for contract in all_rows] == [sample_contract_telephone.id]
+        assert service.get_contract_by_id(sample_contract_telephone.id) is None
+        assert service.get_all_contracts() == []
+        assert service.get_all_comparisons() == []
+        assert service.get_comparison_stats()["total"] == 0
+
+        assert purge_deleted_contracts(db_session, batch_size=2) == 1
+        assert all_rows.count() == 0
+        assert db_session.query(Comparison).execution_options(include_deleted=True).count() == 0
+        assert purge_deleted_contracts(db_session) == 0
+
     def test_delete_nonexistent_contract(self, db_session):
         """Test de suppression d'un contrat inexistant."""
         mock_openai = Mock()
@@ -294,3 +340,621 @@ class TestContractService:
 
         assert any(c.provider == "Simu" for c in simulations)
         assert not any(c.provider == "Real" for c in simulations)
+
+    def test_keyset_pagination(self, db_session):
+        """Test que les pages se suivent sans doublon, y compris à dates égales."""
+        service = ContractService(db_session, Mock(), Mock())
+        anniversary = datetime(2026, 3, 1)
+        ids = service.create_contracts_bulk(
+            [
+                {
+                    "contract_type": "telephone",
+                    "provider": f"Opérateur {index}",
+                    "start_date": anniversary - timedelta(days=365),
+                    "anniversary_date": anniversary + timedelta(days=index // 2),
+                    "contract_data": {},
+                }
+                for index in range(5)
+            ]
+        )
+        for contract_id in ids:
+            db_session.add(
+                Comparison(
+                    contract_id=contract_id,
+                    comparison_type="market_analysis",
+                    gpt_response="{}",
+                    created_at=anniversary,
+                )
+            )
+        db_session.commit()
+
+        pages, cursor = [], None
+        while True:
+            page = service.get_all_contracts(limit=2, after=cursor)
+            if not page:
+                break
+            pages.append([contract.id for contract in page])
+            cursor = contract_cursor(page[-1])
+        assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+        first = service.get_all_comparisons(limit=3)
+        rest = service.get_all_comparisons(limit=3, after=comparison_cursor(first[-1]))
+        assert [comp.id for comp in first + rest] == [
+            comp.id for comp in service.get_all_comparisons()
+        ]
+        assert len(rest) == 2
+
+        filtered = service.get_all_comparisons(limit=10, provider="Opérateur 3")
+        assert [comp.contract_id for comp in filtered] == [ids[3]]
+
+    def test_get_contract_summaries(
+        self, db_session, sample_contract_telephone, sample_contract_pno
+    ):
+        """Test de la vue allégée des contrats."""
+        service = ContractService(db_session, Mock(), Mock())
+
+        summaries = service.get_contract_summaries()
+
+        assert [s.provider for s in summaries] == ["Free Mobile", "AXA"]
+        telephone = summaries[0]
+        assert telephone.id == sample_contract_telephone.id
+        assert telephone.contract_type == "telephone"
+        assert telephone.anniversary_date == datetime(2025, 1, 15)
+
+    def test_create_contract_computes_costs(self, db_session, sample_contract_data_pno):
+        """Test du calcul des coûts normalisés à la création."""
+        service = ContractService(db_session, Mock(), Mock())
+
+        contract = service.create_contract(
+            contract_type="assurance_pno",
+            provider="AXA",
+            start_date=datetime(2024, 3, 1),
+            anniversary_date=datetime(2025, 3, 1),
+            contract_data=sample_contract_data_pno,
+            pdf_bytes=None,
+            filename="axa.pdf",
+        )
+
+        assert contract.monthly_cost_eur == 29.17
+        assert contract.annual_cost_eur == 350
+
+    def test_create_contracts_bulk(self, db_session, isolated_blob_store):
+        """Test de la création groupée : IDs dans l'ordre, colonnes calculées et index."""
+        service = ContractService(db_session, Mock(), Mock())
+        specs = [
+            {
+                "contract_type": "electricite",
+                "provider": "TotalEnergies",
+                "start_date": datetime(2025, 12, 6),
+                "anniversary_date": datetime(2026, 12, 6),
+                "contract_data": {"pdl": " 22477713358214 ", "estimation_facture_annuelle": 1639},
+                "pdf_bytes": b"%PDF-1.4 total",
+                "filename": "total.pdf",
+                "pdf_text": "Offre Heures Eco",
+            },
+            {
+                "contract_type": "gaz",
+                "provider": "TotalEnergies",
+                "start_date": datetime(2025, 12, 6),
+                "anniversary_date": datetime(2026, 12, 6),
+                "contract_data": {"pce": "22477858076069", "estimation_facture_annuelle": 2464},
+                "is_simulation": True,
+            },
+        ]
+
+        ids = service.create_contracts_bulk(specs)
+
+        elec, gaz = (db_session.get(Contract, contract_id) for contract_id in ids)
+        assert (elec.contract_type, gaz.contract_type) == ("electricite", "gaz")
+        assert elec.pdl == "22477713358214"
+        assert elec.annual_cost_eur == 1639
+        assert elec.pdf_content == b"%PDF-1.4 total"
+        assert (elec.validated, elec.is_simulation, gaz.is_simulation) == (1, 0, 1)
+        assert gaz.pdf_hash is None
+        assert service.create_contracts_bulk([]) == []
+
+    @pytest.mark.sqlite
+    def test_create_contracts_bulk_indexes_search(self, db_session):
+        """Test de l'indexation plein texte des contrats créés en lot."""
+        service = ContractService(db_session, Mock(), Mock())
+        base = {
+            "start_date": datetime(2025, 12, 6),
+            "anniversary_date": datetime(2026, 12, 6),
+            "provider": "TotalEnergies",
+        }
+        elec_id, gaz_id = service.create_contracts_bulk(
+            [
+                dict(base, contract_type="electricite", contract_data={}, pdf_text="Heures Eco"),
+                dict(base, contract_type="gaz", contract_data={"pce": "22477858076069"}),
+            ]
+        )
+
+        assert [result.id for result in service.search("heures eco")] == [elec_id]
+        assert [result.id for result in service.search("22477858076069")] == [gaz_id]
+
+    def test_create_contracts_bulk_accepts_dates(self, db_session):
+        """Test de la création groupée avec des dates (st.date_input), sans services."""
+        service = ContractService(db_session)
+
+        (contract_id,) = service.create_contracts_bulk(
+            [
+                {
+                    "contract_type": "electricite",
+                    "provider": "TotalEnergies",
+                    "start_date": date(2025, 12, 6),
+                    "anniversary_date": date(2026, 12, 6),
+                    "end_date": date(2027, 12, 6),
+                    "contract_data": {},
+                }
+            ]
+        )
+
+        contract = db_session.get(Contract, contract_id)
+        assert contract.start_date == datetime(2025, 12, 6)
+        assert contract.anniversary_date == datetime(2026, 12, 6)
+        assert contract.end_date == datetime(2027, 12, 6)
+
+    def test_create_contracts_bulk_validates_before_writing(self, db_session):
+        """Test de la validation : aucune ligne insérée si une entrée est invalide."""
+        service = ContractService(db_session, Mock(), Mock())
+        valid = {
+            "contract_type": "telephone",
+            "provider": "Free",
+            "start_date": datetime(2024, 1, 1),
+            "anniversary_date": datetime(2025, 1, 1),
+            "contract_data": {},
+        }
+        invalid = dict(valid, contract_type="auto", start_date="01/01/2024", couleur="bleu")
+        del invalid["provider"]
+
+        with pytest.raises(ValueError) as error:
+            service.create_contracts_bulk([valid, invalid, "Free"])
+
+        message = str(error.value)
+        assert "Contrat n°1" not in message
+        assert "Contrat n°2: champ obligatoire manquant: provider" in message
+        assert "Contrat n°2: champ inconnu: couleur" in message
+        assert "Contrat n°2: type de contrat inconnu: auto" in message
+        assert "Contrat n°2: start_date doit être une date" in message
+        assert "Contrat n°3: doit être un dictionnaire" in message
+        assert db_session.query(Contract).count() == 0
+
+    def test_update_contract_recomputes_costs(self, db_session):
+        """Test du recalcul des coûts à la mise à jour."""
+        service = ContractService(db_session, Mock(), Mock())
+        contract = service.create_contract(
+            contract_type="telephone",
+            provider="Orange",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={"prix_mensuel": 10.0},
+            pdf_bytes=None,
+            filename="orange.pdf",
+        )
+        assert contract.annual_cost_eur == 120.0
+
+        service.update_contract(contract.id, {"contract_data": {"prix_mensuel": 20.0}})
+
+        assert contract.monthly_cost_eur == 20.0
+        assert contract.annual_cost_eur == 240.0
+
+    def test_find_by_identifier(self, db_session):
+        """Test de la recherche d'un contrat par ses identifiants indexés."""
+        service = ContractService(db_session, Mock(), Mock())
+        contract = service.create_contract(
+            contract_type="electricite",
+            provider="TotalEnergies",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={"pdl": "1234 5678 9012 34", "numero_contrat": "TE-42"},
+            pdf_bytes=None,
+            filename="total.pdf",
+        )
+
+        assert service.find_by_identifier("12345678901234", "pdl") == [contract]
+        assert service.find_by_identifier("te-42") == [contract]
+        assert service.find_by_identifier("TE-42", "pce") == []
+        assert service.find_by_identifier("  ") == []
+
+        service.update_contract(contract.id, {"contract_data": {"pdl": "99"}})
+        assert service.find_by_identifier("12345678901234") == []
+        assert service.find_by_identifier("99", "pdl") == [contract]
+
+    def test_find_by_identifier_unknown_type(self, db_session):
+        """Test d'un type d'identifiant inconnu."""
+        service = ContractService(db_session, Mock(), Mock())
+
+        with pytest.raises(ValueError, match="Type d'identifiant inconnu"):
+            service.find_by_identifier("123", "iban")
+
+    @pytest.mark.sqlite
+    def test_search(self, db_session):
+        """Test de la recherche plein texte avec classement et extrait."""
+        service = ContractService(db_session, Mock(), Mock())
+        engie = service.create_contract(
+            contract_type="gaz",
+            provider="Engie",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={"pce": "GI123", "zone_tarifaire": "Zone 2"},
+            pdf_bytes=None,
+            filename="engie.pdf",
+            pdf_text="Conditions générales : échéance principale au 1er janvier",
+        )
+        service.create_contract(
+            contract_type="telephone",
+            provider="Orange",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={"forfait_nom": "Forfait Engie partenaire"},
+            pdf_bytes=None,
+            filename="orange.pdf",
+        )
+
+        results = service.search("engie")
+        assert [result.provider for result in results] == ["Engie", "Orange"]
+        assert results[0].anniversary_date == datetime(2025, 1, 1)
+
+        results = service.search("echeance princ")
+        assert [result.id for result in results] == [engie.id]
+        assert "**échéance**" in results[0].snippet
+
+        assert service.search('gi123 "(:') == service.search("GI123")
+        assert service.search("  ?! ") == []
+
+    @pytest.mark.sqlite
+    def test_search_index_follows_updates_and_deletes(self, db_session):
+        """Test de la synchronisation de l'index avec les écritures."""
+        service = ContractService(db_session, Mock(), Mock())
+        contract = service.create_contract(
+            contract_type="telephone",
+            provider="Free",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={},
+            pdf_bytes=None,
+            filename="free.pdf",
+            pdf_text="Forfait illimité",
+        )
+
+        service.update_contract(contract.id, {"provider": "Bouygues"})
+        assert service.search("free") == []
+        assert [result.id for result in service.search("bouygues illimite")] == [contract.id]
+
+        service.delete_contract(contract.id)
+        assert service.search("bouygues") == []
+
+    def test_get_contract_text_reuses_extracted_text(self, db_session):
+        """Test que le texte extrait à l'import sert à la réextraction et à la recherche."""
+        pdf_service = PDFService(db_session)
+        service = ContractService(db_session, Mock(), pdf_service)
+
+        with patch.object(PDFService, "_parse_pdf", return_value=("Echéance principale", 2)):
+            pdf_service.extract_text_from_pdf(b"%PDF habitation")
+        contract = service.create_contract(
+            contract_type="assurance_habitation",
+            provider="Direct Assurance",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={},
+            pdf_bytes=b"%PDF habitation",
+            filename="habitation.pdf",
+        )
+
+        with patch.object(PDFService, "_parse_pdf") as parse:
+            assert service.get_contract_text(contract.id) == "Echéance principale"
+        parse.assert_not_called()
+        if search_index.is_search_available(db_session):
+            assert [result.id for result in service.search("echeance")] == [contract.id]
+        assert service.get_contract_text(999) is None
+
+    def test_get_contract_text_extracts_when_missing(self, db_session):
+        """Test de l'extraction à la demande d'un PDF jamais extrait."""
+        service = ContractService(db_session, Mock(), PDFService(db_session))
+        contract = service.create_contract(
+            contract_type="telephone",
+            provider="Free",
+            start_date=datetime(2024, 1, 1),
+            anniversary_date=datetime(2025, 1, 1),
+            contract_data={},
+            pdf_bytes=b"%PDF free",
+            filename="free.pdf",
+        )
+
+        with patch.object(PDFService, "_parse_pdf", return_value=("Forfait", 1)) as parse:
+            assert service.get_contract_text(contract.id) == "Forfait"
+            assert service.get_contract_text(contract.id) == "Forfait"
+        parse.assert_called_once()
+
+    @patch("src.services.openai_service.OpenAI")
+    def test_prompt_logged_as_template(self, mock_openai_class, db_session):
+        """Test que le prompt est journalisé par référence et reconstruit à la demande."""
+        openai_service = OpenAIService(api_key="test_key")
+        response = Mock()
+        response.choices = [Mock(message=Mock(content='{"fournisseur": "EDF"}'))]
+        mock_openai_class.return_value.chat.completions.create.return_value = response
+        mock_pdf = _mock_pdf_service("Contrat EDF, PDL 123", b"%PDF edf")
+        service = ContractService(db_session, openai_service, mock_pdf)
+
+        service.extract_and_create_contract(b"%PDF edf", "edf.pdf", "electricite")
+
+        log = db_session.query(ExtractionLog).one()
+        assert log.gpt_prompt is None
+        assert (log.prompt_template, log.prompt_template_version) == ("extraction", 2)
+        assert log.prompt_params == {
+            "contract_type": "electricite",
+            "pdf_hash": BlobStore.compute_hash(b"%PDF edf"),
+            "token_budget": openai_service.extraction_token_budget,
+        }
+        expected = openai_service._build_extraction_prompt("electricite", "Contrat EDF, PDL 123")
+        assert service.get_prompt(log) == expected
+
+    @patch("src.services.openai_service.OpenAI")
+    def test_partial_text_kept_in_prompt_params(self, mock_openai_class, db_session):
+        """Test qu'un texte lu partiellement est conservé sous sa propre empreinte."""
+        openai_service = OpenAIService(api_key="test_key")
+        response = Mock()
+        response.choices = [Mock(message=Mock(content='{"fournisseur": "EDF"}'))]
+        mock_openai_class.return_value.chat.completions.create.return_value = response
+        mock_pdf = _mock_pdf_service("Contrat EDF, PDL 123", b"%PDF edf")
+        mock_pdf.read_key_pages.return_value = KeyPages("Contrat EDF, PDL 123", 2, 30)
+        service = ContractService(db_session, openai_service, mock_pdf)
+
+        service.extract_and_create_contract(b"%PDF edf", "edf.pdf", "electricite")
+
+        log = db_session.query(ExtractionLog).one()
+        text_hash = BlobStore.compute_hash("Contrat EDF, PDL 123".encode("utf-8"))
+        assert log.prompt_params == {
+            "contract_type": "electricite",
+            "pdf_hash": text_hash,
+            "token_budget": openai_service.extraction_token_budget,
+        }
+        # Le texte partiel n'est pas enregistré comme texte du PDF
+        assert db_session.get(PdfText, BlobStore.compute_hash(b"%PDF edf")) is None
+        assert db_session.get(PdfText, text_hash).page_count == 2
+        expected = openai_service._build_extraction_prompt("electricite", "Contrat EDF, PDL 123")
+        assert service.get_prompt(log) == expected
+
+    def test_prompt_kept_in_debug_mode(self, db_session, mock_openai_response_extraction):
+        """Test que le prompt complet est conservé en mode debug."""
+        mock_openai = Mock()
+        mock_openai.extract_contract_data.return_value = dict(
+            mock_openai_response_extraction,
+            prompt_template={"id": "extraction", "version": 1, "params": {"pdf_text": "t"}},
+        )
+        mock_pdf = _mock_pdf_service("t", b"%PDF")
+        service = ContractService(db_session, mock_openai, mock_pdf)
+
+        with patch("src.services.contract_service.PROMPT_DEBUG", True):
+            service.extract_and_create_contract(b"%PDF", "f.pdf", "telephone")
+
+        log = db_session.query(ExtractionLog).one()
+        assert service.get_prompt(log) == "test prompt"
+        mock_openai.render_prompt.assert_not_called()
+
+    def test_get_prompt_without_stored_text(self, db_session):
+        """Test de reconstruction quand le texte du PDF a disparu."""
+        service = ContractService(db_session, Mock(), Mock())
+        log = ExtractionLog(
+            prompt_template="extraction",
+            prompt_template_version=1,
+            prompt_params={"contract_type": "gaz", "pdf_hash": "absent"},
+        )
+
+        with pytest.raises(ValueError, match="Texte du PDF introuvable"):
+            service.get_prompt(log)
+        assert service.get_prompt(ExtractionLog()) is None
+
+    def test_get_contract_summaries_sorted_by_cost_and_totals(self, db_session):
+        """Test du tri par coût et des totaux calculés en SQL."""
+        service = ContractService(db_session, Mock(), Mock())
+        for provider, contract_type, data, is_simulation in [
+            ("Free", "telephone", {"prix_mensuel": 10.0}, False),
+            ("Direct", "assurance_habitation", {"tarifs": {"prime_annuelle_ttc": 600.0}}, False),
+            ("EDF", "electricite", {}, False),
+            ("Simu", "telephone", {"prix_mensuel": 99.0}, True),
+        ]:
+            service.create_contract(
+                contract_type=contract_type,
+                provider=provider,
+                start_date=datetime(2024, 1, 1),
+                anniversary_date=datetime(2025, 1, 1),
+                contract_data=data,
+                pdf_bytes=None,
+                filename=f"{provider}.pdf",
+                is_simulation=is_simulation,
+            )
+
+        summaries = service.get_contract_summaries(sort_by_cost=True)
+
+        assert [s.provider for s in summaries] == ["Direct", "Free", "EDF"]
+        assert summaries[0].monthly_cost_eur == 50.0
+        assert summaries[2].annual_cost_eur is None
+        assert service.get_cost_totals() == (60.0, 720.0)
+        assert service.get_contract_summaries(is_simulation=True)[0].provider == "Simu"
+
+    def test_comparisons_store_annual_savings(
+        self,
+        db_session,
+        sample_contract_telephone,
+        mock_openai_response_market,
+        mock_openai_response_extraction,
+        mock_openai_response_competitor,
+    ):
+        """Test de l'enregistrement de l'économie annuelle des comparaisons."""
+        mock_openai = Mock()
+        mock_openai.compare_with_market.return_value = mock_openai_response_market
+        mock_openai.extract_contract_data.return_value = mock_openai_response_extraction
+        mock_openai.compare_with_competitor.return_value = mock_openai_response_competitor
+        mock_pdf = Mock()
+        mock_pdf.extract_text_from_pdf.return_value = "competitor text"
+        service = ContractService(db_session, mock_openai, mock_pdf)
+
+        market = service.compare_with_market(sample_contract_telephone.id)
+        competitor = service.compare_with_competitor(
+            sample_contract_telephone.id, b"competitor pdf", "competitor.pdf"
+        )
+
+        assert market.annual_savings_eur == 48.0
+        assert competitor.annual_savings_eur == 48.0
+
+    def test_comparison_aggregates(
+        self, db_session, sample_contract_telephone, sample_contract_pno
+    ):
+        """Test des statistiques et agrégations de comparaisons calculées en SQL."""
+        for contract, comparison_type, savings in [
+            (sample_contract_telephone, "market_analysis", 48.0),
+            (sample_contract_telephone, "competitor_quote", -12.0),
+            (sample_contract_pno, "market_analysis", 100.0),
+            (sample_contract_pno, "market_analysis", None),
+        ]:
+            db_session.add(
+                Comparison(
+                    contract_id=contract.id,
+                    comparison_type=comparison_type,
+                    gpt_prompt="p",
+                    gpt_response="r",
+                    annual_savings_eur=savings,
+                )
+            )
+        db_session.commit()
+        service = ContractService(db_session, Mock(), Mock())
+
+        stats = service.get_comparison_stats()
+
+        assert stats["total"] == 4
+        assert stats["by_type"] == {"market_analysis": 3, "competitor_quote": 1}
+        assert stats["total_savings"] == 136.0
+        assert dict(service.get_savings_by_contract()) == {"Free Mobile": 36.0, "AXA": 100.0}
+        assert service.get_savings_by_contract(
+            comparison_type="market_analysis", provider="AXA"
+        ) == [("AXA", 100.0)]
+        assert [row[1:] for row in service.get_savings_timeline()] == [
+            ("Free Mobile", 48.0),
+            ("Free Mobile", -12.0),
+            ("AXA", 100.0),
+        ]
+
+    def test_get_daily_savings(self, db_session, sample_contract_telephone, sample_contract_pno):
+        """Test de l'agrégat quotidien des économies, avec les filtres de l'historique."""
+        for contract, comparison_type, savings, created_at in [
+            (sample_contract_telephone, "market_analysis", 48.0, datetime(2025, 3, 1, 9)),
+            (sample_contract_telephone, "market_analysis", -12.0, datetime(2025, 3, 1, 18)),
+            (sample_contract_telephone, "competitor_quote", None, datetime(2025, 3, 2)),
+            (sample_contract_pno, "market_analysis", 100.0, datetime(2025, 3, 2)),
+        ]:
+            db_session.add(
+                Comparison(
+                    contract_id=contract.id,
+                    comparison_type=comparison_type,
+                    gpt_prompt="p",
+                    gpt_response="r",
+                    annual_savings_eur=savings,
+                    created_at=created_at,
+                )
+            )
+        db_session.commit()
+        service = ContractService(db_session, Mock(), Mock())
+
+        rows = [(str(day), *rest) for day, *rest in service.get_daily_savings()]
+
+        assert rows == [
+            ("2025-03-01", "Free Mobile", "market_analysis", 36.0, 2),
+            ("2025-03-02", "AXA", "market_analysis", 100.0, 1),
+            ("2025-03-02", "Free Mobile", "competitor_quote", 0.0, 1),
+        ]
+        assert [
+            row[1:]
+            for row in service.get_daily_savings(
+                comparison_type="market_analysis", provider="Free Mobile"
+            )
+        ] == [("Free Mobile", "market_analysis", 36.0, 2)]
+
+
+class TestComputeAnnualSavings:
+    """Tests du calcul de l'économie annuelle."""
+
+    def test_supported_shapes(self):
+        """Test des différents formats de réponse des analyses."""
+        assert compute_annual_savings({"economie_potentielle_annuelle": 120}) == 120.0
+        assert compute_annual_savings({"economie_potentielle_mensuelle": 5}) == 60.0
+        assert compute_annual_savings({"analyse": {"economie_potentielle_annuelle": 30}}) == 30.0
+        assert compute_annual_savings({"analyse": {"economie_potentielle_mensuelle": 2}}) == 24.0
+        assert compute_annual_savings({"comparaison_prix": {"economie_potentielle": -15}}) == -15.0
+
+    def test_missing_savings(self):
+        """Test sans économie exploitable."""
+        assert compute_annual_savings(None) == 0.0
+        assert (
+            compute_annual_savings({"analyse": "texte", "economie_potentielle_mensuelle": None})
+            == 0.0
+        )
+
+
+class TestComputeContractCosts:
+    """Tests du calcul des coûts normalisés."""
+
+    def test_energy_prefers_annual_estimate(self):
+        """Test qu'un contrat d'énergie utilise l'estimation annuelle."""
+        data = {"estimation_facture_annuelle": 1200.0, "prix_abonnement_mensuel": 15.0}
+
+        assert compute_contract_costs("electricite", data) == (100.0, 1200.0)
+
+    def test_energy_falls_back_to_subscription(self):
+        """Test du repli sur l'abonnement mensuel."""
+        assert compute_contract_costs("gaz", {"prix_abonnement_mensuel": 15.0}) == (15.0, 180.0)
+
+    def test_unknown_values(self):
+        """Test avec des montants absents ou invalides."""
+        assert compute_contract_costs("telephone", {"prix_mensuel": "n/c"}) == (None, None)
+        assert compute_contract_costs("assurance_pno", {}) == (None, None)
+        assert compute_contract_costs("autre", {"prix_mensuel": 10}) == (None, None)
+
+
+class TestExtractContractIdentifiers:
+    """Tests de l'extraction des identifiants de contract_data."""
+
+    def test_extraction_shape(self):
+        """Test des identifiants imbriqués tels que retournés par l'extraction."""
+        data = {
+            "numero_contrat": "abc 123",
+            "client": {"reference_client": "C-001"},
+            "electricite": {"pdl": "1234 5678"},
+            "gaz": {"pce": "GI000"},
+        }
+
+        assert extract_contract_identifiers(data) == {
+            "pdl": "12345678",
+            "pce": "GI000",
+            "contract_number": "ABC123",
+            "client_reference": "C-001",
+        }
+
+    def test_missing_identifiers(self):
+        """Test sans identifiant exploitable."""
+        assert set(extract_contract_identifiers({"electricite": "n/c", "pdl": ""}).values()) == {
+            None
+        }
+
+
+def _add_comparisons(db_session, contract, count):
+    for index in range(count):
+        db_session.add(
+            Comparison(
+                contract_id=contract.id,
+                comparison_type="market_analysis",
+                gpt_response="{}",
+                analysis_summary=f"Analyse {index}",
+            )
+        )
+    db_session.commit()
+
+
+def _mock_pdf_service(text, pdf_bytes, is_valid=True):
+    mock_pdf = Mock()
+    mock_pdf.open.return_value = Mock(
+        is_valid=is_valid, fingerprint=BlobStore.compute_hash(pdf_bytes)
+    )
+    mock_pdf.extract_text_from_pdf.return_value = text
+    mock_pdf.read_key_pages.return_value = KeyPages(text, 1, 1)
+    return mock_pdf
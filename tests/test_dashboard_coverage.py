@@ -28,7 +28,9 @@ class TestDashboardCoverage:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -70,7 +72,9 @@ class TestDashboardCoverage:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
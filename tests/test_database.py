@@ -0,0 +1,173 @@
+"""Tests pour la configuration de l'engine et du schéma de base de données."""
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_mock_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.database.database import create_db_engine, engine_options, get_read_db
+from src.database.models import CONTRACT_DATA_GIN_INDEX, Base, Contract
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestCreateDbEngine:
+    """Tests des profils SQLite."""
+
+    def test_wal_profile(self, tmp_path):
+        """Test que le profil WAL applique les PRAGMA à la connexion."""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}", profile="wal")
+
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == 5000
+        assert _pragma(engine, "temp_store") == 2  # MEMORY
+        assert _pragma(engine, "cache_size") < 0
+
+    def test_default_profile(self, tmp_path):
+        """Test que le profil par défaut conserve les réglages SQLite."""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'default.db'}", profile="default")
+
+        assert _pragma(engine, "journal_mode") == "delete"
+        assert _pragma(engine, "synchronous") == 2  # FULL
+
+    @pytest.mark.parametrize("profile", ["wal", "default"])
+    def test_foreign_keys_enforced(self, tmp_path, profile):
+        """Test que les clés étrangères sont appliquées quel que soit le profil."""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'fk.db'}", profile=profile)
+
+        assert _pragma(engine, "foreign_keys") == 1
+
+    def test_unknown_profile(self, tmp_path):
+        """Test d'un profil inconnu."""
+        with pytest.raises(ValueError) as excinfo:
+            create_db_engine(f"sqlite:///{tmp_path / 'x.db'}", profile="turbo")
+
+        assert "Profil SQLite inconnu" in str(excinfo.value)
+
+
+class TestEngineOptions:
+    """Tests des options d'engine selon le dialecte."""
+
+    def test_sqlite_options(self):
+        """Test que SQLite partage la connexion entre threads sans réglage de pool."""
+        assert engine_options("sqlite:///./gardetonor.db") == {
+            "connect_args": {"check_same_thread": False}
+        }
+
+    def test_postgresql_options(self):
+        """Test du pool borné, vérifié et renouvelé pour PostgreSQL."""
+        options = engine_options("postgresql+psycopg2://user:secret@db:5432/gardetonor")
+
+        assert "connect_args" not in options
+        assert options == {
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+        }
+
+    def test_postgresql_engine_without_pragmas(self):
+        """Test que l'engine PostgreSQL reçoit les options de pool et aucun PRAGMA."""
+        url = "postgresql+psycopg2://user:secret@db:5432/gardetonor"
+        with patch("src.database.database.create_engine") as mock_create_engine, patch(
+            "src.database.database._apply_sqlite_pragmas"
+        ) as mock_pragmas:
+            mock_create_engine.return_value.dialect.name = "postgresql"
+            create_db_engine(url)
+
+        mock_create_engine.assert_called_once_with(url, echo=False, **engine_options(url))
+        mock_pragmas.assert_not_called()
+
+
+def _schema_ddl(url):
+    """DDL émis par create_all pour le dialecte de l'URL, sans connexion."""
+    statements = []
+    mock_engine = create_mock_engine(
+        url, lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=dialect)))
+    )
+    dialect = mock_engine.dialect
+    Base.metadata.create_all(mock_engine, checkfirst=False)
+    return statements
+
+
+class TestPostgreSQLSchema:
+    """Tests du schéma généré pour PostgreSQL."""
+
+    def test_json_columns_use_jsonb(self):
+        """Test que les colonnes JSON sont en JSONB sous PostgreSQL et JSON sous SQLite."""
+        ddl = "\n".join(_schema_ddl("postgresql://"))
+
+        assert "contract_data JSONB NOT NULL" in ddl
+        assert "extracted_data JSONB NOT NULL" in ddl
+        assert " JSON" not in ddl.replace("JSONB", "")
+        assert "contract_data JSON NOT NULL" in "\n".join(_schema_ddl("sqlite://"))
+
+    def test_contract_data_gin_index(self):
+        """Test que l'index GIN est créé sous PostgreSQL, l'index FTS5 sous SQLite."""
+        postgresql_ddl = "\n".join(_schema_ddl("postgresql://"))
+        sqlite_ddl = "\n".join(_schema_ddl("sqlite://"))
+
+        assert f"{CONTRACT_DATA_GIN_INDEX} ON contracts USING gin (contract_data)" in postgresql_ddl
+        assert CONTRACT_DATA_GIN_INDEX not in sqlite_ddl
+        assert "fts5" not in postgresql_ddl
+        assert "fts5" in sqlite_ddl
+
+
+@pytest.fixture
+def read_sessions(db_engine):
+    """Sessions de lecture liées à l'engine de test."""
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=db_engine)
+    with patch("src.database.database.ReadSessionLocal", factory):
+        yield
+
+
+class TestGetReadDb:
+    """Tests du context manager de lecture."""
+
+    def test_objects_readable_after_exit(self, db_session, read_sessions):
+        """Test que les objets chargés restent lisibles après la fermeture de la session."""
+        db_session.add(_contract("Free"))
+        db_session.commit()
+
+        with get_read_db() as db:
+            contract = db.query(Contract).one()
+
+        assert contract.provider == "Free"
+        assert contract.contract_data == {"forfait_nom": "Free 5G"}
+
+    def test_never_commits(self, db_session, read_sessions):
+        """Test qu'un ajout dans la session de lecture n'est pas enregistré."""
+        with get_read_db(query_only=False) as db:
+            db.add(_contract("Orange"))
+
+        assert db_session.query(Contract).count() == 0
+
+    @pytest.mark.sqlite
+    def test_query_only_rejects_writes(self, db_session, read_sessions):
+        """Test que la base refuse les écritures, puis que la connexion redevient inscriptible."""
+        with pytest.raises(OperationalError, match="readonly"):
+            with get_read_db() as db:
+                db.add(_contract("Orange"))
+                db.flush()
+
+        with get_read_db(query_only=False) as db:
+            assert db.execute(text("PRAGMA query_only")).scalar() == 0
+        db_session.add(_contract("Orange"))
+        db_session.commit()
+        assert db_session.query(Contract).count() == 1
+
+
+def _contract(provider):
+    return Contract(
+        contract_type="telephone",
+        provider=provider,
+        start_date=datetime(2024, 1, 1),
+        anniversary_date=datetime(2025, 1, 1),
+        contract_data={"forfait_nom": "Free 5G"},
+    )
@@ -0,0 +1,36 @@
+"""Tests du repérage local des champs clés."""
+from src.services.field_matchers import find_required_fields, required_fields
+
+
+class TestFieldMatchers:
+    """Tests des expressions par type de contrat."""
+
+    def test_electricite_fields(self):
+        """Test des champs d'un contrat d'électricité."""
+        text = (
+            "Point de livraison (PDL) : 14523678901234\n"
+            "Date de debut du contrat : 01/03/2024\n"
+            "Prix de l'abonnement : 12,44 EUR TTC/mois"
+        )
+
+        assert find_required_fields("electricite", text) == {"pdl", "prix", "date_debut"}
+        assert find_required_fields("electricite", "Conditions generales de vente") == set()
+
+    def test_assurance_fields(self):
+        """Test des champs d'un contrat d'assurance habitation."""
+        text = (
+            "Adresse du bien assure : 3 rue des Lilas, Lyon\n"
+            "Cotisation annuelle TTC : 356,20 €\n"
+            "Echeance principale : 1er janvier"
+        )
+
+        assert find_required_fields("assurance_habitation", text) == {
+            "prime",
+            "adresse",
+            "echeance",
+        }
+
+    def test_unknown_type_reads_everything(self):
+        """Test qu'un type sans champs clés (auto) impose une lecture complète."""
+        assert required_fields("auto") == set()
+        assert find_required_fields("auto", "Prix : 10 EUR") == set()
@@ -0,0 +1,64 @@
+"""Tests de l'extraction complète du texte des PDF en arrière-plan."""
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.blob_store import BlobStore
+from src.database.models import PdfText
+from src.services.contract_service import ContractService
+from src.services.indexing_service import complete_pdf_texts
+
+pytestmark = pytest.mark.sqlite
+
+
+def _create_contract(service, pdf_bytes):
+    return service.create_contract(
+        contract_type="electricite",
+        provider="TotalEnergies",
+        start_date=datetime(2025, 1, 1),
+        anniversary_date=datetime(2026, 1, 1),
+        contract_data={},
+        pdf_bytes=pdf_bytes,
+        filename="total.pdf",
+    )
+
+
+class TestIndexingService:
+    """Tests de complete_pdf_texts."""
+
+    def test_full_text_extracted_and_indexed(self, db_session, text_pdf):
+        """Test que le texte d'un PDF lu partiellement est complété puis indexé."""
+        pdf_bytes = text_pdf([["PDL 14523678901234"], ["Article 12 mediation"]])
+        service = ContractService(db_session, Mock(), Mock())
+        contract = _create_contract(service, pdf_bytes)
+        assert service.search("mediation") == []
+
+        assert complete_pdf_texts(db_session) == 1
+        assert complete_pdf_texts(db_session) == 0
+
+        stored = db_session.get(PdfText, BlobStore.compute_hash(pdf_bytes))
+        assert stored.text == "PDL 14523678901234\n\nArticle 12 mediation"
+        assert [result.id for result in service.search("mediation")] == [contract.id]
+
+    def test_unreadable_pdf_not_retried(self, db_session):
+        """Test qu'un PDF sans texte est marqué une fois pour toutes."""
+        service = ContractService(db_session, Mock(), Mock())
+        _create_contract(service, b"%PDF illisible")
+
+        assert complete_pdf_texts(db_session) == 1
+        assert complete_pdf_texts(db_session) == 0
+        assert db_session.get(PdfText, BlobStore.compute_hash(b"%PDF illisible")).text == ""
+
+    def test_rewritten_blob_not_retried(self, db_session, text_pdf, isolated_blob_store):
+        """Test qu'un blob dont le contenu ne correspond plus à l'empreinte est traité une fois."""
+        pdf_bytes = text_pdf([["PDL 14523678901234"]])
+        service = ContractService(db_session, Mock(), Mock())
+        contract = _create_contract(service, pdf_bytes)
+        isolated_blob_store.path_for(contract.pdf_hash).write_bytes(
+            text_pdf([["Contenu remplace"]])
+        )
+
+        assert complete_pdf_texts(db_session) == 1
+        assert db_session.get(PdfText, contract.pdf_hash).text == "Contenu remplace"
+        assert complete_pdf_texts(db_session) == 0
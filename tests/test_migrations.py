@@ -0,0 +1,233 @@
+"""Tests pour les migrations Alembic."""
+import ast
+import json
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from src.database import database
+from src.database.blob_store import BlobStore
+from src.database.migrate import get_alembic_config, main, upgrade, downgrade
+from src.database.migration_utils import include_name
+from src.database.models import Base
+from src.database.types import compress_text, decompress_text
+
+HEAD = ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """URL d'une base SQLite vide."""
+    return f"sqlite:///{tmp_path / 'migrations.db'}"
+
+
+def _revision(engine):
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def _legacy_database(db_url):
+    """Crée une base au schéma initial, sans suivi Alembic, comme le faisait create_all."""
+    upgrade(db_url, "0001")
+    engine = create_engine(db_url)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+        conn.execute(
+            text(
+                "INSERT INTO contracts (id, contract_type, provider, start_date, anniversary_date, "
+                "contract_data, pdf_content, is_simulation) "
+                "VALUES (:id, :type, 'Fournisseur', :now, :now, :data, :pdf, 0)"
+            ),
+            [
+                {
+                    "id": 1,
+                    "type": "telephone",
+                    "now": now,
+                    "data": json.dumps({"prix_mensuel": 10.0, "numero_contrat": "ab 12"}),
+                    "pdf": b"%PDF un",
+                },
+                {
+                    "id": 2,
+                    "type": "gaz",
+                    "now": now,
+                    "data": json.dumps({"estimation_facture_annuelle": 600.0, "pce": "GI 123 456"}),
+                    "pdf": b"%PDF deux",
+                },
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO comparisons (contract_id, comparison_type, competitor_pdf, "
+                "gpt_prompt, gpt_response, comparison_result) "
+                "VALUES (1, 'competitor_quote', :pdf, 'p', 'r', :result)"
+            ),
+            {
+                "pdf": b"%PDF concurrent",
+                "result": json.dumps({"comparaison_prix": {"economie_potentielle": 30}}),
+            },
+        )
+        conn.execute(
+            text(
+                "INSERT INTO extraction_logs (filename, contract_type, gpt_prompt, "
+                "gpt_response, extracted_data) VALUES ('f.pdf', 'gaz', :prompt, 'r', '{}')"
+            ),
+            {"prompt": "Schéma JSON " * 100},
+        )
+    return engine
+
+
+class TestMigrations:
+    """Tests de la chaîne de migrations."""
+
+    def test_fresh_database_matches_models(self, db_url):
+        """Test qu'une base migrée jusqu'à head correspond exactement aux modèles."""
+        main(["--url", db_url, "upgrade"])
+
+        engine = create_engine(db_url)
+        with engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={"include_name": include_name})
+            diff = compare_metadata(context, Base.metadata)
+        assert diff == []
+        assert _revision(engine) == HEAD
+
+    def test_upgrade_legacy_database(self, db_url, isolated_blob_store):
+        """Test de la migration d'une base existante non suivie par Alembic."""
+        engine = _legacy_database(db_url)
+
+        upgrade(db_url)
+
+        assert _revision(engine) == HEAD
+        columns = {column["name"] for column in inspect(engine).get_columns("contracts")}
+        assert "pdf_content" not in columns
+        with engine.connect() as conn:
+            contracts = conn.execute(
+                text(
+                    "SELECT pdf_hash, pdf_size, monthly_cost_eur, annual_cost_eur "
+                    "FROM contracts ORDER BY id"
+                )
+            ).all()
+            comparison = conn.execute(
+                text("SELECT competitor_pdf_hash, annual_savings_eur FROM comparisons")
+            ).one()
+
+        assert contracts[0] == (BlobStore.compute_hash(b"%PDF un"), 7, 10.0, 120.0)
+        assert contracts[1][2:] == (50.0, 600.0)
+        assert isolated_blob_store.get(contracts[1][0]) == b"%PDF deux"
+        assert isolated_blob_store.get(comparison[0]) == b"%PDF concurrent"
+        assert comparison[1] == 30.0
+        (foreign_key,) = inspect(engine).get_foreign_keys("comparisons")
+        assert foreign_key["options"]["ondelete"] == "CASCADE"
+
+        with engine.connect() as conn:
+            identifiers = conn.execute(
+                text("SELECT contract_number, pce FROM contracts ORDER BY id")
+            ).all()
+        assert identifiers == [("AB12", None), (None, "GI123456")]
+
+        with engine.connect() as conn:
+            prompt, response = conn.execute(
+                text("SELECT gpt_prompt, gpt_response FROM extraction_logs")
+            ).one()
+        assert len(prompt) < len("Schéma JSON " * 100)
+        assert decompress_text(prompt) == "Schéma JSON " * 100
+        assert decompress_text(response) == "r"
+
+        with engine.connect() as conn:
+            matches = conn.execute(
+                text("SELECT rowid FROM contracts_fts WHERE contracts_fts MATCH 'GI123456'")
+            ).scalars()
+            assert list(matches) == [2]
+
+    def test_upgrade_resumes_interrupted_backfill(self, db_url, isolated_blob_store):
+        """Test qu'une migration interrompue reprend sans retraiter les lignes faites."""
+        engine = _legacy_database(db_url)
+        with engine.begin() as conn:
+            # État laissé par un déplacement des PDF interrompu après la première ligne
+            conn.execute(text("ALTER TABLE contracts ADD COLUMN pdf_hash VARCHAR(64)"))
+            conn.execute(text("ALTER TABLE contracts ADD COLUMN pdf_size INTEGER"))
+            conn.execute(
+                text(
+                    "UPDATE contracts SET pdf_hash = 'deja-migre', pdf_size = 1, "
+                    "pdf_content = NULL WHERE id = 1"
+                )
+            )
+
+        upgrade(db_url)
+
+        with engine.connect() as conn:
+            hashes = conn.execute(text("SELECT pdf_hash FROM contracts ORDER BY id")).scalars()
+            assert list(hashes) == ["deja-migre", BlobStore.compute_hash(b"%PDF deux")]
+
+    def test_pdf_texts_converted_to_compressed_text(self, db_url):
+        """Test que le texte des PDF en zlib brut reçoit l'octet d'en-tête de CompressedText."""
+        upgrade(db_url, "0012")
+        engine = create_engine(db_url)
+        legacy = zlib.compress("Cotisation annuelle".encode("utf-8"))
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO pdf_texts (pdf_hash, text_compressed, text_size) "
+                    "VALUES ('a', :text, 19), ('b', :converted, 2)"
+                ),
+                {"text": legacy, "converted": compress_text("ok")},
+            )
+
+        upgrade(db_url)
+        with engine.connect() as conn:
+            stored = dict(
+                conn.execute(text("SELECT pdf_hash, text_compressed FROM pdf_texts")).all()
+            )
+        assert decompress_text(stored["a"]) == "Cotisation annuelle"
+        assert decompress_text(stored["b"]) == "ok"
+
+        downgrade(db_url, "0012")
+        with engine.connect() as conn:
+            stored = dict(
+                conn.execute(text("SELECT pdf_hash, text_compressed FROM pdf_texts")).all()
+            )
+        assert stored["a"] == legacy
+
+    def test_downgrade_to_base(self, db_url, isolated_blob_store):
+        """Test que toutes les révisions peuvent être annulées."""
+        engine = _legacy_database(db_url)
+        upgrade(db_url)
+
+        downgrade(db_url, "0001")
+        with engine.connect() as conn:
+            pdf = conn.execute(text("SELECT pdf_content FROM contracts WHERE id = 1")).scalar()
+            prompt = conn.execute(text("SELECT gpt_prompt FROM extraction_logs")).scalar()
+        assert pdf == b"%PDF un"
+        assert prompt == "Schéma JSON " * 100
+
+        downgrade(db_url, "base")
+        assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+
+    def test_init_database_stamps_new_database(self, db_url, monkeypatch):
+        """Test qu'une base créée par init_database() est marquée à la dernière révision."""
+        engine = create_engine(db_url)
+        monkeypatch.setattr(database, "engine", engine)
+
+        database.init_database()
+
+        assert _revision(engine) == HEAD
+
+    def test_revisions_do_not_import_application_services(self):
+        """Test que les révisions ne dépendent pas du code des services (copies figées)."""
+        script = ScriptDirectory.from_config(get_alembic_config())
+        for revision in script.walk_revisions():
+            module_path = Path(revision.module.__file__)
+            imported = {
+                node.module
+                for node in ast.walk(ast.parse(module_path.read_text(encoding="utf-8")))
+                if isinstance(node, ast.ImportFrom) and node.module
+            }
+            assert not [
+                name for name in imported if name.startswith("src.services")
+            ], module_path.name
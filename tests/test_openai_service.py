@@ -16,6 +16,14 @@ class TestOpenAIService:
         assert service.api_key == "test_key"
         mock_openai.assert_called_once_with(api_key="test_key")
 
+    @patch("src.services.openai_service.OpenAI")
+    def test_render_prompt_unknown_template(self, mock_openai):
+        """Test de reconstruction avec un template inconnu."""
+        service = OpenAIService(api_key="test_key")
+
+        with pytest.raises(ValueError, match="Template de prompt inconnu"):
+            service.render_prompt("extraction", 99, {})
+
     def test_initialization_without_key(self):
         """Test d'initialisation sans clé API."""
         # Patching the imported variable in the module where it is used
@@ -49,6 +57,14 @@ class TestOpenAIService:
         assert "prompt" in result
         assert "raw_response" in result
 
+        # Le prompt peut être reconstruit depuis son template
+        template = result["prompt_template"]
+        assert (template["id"], template["version"]) == ("extraction", 2)
+        assert (
+            service.render_prompt(template["id"], template["version"], template["params"])
+            == result["prompt"]
+        )
+
         # Vérifier que l'API a été appelée
         mock_client.chat.completions.create.assert_called_once()
 
@@ -113,6 +129,34 @@ class TestOpenAIService:
         assert "schéma json attendu" in prompt.lower()
         assert "test text" in prompt
 
+    @patch("src.services.openai_service.OpenAI")
+    def test_extract_contract_data_sends_relevant_pages(self, mock_openai_class):
+        """Test que seules les pages pertinentes sont envoyées au-delà du budget."""
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value.choices = [
+            Mock(message=Mock(content='{"fournisseur": "EDF"}'))
+        ]
+        general_terms = "\n\n".join(
+            f"Article {index} : resiliation, litiges." * 20 for index in range(10)
+        )
+        pdf_text = f"{general_terms}\n\nPDL : 14523678901234\nPuissance souscrite : 6 kVA"
+        service = OpenAIService(api_key="test_key")
+        service.extraction_token_budget = 200
+
+        result = service.extract_contract_data(pdf_text, "electricite")
+
+        assert "PDL : 14523678901234" in result["prompt"]
+        assert "Article 9" not in result["prompt"]
+        template = result["prompt_template"]
+        assert template["params"]["token_budget"] == 200
+        assert (
+            service.render_prompt(template["id"], template["version"], template["params"])
+            == result["prompt"]
+        )
+        # Les prompts journalisés avant la sélection des pages restent reconstructibles
+        params = {"contract_type": "electricite", "pdf_text": pdf_text}
+        assert "Article 9" in service.render_prompt("extraction", 1, params)
+
     def test_build_extraction_prompt_pno(self):
         """Test de construction du prompt d'extraction pour assurance PNO."""
         service = OpenAIService(api_key="test_key")
@@ -0,0 +1,55 @@
+"""Tests de la sélection des pages pertinentes."""
+from src.services.page_ranking import (
+    OMITTED_PAGES,
+    estimate_tokens,
+    score_pages,
+    select_relevant_pages,
+)
+
+GENERAL_TERMS = "Conditions generales : resiliation, litiges, mediation. " * 15
+
+
+class TestPageRanking:
+    """Tests du classement et de la sélection des pages."""
+
+    def test_key_pages_score_higher(self):
+        """Test que les pages des Conditions Particulières passent devant les CG."""
+        pages = [
+            GENERAL_TERMS,
+            "Conditions particulieres\nCotisation annuelle TTC : 356,20 €\n"
+            "Échéance principale : 1er janvier",
+            GENERAL_TERMS,
+        ]
+
+        scores = score_pages("assurance_habitation", pages)
+
+        assert scores[1] > scores[0] == scores[2]
+
+    def test_text_within_budget_unchanged(self):
+        """Test qu'un texte court est envoyé tel quel."""
+        text = f"{GENERAL_TERMS}\n\nPDL : 14523678901234"
+
+        assert select_relevant_pages(text, "electricite", estimate_tokens(text)) == text
+        assert select_relevant_pages(text, "electricite", 0) == text
+
+    def test_selection_keeps_document_order(self):
+        """Test que les pages retenues restent dans l'ordre du document."""
+        pages = [
+            "Votre offre electricite, abonnement mensuel : 12,44 EUR",
+            GENERAL_TERMS,
+            GENERAL_TERMS,
+            "Point de livraison (PDL) : 14523678901234\nPuissance souscrite : 6 kVA",
+        ]
+        budget = estimate_tokens(pages[0]) + estimate_tokens(pages[3])
+
+        selected = select_relevant_pages("\n\n".join(pages), "electricite", budget)
+
+        assert selected == "\n\n".join([pages[0], OMITTED_PAGES, pages[3]])
+
+    def test_oversized_best_page_kept(self):
+        """Test que la meilleure page est envoyée même si elle dépasse le budget."""
+        pages = ["PDL : 14523678901234 " + GENERAL_TERMS, "Annexe"]
+
+        selected = select_relevant_pages("\n\n".join(pages), "electricite", 10)
+
+        assert selected == "\n\n".join([pages[0], OMITTED_PAGES])
@@ -46,7 +46,9 @@ def test_dashboard_page_loads(db_session, sample_contract_data_telephone):
     # Une approche plus robuste pour AppTest est de mocker les dépendances au niveau du module
     # avant de lancer le script.
 
-    with patch("src.database.get_db") as mock_get_db:
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ):
         mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
         at.run(timeout=10)
 
@@ -92,7 +94,9 @@ def test_dashboard_delete_contract(db_session, sample_contract_data_telephone):
 
     at = AppTest.from_file("src/pages/dashboard.py")
 
-    with patch("src.database.get_db") as mock_get_db:
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ):
         mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
         at.run(timeout=10)
 
@@ -115,6 +119,40 @@ def test_dashboard_delete_contract(db_session, sample_contract_data_telephone):
         assert found_provider
 
 
+def test_dashboard_reads_without_write_session(db_session, sample_contract_data_telephone):
+    """Test que le dashboard est lu en lecture seule et n'écrit qu'à la suppression."""
+    from datetime import datetime
+
+    contract = Contract(
+        contract_type="telephone",
+        provider="Free Mobile",
+        start_date=datetime.now(),
+        anniversary_date=datetime.now(),
+        contract_data=sample_contract_data_telephone,
+        original_filename="test.pdf",
+    )
+    db_session.add(contract)
+    db_session.commit()
+    contract_id = contract.id
+
+    at = AppTest.from_file("src/pages/dashboard.py")
+
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db"
+    ) as mock_get_read_db:
+        mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
+        mock_get_read_db.side_effect = lambda: mock_get_db_context(db_session)
+        at.run(timeout=10)
+        mock_get_db.assert_not_called()
+
+        at.button(key=f"del_list_{contract_id}").click().run(timeout=10)
+
+    assert not at.exception
+    mock_get_db.assert_called_once()
+    db_session.expire_all()
+    assert db_session.get(Contract, contract_id) is None
+
+
 def test_add_contract_page_loads():
     """Test que la page d'ajout de contrat se charge."""
     at = AppTest.from_file("src/pages/add_contract.py")
@@ -132,11 +170,44 @@ def test_app_loads():
     # On vérifie juste qu'il n'y a pas d'erreur au lancement
 
 
+def test_app_sidebar_search(db_session):
+    """Test de la recherche de contrats depuis la sidebar."""
+    from datetime import datetime
+    from unittest.mock import Mock
+    from src.services import ContractService
+
+    ContractService(db_session, Mock(), Mock()).create_contract(
+        contract_type="electricite",
+        provider="TotalEnergies",
+        start_date=datetime(2024, 1, 1),
+        anniversary_date=datetime(2025, 1, 1),
+        contract_data={"pdl": "12345678901234"},
+        pdf_bytes=None,
+        filename="total.pdf",
+    )
+
+    at = AppTest.from_file("src/app.py")
+
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ):
+        mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
+        at.run(timeout=10)
+        at.sidebar.text_input(key="sidebar_search").input("1234567890").run(timeout=10)
+        assert not at.exception
+        assert any("TotalEnergies" in md.value for md in at.sidebar.markdown)
+
+        at.sidebar.text_input(key="sidebar_search").input("inconnu").run(timeout=10)
+        assert "Aucun contrat trouvé" in at.sidebar.info[0].value
+
+
 def test_compare_page_loads(db_session):
     """Test que la page de comparaison se charge."""
     at = AppTest.from_file("src/pages/compare.py")
 
-    with patch("src.database.get_db") as mock_get_db:
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ):
         mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
         at.run(timeout=10)
 
@@ -150,8 +221,8 @@ def test_add_contract_extraction(db_session, sample_contract_data_telephone):
 
     # Mock services
     with patch("src.database.get_db") as mock_get_db, patch(
-        "src.services.ContractService.extract_and_create_contract"
-    ) as mock_extract:
+        "src.database.get_read_db", mock_get_db
+    ), patch("src.services.ContractService.extract_and_create_contract") as mock_extract:
         mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
 
         # Setup mock return
@@ -174,9 +245,32 @@ def test_history_page_loads(db_session):
     """Test que la page d'historique se charge."""
     at = AppTest.from_file("src/pages/history.py")
 
-    with patch("src.database.get_db") as mock_get_db:
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ):
         mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
         at.run(timeout=10)
 
     assert not at.exception
     assert "Historique" in at.title[0].value
+
+
+def test_history_page_archive_opt_in(db_session, tmp_path):
+    """Test que la base d'archive n'est lue que si l'utilisateur le demande."""
+    from src.database.database import create_db_engine
+
+    archive_engine = create_db_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    at = AppTest.from_file("src/pages/history.py")
+
+    with patch("src.database.get_db") as mock_get_db, patch(
+        "src.database.get_read_db", mock_get_db
+    ), patch("src.services.archive_service._archive_engine", archive_engine):
+        mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
+        at.run(timeout=10)
+        assert not (tmp_path / "archive.db").exists()
+
+        at.checkbox(key="history_include_archive").check().run(timeout=10)
+
+    assert not at.exception
+    assert (tmp_path / "archive.db").exists()
+    assert "Aucune analyse" in at.info[0].value
@@ -70,8 +70,8 @@ class TestComparePageCoverage:
         }
 
         with patch("src.database.get_db") as mock_get_db, patch(
-            "src.services.openai_service.OpenAIService.compare_with_market"
-        ) as mock_compare:
+            "src.database.get_read_db", mock_get_db
+        ), patch("src.services.openai_service.OpenAIService.compare_with_market") as mock_compare:
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             mock_compare.return_value = rich_analysis
 
@@ -132,6 +132,8 @@ class TestComparePageCoverage:
         }
 
         with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ), patch(
             "src.services.openai_service.OpenAIService.compare_with_competitor"
         ) as mock_compare, patch(
             "src.services.openai_service.OpenAIService.extract_contract_data"
@@ -219,6 +221,8 @@ class TestAddContractPageCoverage:
 
         # Mock services
         with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ), patch(
             "src.services.openai_service.OpenAIService.extract_contract_data"
         ) as mock_extract, patch(
             "src.services.pdf_service.PDFService.extract_text_from_pdf"
@@ -436,7 +440,9 @@ class TestDashboardPageCoverage:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -44,7 +44,9 @@ class TestAddContractPage:
         at.session_state["filename"] = "test.pdf"
         at.session_state["pdf_bytes"] = b"fake pdf content"
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -82,7 +84,9 @@ class TestAddContractPage:
         at.session_state["filename"] = "test.pdf"
         at.session_state["pdf_bytes"] = b"fake pdf content"
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
 
             at.run(timeout=10)
@@ -99,7 +103,9 @@ class TestComparePage:
         """Test l'état initial de la page de comparaison."""
         at = AppTest.from_file("src/pages/compare.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -123,7 +129,9 @@ class TestComparePage:
 
         at = AppTest.from_file("src/pages/compare.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -138,7 +146,9 @@ class TestHistoryPage:
         """Test que la page historique se charge."""
         at = AppTest.from_file("src/pages/history.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -173,7 +183,9 @@ class TestHistoryPage:
 
         at = AppTest.from_file("src/pages/history.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -241,7 +253,9 @@ class TestAddContractPageExtended(TestAddContractPage):
         at.session_state["filename"] = "dual.pdf"
         at.session_state["pdf_bytes"] = b"fake pdf"
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -264,7 +278,9 @@ class TestAddContractPageExtended(TestAddContractPage):
         at.session_state["filename"] = "pno.pdf"
         at.session_state["pdf_bytes"] = b"fake pdf"
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -287,7 +303,9 @@ class TestAddContractPageExtended(TestAddContractPage):
         at.session_state["filename"] = "mobile.pdf"
         at.session_state["pdf_bytes"] = b"fake pdf"
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -316,8 +334,8 @@ class TestComparePageExtended(TestComparePage):
 
         # Mocker OpenAIService pour retourner une analyse
         with patch("src.database.get_db") as mock_get_db, patch(
-            "src.services.openai_service.OpenAIService.compare_with_market"
-        ) as mock_compare:
+            "src.database.get_read_db", mock_get_db
+        ), patch("src.services.openai_service.OpenAIService.compare_with_market") as mock_compare:
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             mock_compare.return_value = {
                 "analysis": {
@@ -391,7 +409,9 @@ class TestComparePageExtended(TestComparePage):
         at = AppTest.from_file("src/pages/compare.py")
         at.session_state["compare_contract_id"] = contract.id
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -422,7 +442,9 @@ class TestDashboardPageExtended:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -449,7 +471,9 @@ class TestDashboardPageExtended:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -484,7 +508,9 @@ class TestDashboardPageExtended:
 
         at = AppTest.from_file("src/pages/dashboard.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
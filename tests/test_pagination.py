@@ -0,0 +1,67 @@
+"""Tests de la navigation par pages."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.pages.pagination import paginate, paginate_list
+
+
+@pytest.fixture
+def mock_st():
+    """Streamlit simulé, dont la session est un vrai dictionnaire."""
+    with patch("src.pages.pagination.st") as st:
+        st.session_state = {}
+        st.columns.side_effect = lambda spec: [MagicMock() for _ in spec]
+        yield st
+
+
+def _click(st, key):
+    """Déclenche le callback du bouton `key` lors du dernier affichage."""
+    for call in reversed(st.button.call_args_list):
+        if call.kwargs["key"] == key:
+            call.kwargs["on_click"]()
+            return
+    raise AssertionError(f"Bouton {key} absent")
+
+
+def test_paginate_follows_cursors(mock_st):
+    """Test des pages suivante et précédente avec un curseur keyset."""
+    rows = list(range(1, 8))
+
+    def fetch(limit, after):
+        return [row for row in rows if after is None or row > after[1]][:limit]
+
+    def cursor_of(row):
+        return (None, row)
+
+    assert paginate("test", fetch, cursor_of, page_size=3) == [1, 2, 3]
+    _click(mock_st, "test_next")
+    assert paginate("test", fetch, cursor_of, page_size=3) == [4, 5, 6]
+    _click(mock_st, "test_next")
+    assert paginate("test", fetch, cursor_of, page_size=3) == [7]
+    assert mock_st.button.call_args_list[-1].kwargs["disabled"] is True
+
+    _click(mock_st, "test_previous")
+    assert paginate("test", fetch, cursor_of, page_size=3) == [4, 5, 6]
+
+    # Un changement de filtres ramène à la première page
+    assert paginate("test", fetch, cursor_of, filters=("x",), page_size=3) == [1, 2, 3]
+
+
+def test_paginate_single_page_has_no_controls(mock_st):
+    """Test qu'aucun bouton n'est affiché quand tout tient sur une page."""
+    assert paginate("test", lambda limit, after: [1, 2], lambda row: (None, row)) == [1, 2]
+    mock_st.button.assert_not_called()
+
+
+def test_paginate_list(mock_st):
+    """Test du découpage d'une liste déjà chargée."""
+    items = list(range(5))
+
+    assert paginate_list("test", items, page_size=2) == [0, 1]
+    _click(mock_st, "test_next")
+    _click(mock_st, "test_next")
+    assert paginate_list("test", items, page_size=2) == [4]
+
+    # La liste a raccourci : la page courante est ramenée à la dernière
+    assert paginate_list("test", items[:3], page_size=2) == [2]
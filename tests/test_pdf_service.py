@@ -1,9 +1,21 @@
 """Tests pour le service PDF."""
 import pytest
 import io
-from pypdf import PdfWriter
+from unittest.mock import patch
+from pypdf import PdfReader, PdfWriter
+from sqlalchemy import text
 
-from src.services.pdf_service import PDFService
+from src.database.blob_store import BlobStore
+from src.database.models import PdfText
+from src.database.types import decompress_text
+from src.services.pdf_service import (
+    ParsedPDF,
+    PDFService,
+    PypdfBackend,
+    _get_pool,
+    is_usable_text,
+    split_page_ranges,
+)
 
 
 class TestPDFService:
@@ -55,3 +67,253 @@ class TestPDFService:
             service.extract_text_from_pdf(pdf_content)
 
         assert "ne contient pas de texte" in str(excinfo.value)
+
+
+class TestParsedPDF:
+    """Tests du document ouvert une seule fois."""
+
+    def test_open_text_pdf(self, text_pdf):
+        """Test des informations lues sur un document valide."""
+        pdf_bytes = text_pdf([["Conditions particulieres", "Cotisation annuelle"], [], ["Fin"]])
+
+        with PDFService.open(pdf_bytes) as document:
+            assert document.is_valid
+            assert document.page_count == 3
+            assert document.page_texts == [
+                "Conditions particulieres\nCotisation annuelle",
+                "",
+                "Fin",
+            ]
+            assert document.text == "Conditions particulieres\nCotisation annuelle\n\nFin"
+            assert document.fingerprint == BlobStore.compute_hash(pdf_bytes)
+            assert document.tables(0) == []
+
+        # Le texte déjà lu reste disponible après fermeture
+        assert document.page_text(0).startswith("Conditions")
+
+    def test_open_invalid_pdf(self):
+        """Test qu'un fichier illisible donne un document invalide, sans exception."""
+        document = PDFService.open(b"Not a PDF")
+
+        assert not document.is_valid
+        assert document.page_count == 0
+        assert document.error
+        with pytest.raises(ValueError):
+            document.page_text(0)
+
+    def test_single_parse_for_validation_and_text(self, text_pdf):
+        """Test que la validation et l'extraction réutilisent le même document."""
+        pdf_bytes = text_pdf([["Echeance principale"]])
+        service = PDFService()
+
+        with patch("src.services.pdf_service.PdfReader", wraps=PdfReader) as opened:
+            with service.open(pdf_bytes) as document:
+                assert document.is_valid
+                assert service.extract_text_from_pdf(document) == "Echeance principale"
+                assert service.extract_text_from_pdf(document) == "Echeance principale"
+
+        opened.assert_called_once()
+        assert isinstance(document, ParsedPDF)
+
+
+class TestTextBackends:
+    """Tests de la chaîne de moteurs d'extraction."""
+
+    def test_is_usable_text(self):
+        """Test de l'heuristique de qualité du texte d'une page."""
+        assert is_usable_text("Cotisation annuelle : 356,20 EUR")
+        assert not is_usable_text("  \n ")
+        assert not is_usable_text("(cid:12)(cid:7)(cid:3) annuelle")
+        assert not is_usable_text("Cotisation\ufffd\ufffd\ufffd\ufffd")
+        assert not is_usable_text("Cotisationannuelledevotrecontratdassurancehabitation")
+
+    def test_fast_backend_used_first(self, text_pdf):
+        """Test que pdfplumber n'est pas ouvert quand pypdf donne un texte exploitable."""
+        pdf_bytes = text_pdf([["Cotisation annuelle"], ["Echeance principale"]])
+
+        with patch("src.services.pdf_service.pdfplumber.open") as plumber_open:
+            with PDFService.open(pdf_bytes) as document:
+                assert document.page_texts == ["Cotisation annuelle", "Echeance principale"]
+                assert document.page_backends == {0: "pypdf", 1: "pypdf"}
+
+        plumber_open.assert_not_called()
+
+    def test_fallback_on_garbled_page(self, text_pdf):
+        """Test qu'une page illisible avec pypdf est relue par pdfplumber."""
+        pdf_bytes = text_pdf([["Cotisation annuelle"], ["Echeance principale"]])
+        garbled = {1: "(cid:3)(cid:4)(cid:5)"}
+        page_text = PypdfBackend.page_text
+
+        with patch.object(
+            PypdfBackend,
+            "page_text",
+            lambda backend, index: garbled.get(index) or page_text(backend, index),
+        ):
+            with PDFService.open(pdf_bytes) as document:
+                texts = document.extract_pages(max_workers=1)
+
+        assert texts == ["Cotisation annuelle", "Echeance principale"]
+        assert document.page_backends == {0: "pypdf", 1: "pdfplumber"}
+
+    def test_blank_page_keeps_empty_text(self, text_pdf):
+        """Test qu'une page sans texte reste vide après la relecture."""
+        with PDFService.open(text_pdf([["Fin"], []])) as document:
+            assert document.page_text(1) == ""
+
+    def test_single_backend(self, text_pdf):
+        """Test d'une chaîne réduite à pdfplumber."""
+        pdf_bytes = text_pdf([["Cotisation annuelle"]])
+
+        with patch("src.services.pdf_service.PdfReader") as reader:
+            with ParsedPDF(pdf_bytes, backends=["pdfplumber"]) as document:
+                assert document.text == "Cotisation annuelle"
+
+        reader.assert_not_called()
+
+
+class TestParallelExtraction:
+    """Tests de l'extraction des pages en parallèle."""
+
+    def test_split_page_ranges(self):
+        """Test du découpage en plages contiguës."""
+        assert split_page_ranges(10, 4) == [(0, 2), (2, 5), (5, 7), (7, 10)]
+        assert split_page_ranges(2, 4) == [(0, 1), (1, 2)]
+
+    def test_parallel_keeps_page_order(self, text_pdf):
+        """Test que les pages lues par le pool reviennent dans l'ordre du document."""
+        pdf_bytes = text_pdf([[f"Page {index}"] for index in range(9)])
+
+        with PDFService.open(pdf_bytes) as document:
+            texts = document.extract_pages(max_workers=2, min_parallel_pages=4)
+
+        assert texts == [f"Page {index}" for index in range(9)]
+
+    def test_only_missing_pages_dispatched(self, text_pdf):
+        """Test que les pages déjà lues ne sont pas renvoyées au pool."""
+        pdf_bytes = text_pdf([[f"Page {index}"] for index in range(6)])
+
+        with patch("src.services.pdf_service._get_pool") as get_pool:
+            get_pool.return_value.map.side_effect = lambda function, *args: map(function, *args)
+            with PDFService.open(pdf_bytes) as document:
+                document.page_text(0)
+                document.page_text(1)
+                texts = document.extract_pages(max_workers=2, min_parallel_pages=2)
+
+        batches = get_pool.return_value.map.call_args.args[2]
+        assert batches == [[2, 3], [4, 5]]
+        assert texts == [f"Page {index}" for index in range(6)]
+
+    def test_pool_uses_spawn(self):
+        """Test que les processus du pool ne sont pas créés par fork."""
+        with patch("src.services.pdf_service.ProcessPoolExecutor") as executor:
+            with patch.dict("src.services.pdf_service._pools", clear=True):
+                _get_pool(3)
+
+        assert executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+    def test_small_document_read_serially(self, text_pdf):
+        """Test qu'un petit document est lu sans passer par le pool."""
+        pdf_bytes = text_pdf([["Une"], ["Deux"]])
+
+        with patch("src.services.pdf_service._get_pool") as get_pool:
+            with PDFService.open(pdf_bytes) as document:
+                assert document.extract_pages(max_workers=4, min_parallel_pages=3) == [
+                    "Une",
+                    "Deux",
+                ]
+
+        get_pool.assert_not_called()
+
+    def test_pool_failure_falls_back_to_serial(self, text_pdf):
+        """Test de la lecture séquentielle quand le pool est indisponible."""
+        pdf_bytes = text_pdf([[f"Page {index}"] for index in range(4)])
+
+        with patch("src.services.pdf_service._get_pool", side_effect=OSError("fork")):
+            with PDFService.open(pdf_bytes) as document:
+                texts = document.extract_pages(max_workers=2, min_parallel_pages=2)
+
+        assert texts == [f"Page {index}" for index in range(4)]
+
+
+class TestKeyPages:
+    """Tests de la lecture arrêtée sur les champs clés."""
+
+    KEY_PAGE = [
+        "Conditions particulieres",
+        "PDL : 14523678901234",
+        "Date de debut : 01/03/2024",
+        "Prix abonnement : 12,44 EUR/mois",
+    ]
+
+    def test_stops_after_key_fields(self, text_pdf, db_session):
+        """Test que la lecture s'arrête une page après celle des champs clés."""
+        pdf_bytes = text_pdf([self.KEY_PAGE] + [[f"Article {index}"] for index in range(8)])
+        service = PDFService(db_session)
+
+        with service.open(pdf_bytes) as document:
+            key_pages = service.read_key_pages(document, "electricite", margin_pages=1)
+            assert sorted(document._page_texts) == [0, 1]
+
+        assert (key_pages.pages_read, key_pages.page_count) == (2, 9)
+        assert not key_pages.complete
+        assert key_pages.text == "\n".join(self.KEY_PAGE) + "\n\nArticle 0"
+        assert db_session.query(PdfText).count() == 0
+
+    def test_reads_everything_when_fields_missing(self, text_pdf, db_session):
+        """Test de la lecture complète quand un champ clé manque."""
+        pdf_bytes = text_pdf([self.KEY_PAGE[:2], ["Article 1"], ["Article 2"]])
+        service = PDFService(db_session)
+
+        with service.open(pdf_bytes) as document:
+            key_pages = service.read_key_pages(document, "electricite")
+
+        assert key_pages.complete
+        assert key_pages.text.endswith("Article 2")
+        assert service.get_text(BlobStore.compute_hash(pdf_bytes)) == key_pages.text
+
+    def test_stored_text_or_disabled(self, text_pdf, db_session):
+        """Test que le texte déjà conservé ou l'option désactivée donnent le texte complet."""
+        pdf_bytes = text_pdf([self.KEY_PAGE, ["Article 1"], ["Article 2"]])
+        service = PDFService(db_session)
+
+        with service.open(pdf_bytes) as document:
+            assert service.read_key_pages(document, "electricite", early_stop=False).complete
+        with service.open(pdf_bytes) as document:
+            key_pages = service.read_key_pages(document, "electricite", margin_pages=0)
+            assert document._page_texts == {}
+
+        assert key_pages.complete
+        assert key_pages.pages_read == 3
+
+
+class TestPDFTextCache:
+    """Tests de la conservation du texte extrait."""
+
+    def test_text_reused_for_same_bytes(self, db_session):
+        """Test qu'un même PDF n'est lu qu'une fois."""
+        service = PDFService(db_session)
+
+        with patch.object(
+            PDFService, "_parse_pdf", return_value=("Cotisation annuelle", 3)
+        ) as parse:
+            assert service.extract_text_from_pdf(b"%PDF contrat") == "Cotisation annuelle"
+            db_session.commit()
+            assert service.extract_text_from_pdf(b"%PDF contrat") == "Cotisation annuelle"
+
+        parse.assert_called_once()
+        stored = db_session.get(PdfText, BlobStore.compute_hash(b"%PDF contrat"))
+        assert stored.page_count == 3
+        assert stored.text_size == len("Cotisation annuelle")
+        raw = db_session.execute(text("SELECT text_compressed FROM pdf_texts")).scalar()
+        assert decompress_text(raw) == "Cotisation annuelle"
+
+    def test_without_session(self):
+        """Test sans session : pas de conservation du texte."""
+        service = PDFService()
+
+        with patch.object(PDFService, "_parse_pdf", return_value=("texte", 1)) as parse:
+            service.extract_text_from_pdf(b"%PDF")
+            service.extract_text_from_pdf(b"%PDF")
+
+        assert parse.call_count == 2
+        assert service.get_text(BlobStore.compute_hash(b"%PDF")) is None
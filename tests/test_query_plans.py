@@ -0,0 +1,152 @@
+"""Tests vérifiant que les requêtes du service utilisent des index et restent en nombre borné."""
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from src.database.models import Comparison, Contract
+from src.pages import history
+from src.services.contract_service import ContractService
+
+# EXPLAIN QUERY PLAN est propre à SQLite
+pytestmark = pytest.mark.sqlite
+
+
+@pytest.fixture
+def captured_queries(db_engine):
+    """Capture les requêtes SELECT exécutées sur l'engine de test."""
+    queries = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries.append((statement, parameters))
+
+    event.listen(db_engine, "before_cursor_execute", _capture)
+    yield queries
+    event.remove(db_engine, "before_cursor_execute", _capture)
+
+
+def _query_plans(db_engine, queries):
+    plans = []
+    with db_engine.connect() as conn:
+        for statement, parameters in queries:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append([row[-1] for row in rows])
+    return plans
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda service: service.get_all_contracts(),
+        lambda service: service.get_all_simulations(),
+        lambda service: service.get_contract_summaries(),
+        lambda service: service.get_contract_summaries(sort_by_cost=True),
+        lambda service: service.get_contracts_needing_attention(),
+        lambda service: service.get_contract_comparisons(1),
+        lambda service: service.get_all_comparisons(),
+        lambda service: service.get_all_comparisons(limit=20, after=(datetime(2025, 6, 1), 10)),
+        lambda service: service.get_all_contracts(limit=20, after=(datetime(2025, 6, 1), 10)),
+        lambda service: service.find_by_identifier("12345678901234", "pdl"),
+        lambda service: service.find_by_identifier("12345678901234"),
+    ],
+    ids=[
+        "get_all_contracts",
+        "get_all_simulations",
+        "get_contract_summaries",
+        "get_contract_summaries_by_cost",
+        "get_contracts_needing_attention",
+        "get_contract_comparisons",
+        "get_all_comparisons",
+        "get_all_comparisons_page",
+        "get_all_contracts_page",
+        "find_by_identifier_pdl",
+        "find_by_identifier_any",
+    ],
+)
+def test_service_queries_use_indexes(db_engine, db_session, captured_queries, call):
+    """Chaque requête doit passer par un index plutôt qu'un parcours complet de table."""
+    db_session.execute(text("ANALYZE"))
+    call(ContractService(db_session, Mock(), Mock()))
+
+    assert captured_queries
+    for plan in _query_plans(db_engine, captured_queries):
+        full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+        assert not full_scans, plan
+        assert any("INDEX" in step for step in plan), plan
+
+
+def _seed_comparisons(db_session, contracts, comparisons_per_contract):
+    start = datetime(2025, 1, 1)
+    for index in range(contracts):
+        contract = Contract(
+            contract_type="electricite",
+            provider=f"Fournisseur {index}",
+            start_date=start,
+            anniversary_date=start + timedelta(days=365),
+            contract_data={"prix_kwh": {"base": 0.2}},
+        )
+        db_session.add(contract)
+        for position in range(comparisons_per_contract):
+            db_session.add(
+                Comparison(
+                    contract=contract,
+                    comparison_type=("market_analysis", "competitor_quote")[position % 2],
+                    gpt_response="{}",
+                    comparison_result={"recommandation": "Changer"},
+                    analysis_summary=f"Analyse {position}",
+                    annual_savings_eur=float(position),
+                    created_at=start + timedelta(days=position),
+                )
+            )
+    db_session.commit()
+
+
+def _mock_streamlit():
+    st = MagicMock()
+    st.columns.side_effect = lambda spec, **kwargs: [
+        MagicMock() for _ in range(spec if isinstance(spec, int) else len(spec))
+    ]
+    st.selectbox.side_effect = lambda label, options, **kwargs: options[0]
+    st.checkbox.return_value = False
+    st.session_state = {}
+    return st
+
+
+def _history_queries(db_engine, captured_queries):
+    """Affiche la page d'historique dans une session neuve et retourne le nombre de SELECT."""
+    captured_queries.clear()
+    st = _mock_streamlit()
+    with Session(bind=db_engine) as session, patch(
+        "src.pages.history.get_read_db", contextmanager(lambda: (yield session))
+    ), patch("src.pages.history.st", st), patch("src.pages.compare_logic.st", st):
+        history.show()
+    assert st.plotly_chart.call_count == 2  # Page rendue jusqu'aux graphiques et détails
+    return len(captured_queries)
+
+
+def test_history_page_query_count_is_constant(db_engine, db_session, captured_queries):
+    """L'historique ne doit pas émettre une requête par comparaison ou par contrat."""
+    _seed_comparisons(db_session, contracts=3, comparisons_per_contract=4)
+    small = _history_queries(db_engine, captured_queries)
+
+    _seed_comparisons(db_session, contracts=20, comparisons_per_contract=5)
+    large = _history_queries(db_engine, captured_queries)
+
+    assert large == small
+    assert small <= 8
+
+
+def test_deleted_contracts_filter_only_added_to_comparison_queries(db_session, captured_queries):
+    """Le filtre des comparaisons de contrats supprimés ne s'ajoute qu'aux requêtes concernées."""
+    service = ContractService(db_session, Mock(), Mock())
+
+    service.get_all_contracts()
+    service.get_all_comparisons()
+
+    contracts_sql, comparisons_sql = (statement for statement, _ in captured_queries)
+    assert "deleted_at IS NULL" in contracts_sql
+    assert "NOT IN" not in contracts_sql
+    assert "NOT IN" in comparisons_sql
@@ -0,0 +1,79 @@
+"""Tests pour les types de colonnes personnalisés."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.database.models import ExtractionLog
+from src.database.types import (
+    FORMAT_LZMA,
+    FORMAT_RAW,
+    FORMAT_ZLIB,
+    CompressedText,
+    compress_text,
+    decompress_text,
+)
+
+
+class TestCompressText:
+    """Tests de l'encodage des textes compressés."""
+
+    @pytest.mark.parametrize("algorithm, header", [("zlib", FORMAT_ZLIB), ("lzma", FORMAT_LZMA)])
+    def test_round_trip(self, algorithm, header):
+        """Test de compression puis décompression."""
+        value = '{"fournisseur": "EDF", "prix_kwh": 0.2516} ' * 50
+
+        encoded = compress_text(value, algorithm)
+
+        assert encoded[0] == header
+        assert len(encoded) < len(value)
+        assert decompress_text(encoded) == value
+
+    def test_short_value_stored_raw(self):
+        """Test qu'une valeur courte n'est pas compressée."""
+        encoded = compress_text("réponse")
+
+        assert encoded[0] == FORMAT_RAW
+        assert decompress_text(encoded) == "réponse"
+
+    def test_unknown_algorithm(self):
+        """Test d'un algorithme inconnu."""
+        with pytest.raises(ValueError, match="Algorithme de compression inconnu"):
+            compress_text("texte", "brotli")
+
+    def test_unknown_header(self):
+        """Test d'un contenu au format inconnu."""
+        with pytest.raises(ValueError, match="Format de texte compressé inconnu"):
+            decompress_text(b"\x09abc")
+
+
+class TestCompressedTextColumn:
+    """Tests du TypeDecorator CompressedText."""
+
+    def test_columns_are_compressed(self, db_session):
+        """Test que les prompts sont compressés en base et relus en clair."""
+        prompt = "Extrait les données du contrat suivant. " * 200
+        log = ExtractionLog(
+            filename="contrat.pdf",
+            contract_type="telephone",
+            gpt_prompt=prompt,
+            gpt_response="{}",
+            extracted_data={},
+            created_at=datetime(2025, 1, 1),
+        )
+        db_session.add(log)
+        db_session.commit()
+
+        stored = db_session.execute(text("SELECT gpt_prompt FROM extraction_logs")).scalar()
+        assert len(stored) < len(prompt) / 10
+
+        db_session.expire_all()
+        assert db_session.get(ExtractionLog, log.id).gpt_prompt == prompt
+
+    def test_legacy_text_value(self):
+        """Test qu'une valeur restée en texte est retournée telle quelle."""
+        column_type = CompressedText()
+
+        assert column_type.process_result_value("ancien prompt", None) == "ancien prompt"
+        assert column_type.process_result_value(None, None) is None
+        assert column_type.process_bind_param(None, None) is None
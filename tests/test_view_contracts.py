@@ -38,7 +38,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -68,7 +70,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -126,7 +130,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -145,7 +151,9 @@ class TestViewContractsPage:
         """Test l'affichage quand il n'y a aucun contrat."""
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -168,7 +176,9 @@ class TestViewContractsPage:
         at = AppTest.from_file("src/pages/view_contracts.py")
         at.session_state["view_contract_id"] = contract.id
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -194,7 +204,9 @@ class TestViewContractsPage:
         at = AppTest.from_file("src/pages/view_contracts.py")
         at.session_state["view_contract_id"] = 99999  # ID inexistant
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -220,8 +232,8 @@ class TestViewContractsPage:
         at = AppTest.from_file("src/pages/view_contracts.py")
 
         with patch("src.database.get_db") as mock_get_db, patch(
-            "src.services.ContractService.get_contract_by_id"
-        ) as mock_get_contract:
+            "src.database.get_read_db", mock_get_db
+        ), patch("src.services.ContractService.get_contract_by_id") as mock_get_contract:
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             # On laisse get_all_contracts fonctionner normalement (via le vrai service ou mocké si besoin)
             # Mais on force get_contract_by_id à retourner None
@@ -259,7 +271,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -290,7 +304,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 
@@ -320,7 +336,9 @@ class TestViewContractsPage:
 
         at = AppTest.from_file("src/pages/view_contracts.py")
 
-        with patch("src.database.get_db") as mock_get_db:
+        with patch("src.database.get_db") as mock_get_db, patch(
+            "src.database.get_read_db", mock_get_db
+        ):
             mock_get_db.side_effect = lambda: mock_get_db_context(db_session)
             at.run(timeout=10)
 